@@ -1,6 +1,17 @@
 from .digital_signal import DigitalSignal 
-from .shift_register import ShiftRegister
-from .helpers import E, PI, cconj
+from .shift_register import ShiftRegister, gold_signals, kasami_signals
+from .lfsr import LFSR
+from .filters import StreamingFIR, lfilter, sosfilt
+from .batch import SignalBatch
+from .lazy import LazySignal
+from .sparse import SparseDigitalSignal
+from .helpers import E, PI, cconj, convolve, correlate, correlate_many
+from .parallel import parallel, set_executor
+from .convolution import clear_kernel_cache, kernel_cache_info, set_kernel_cache
+from .profiling import profile
+from .spectral import dft, dtft, fft, ifft, spectrogram, welch
+from .resample import StreamingResampler, downsample, resample, upsample
+from .detect import MatchedFilterDetector, cfar_scale, detect
 
 # Make the class directly accessible at the package level
-__all__ = ['DigitalSignal', 'ShiftRegister', 'E', 'PI', 'cconj']
+__all__ = ['DigitalSignal', 'ShiftRegister', 'LFSR', 'gold_signals', 'kasami_signals', 'StreamingFIR', 'lfilter', 'sosfilt', 'SignalBatch', 'LazySignal', 'SparseDigitalSignal', 'E', 'PI', 'cconj', 'convolve', 'correlate', 'correlate_many', 'parallel', 'set_executor', 'clear_kernel_cache', 'kernel_cache_info', 'set_kernel_cache', 'profile', 'dft', 'dtft', 'fft', 'ifft', 'spectrogram', 'welch', 'StreamingResampler', 'downsample', 'resample', 'upsample', 'MatchedFilterDetector', 'cfar_scale', 'detect']
@@ -0,0 +1,1025 @@
+import math
+import sys
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# the active array library, None selects the pure-Python 'array' engine
+np = numpy
+
+if numpy is not None:
+    SCALAR_TYPES = (int, float, complex, numpy.number)
+else:
+    SCALAR_TYPES = (int, float, complex)
+
+# sample formats of raw files, all little-endian, 'cint16' holds complex
+# samples as interleaved int16 real and imaginary parts
+FILE_DTYPES = ('int16', 'int32', 'int64', 'float32', 'float64', 'complex64', 'complex128', 'cint16')
+_FILE_CODES = {'int16': 'h', 'int32': 'i', 'int64': 'q', 'float32': 'f', 'float64': 'd',
+               'complex64': 'f', 'complex128': 'd', 'cint16': 'h'}
+
+# samples converted and written per step by tofile
+_FILE_CHUNK = 1 << 20
+
+# samples compared per step by first_difference, a difference ends the comparison at the end of its block
+_COMPARE_BLOCK = 1 << 16
+
+# sample types of a signal
+DTYPES = ('int8', 'int16', 'int32', 'int64', 'float32', 'float64', 'complex64', 'complex128')
+
+# the pure-Python buffer kind of every sample type, 'c' is a list of complex values,
+# 'F' a _Complex64 list and 'O' a list of integers that do not fit in 64 bits
+_CODES = {'int8': 'b', 'int16': 'h', 'int32': 'i', 'int64': 'q', 'float32': 'f', 'float64': 'd',
+          'complex64': 'F', 'complex128': 'c', 'object': 'O'}
+_NAMES = {'b': 'int8', 'h': 'int16', 'i': 'int32', 'q': 'int64', 'f': 'float32', 'd': 'float64',
+          'F': 'complex64', 'c': 'complex128', 'O': 'object'}
+_INTS = 'bhiq'
+
+# the integer kinds narrower than 64 bits, their results widen to 64 bits rather than overflow
+_NARROW = 'bhi'
+_INT_RANGES = {code: (-(1 << (8 * array(code).itemsize - 1)), (1 << (8 * array(code).itemsize - 1)) - 1)
+               for code in _INTS}
+_INT64_MIN, _INT64_MAX = _INT_RANGES['q']
+
+
+class _Complex64(list):
+    """
+    The pure-Python complex64 buffer, a list of complex values whose parts are rounded to
+    single precision, as array('f') rounds float32 samples. Slices and sums keep the type.
+    """
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return _Complex64(list.__getitem__(self, index))
+        return list.__getitem__(self, index)
+
+    def __add__(self, other):
+        return _Complex64(list.__add__(self, other))
+
+    def __radd__(self, other):
+        return _Complex64(list(other) + list(self))
+
+    def __mul__(self, n):
+        return _Complex64(list.__mul__(self, n))
+
+
+def _complex64(values):
+    """
+    Return the values as a _Complex64 buffer, rounding both parts of each to single precision.
+    """
+    values = [complex(value) for value in values]
+    parts = array('f', [part for value in values for part in (value.real, value.imag)])
+    return _Complex64(map(complex, parts[0::2], parts[1::2]))
+
+
+def set_backend(name):
+    """
+    Select the storage engine used for sample buffers, either 'numpy' or 'array'.
+    """
+    global np
+
+    if name == 'numpy':
+        if numpy is None:
+            raise ImportError("The 'numpy' backend requires NumPy to be installed.")
+        np = numpy
+    elif name == 'array':
+        np = None
+    else:
+        raise ValueError("backend must be either 'numpy' or 'array'.")
+
+
+def get_backend():
+    """
+    Return the name of the active storage engine.
+    """
+    return 'array' if np is None else 'numpy'
+
+
+def array_module():
+    """
+    Return the active array library, None for the pure-Python engine.
+    """
+    return np
+
+
+def kind(buf):
+    """
+    Return 'i' for integer buffers, 'f' for real, 'c' for complex and 'O' for anything else.
+    """
+    if np is not None:
+        return 'i' if buf.dtype.kind in 'iub' else buf.dtype.kind
+
+    code = _code(buf)
+    if code in _INTS:
+        return 'i'
+    return {'f': 'f', 'd': 'f', 'c': 'c', 'F': 'c'}.get(code, 'O')
+
+
+def _code(buf):
+    """
+    Return the kind of a pure-Python buffer.
+    """
+    if isinstance(buf, array):
+        return buf.typecode
+    if isinstance(buf, _Complex64):
+        return 'F'
+    return 'c' if buf and isinstance(buf[0], complex) else 'O'
+
+
+def _scalar_code(value):
+    """
+    Return the kind of buffer needed to hold a scalar.
+    """
+    if numpy is not None and isinstance(value, numpy.generic):
+        return _CODES.get(value.dtype.name) or {'c': 'c', 'f': 'd'}.get(value.dtype.kind, 'q')
+    if isinstance(value, complex):
+        return 'c'
+    if isinstance(value, float):
+        return 'd'
+    return 'q'
+
+
+def _promote(*codes):
+    """
+    Return the kind that can hold values of all the given kinds, following the NumPy rules:
+    the widest integer, float32 only for float32 and integers of at most 16 bits, float64
+    for any other mix with floats, and complex or object once either is involved. complex64
+    only holds complex64, float32 and integers of at most 16 bits.
+    """
+    if 'O' in codes:
+        return 'O'
+    if 'c' in codes:
+        return 'c'
+    if 'F' in codes:
+        return 'F' if all(code in 'bhfF' for code in codes) else 'c'
+    if 'd' in codes or ('f' in codes and ('i' in codes or 'q' in codes)):
+        return 'd'
+    if 'f' in codes:
+        return 'f'
+    return max(codes, key=_INTS.index)
+
+
+def _promote_scalar(code, value):
+    """
+    Return the kind that holds a buffer of kind code combined with a scalar. Python
+    scalars only change the kind of the buffer, and widen an integer buffer to 64 bits,
+    or to Python integers beyond them, when they do not fit it. NumPy scalars count as
+    buffers of their own type.
+    """
+    if numpy is not None and isinstance(value, numpy.generic):
+        return _promote(code, _scalar_code(value))
+
+    scalar = _scalar_code(value)
+    if code in 'cFO':
+        return code
+    if scalar == 'c':
+        # like NumPy, a Python complex keeps float32 samples in single precision
+        return 'F' if code == 'f' else 'c'
+    if scalar == 'd' and code in _INTS:
+        return 'd'
+    if code in _INTS and not _INT_RANGES[code][0] <= value <= _INT_RANGES[code][1]:
+        return 'q' if _INT64_MIN <= value <= _INT64_MAX else 'O'
+    return code
+
+
+def _narrow(dtype):
+    """
+    Return True for a NumPy integer type narrower than 64 bits.
+    """
+    return dtype.kind in 'iu' and dtype.itemsize < 8
+
+
+def _scalar_type(dtype, value):
+    """
+    Return the NumPy type that holds a buffer of type dtype combined with a scalar, see _promote_scalar.
+    """
+    if dtype.kind in 'iu' and isinstance(value, int):
+        info = np.iinfo(dtype)
+        if not info.min <= value <= info.max:
+            return np.dtype(np.int64 if _INT64_MIN <= value <= _INT64_MAX else object)
+    return np.result_type(dtype, value)
+
+
+def _fit(out, dtype):
+    """
+    Return an integer result computed in a wider type in the integer type dtype, or else
+    in 64 bits, when every value fits, the result itself otherwise.
+    """
+    for target in (dtype, np.dtype(np.int64)):
+        if out.dtype == target:
+            return out
+        info = np.iinfo(target)
+        if not len(out) or (info.min <= out.min() and out.max() <= info.max):
+            return out.astype(target)
+    return out
+
+
+def _peak(buf):
+    """
+    Return the largest magnitude in an integer NumPy buffer as a Python integer.
+    """
+    return max(-int(buf.min()), int(buf.max())) if len(buf) else 0
+
+
+def dtype_name(buf):
+    """
+    Return the sample type of a buffer, one of DTYPES or 'object'.
+    """
+    if np is not None:
+        return buf.dtype.name if buf.dtype.name in DTYPES else 'object'
+    return _NAMES[_code(buf)]
+
+
+def result_type(*dtypes):
+    """
+    Return the sample type of the sum of signals of the given sample types.
+    """
+    if 'object' in dtypes:
+        return 'object'
+    if numpy is not None:
+        return numpy.result_type(*dtypes).name
+
+    return _NAMES[_promote(*[_CODES[name] for name in dtypes])]
+
+
+def accumulate_type(*dtypes):
+    """
+    Return the sample type of a convolution or correlation of signals of the given
+    sample types, integer sums of products are kept in 64 bits while they fit.
+    """
+    name = result_type(*dtypes)
+    if name == 'object' and not any(dtype.startswith(('float', 'complex')) for dtype in dtypes):
+        return 'int64'
+    return 'int64' if name in ('int8', 'int16', 'int32') else name
+
+
+def exact_integers(buf):
+    """
+    Return an integer buffer whose sums of products are exact at any size, an object
+    buffer of Python integers on NumPy. Pure-Python buffers already read as Python integers.
+    """
+    if np is not None:
+        return buf.astype(object)
+    return buf
+
+
+def fit_integers(buf):
+    """
+    Return a buffer of exact integers in int64 when every value fits, the buffer itself otherwise.
+    """
+    if np is not None:
+        return _fit(buf, np.dtype(np.int64)) if buf.dtype.kind == 'O' else buf
+    return pack(buf) if _code(buf) == 'O' else buf
+
+
+def astype(buf, dtype):
+    """
+    Return the buffer converted to the sample type dtype, buf itself when it already has that type.
+    Converting to integers drops the fraction and converting complex values to real types keeps the real part.
+    Integers that do not fit an integer dtype raise OverflowError, NaN and infinite samples ValueError.
+    """
+    if dtype not in DTYPES and dtype != 'object':
+        raise ValueError(f"dtype must be one of {', '.join(DTYPES)}.")
+
+    code = _CODES[dtype]
+    if np is not None:
+        if buf.dtype.name == dtype:
+            return buf
+        if buf.dtype.kind == 'c' and not dtype.startswith('complex'):
+            # like the pure-Python engine, converting to a real type keeps the real part
+            buf = buf.real
+        if code in _INTS and len(buf):
+            if buf.dtype.kind == 'f' and not np.isfinite(buf).all():
+                raise ValueError("NaN and infinite samples cannot be converted to integers.")
+            _check_range(int(buf.min()), int(buf.max()), code)
+        return buf.astype(dtype)
+
+    if code == _code(buf):
+        return buf
+    if code in _INTS:
+        values = [v.real if isinstance(v, complex) else v for v in buf]
+        if _code(buf) in 'fdcF' and not all(math.isfinite(v) for v in values):
+            raise ValueError("NaN and infinite samples cannot be converted to integers.")
+        values = [int(v) for v in values]
+        if values:
+            _check_range(min(values), max(values), code)
+        return array(code, values)
+    if code in 'fd':
+        return array(code, [v.real if isinstance(v, complex) else v for v in buf])
+    return pack(buf, code)
+
+
+def _check_range(lo, hi, code):
+    """
+    Raise OverflowError unless the integers lo through hi fit in the integer kind code.
+    """
+    low, high = _INT_RANGES[code]
+    if lo < low or hi > high:
+        raise OverflowError(f"The samples do not fit in {_NAMES[code]}.")
+
+
+def pack(values, code=None):
+    """
+    Store a sequence of Python scalars in the most compact pure-Python buffer.
+    """
+    if code is None:
+        code = 'q'
+        for value in values:
+            code = _promote(code, _scalar_code(value))
+            if code == 'c':
+                break
+
+    if code == 'c':
+        return [complex(value) for value in values]
+    if code == 'F':
+        return _complex64(values)
+    if code == 'O':
+        return list(values)
+
+    try:
+        return array(code, values)
+    except OverflowError:
+        if code in _NARROW:
+            return pack(values, 'q')
+        return list(values)
+
+
+def asbuffer(values, copy=True):
+    """
+    Return a contiguous buffer holding a sequence of scalars. Unless copy is True a
+    buffer of the active engine is returned as it is.
+    """
+    if np is not None:
+        buf = np.array(values) if copy else np.asarray(values)
+        if buf.dtype.kind == 'b' or (not len(buf) and not isinstance(values, np.ndarray)):
+            # an empty sequence holds integers, as on the pure-Python engine
+            buf = buf.astype(np.int64)
+        return buf.reshape(-1)
+
+    if isinstance(values, array) and values.typecode in _NAMES:
+        return array(values.typecode, values) if copy else values
+    if isinstance(values, _Complex64):
+        return values[:] if copy else values
+
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        code = _CODES.get(values.dtype.name)
+        return pack(values.tolist(), code if code != 'O' else None)
+
+    return pack(values)
+
+
+def full(n, value):
+    """
+    Return a buffer of length n with every element set to value.
+    """
+    if np is not None:
+        return np.full(n, value)
+
+    return pack([value] * n, _scalar_code(value))
+
+
+def zeros(n, like):
+    """
+    Return a buffer of n zeros that can hold the values of the buffer like.
+    """
+    if np is not None:
+        return np.zeros(n, dtype=like.dtype)
+
+    code = _code(like)
+    if code == 'c':
+        return [0j] * n
+    if code == 'F':
+        return _Complex64([0j]) * n
+    if code == 'O':
+        return [0] * n
+    return array(code, [0]) * n
+
+
+def copy(buf):
+    """
+    Return a copy of a buffer.
+    """
+    if np is not None:
+        return buf.copy()
+
+    return buf[:]
+
+
+def tolist(buf):
+    """
+    Return the elements of a buffer as a list of Python scalars.
+    """
+    if isinstance(buf, list):
+        return list(buf)
+    return buf.tolist()
+
+
+def item(buf, index):
+    """
+    Return a single element of a buffer as a Python scalar.
+    """
+    if np is not None:
+        return buf.item(index)
+
+    return buf[index]
+
+
+def strided(buf, start, first, count, step):
+    """
+    Return the samples at the absolute indices first, first + step, ... (count of
+    them), zero where they fall outside of the buffer, along with True when the
+    result is a view that shares memory with buf.
+    """
+    indices = range(first, first + count * step, step) if step else None
+    if indices is None or not indices:
+        return zeros(0, buf), False
+
+    # the run of requested indices that falls inside of the buffer
+    lo, hi = start, start + len(buf)
+    if step > 0:
+        head = min(max(-((first - lo) // step), 0), count)
+        tail = min(max(-((first - hi) // step), head), count)
+    else:
+        head = min(max((first - hi) // -step + 1, 0), count)
+        tail = min(max((first - lo) // -step + 1, head), count)
+
+    offset = first + head * step - start
+    stop = offset + (tail - head) * step
+    inside = buf[offset:stop if stop >= 0 else None:step] if tail > head else buf[0:0]
+
+    if head == 0 and tail == count:
+        return inside, np is not None
+
+    # pad with zeros in bulk around the samples inside of the buffer
+    out = zeros(count, buf)
+    out[head:tail] = inside
+    return out, False
+
+
+def reverse(buf):
+    """
+    Return the buffer in reverse order along with True when the result is a
+    view that shares memory with buf.
+    """
+    if np is not None:
+        return buf[::-1], True
+
+    return buf[::-1], False
+
+
+def add(a, a_start, b, b_start):
+    """
+    Return the elementwise sum of two buffers aligned by their start indices
+    along with the start index of the result.
+    """
+    return _combine(a, a_start, b, b_start, 1)
+
+
+def subtract(a, a_start, b, b_start):
+    """
+    Return the elementwise difference of two buffers aligned by their start
+    indices along with the start index of the result.
+    """
+    return _combine(a, a_start, b, b_start, -1)
+
+
+def _combine(a, a_start, b, b_start, sign):
+    """
+    Return a plus sign times b with the buffers aligned by their start indices.
+    """
+    start = min(a_start, b_start)
+    stop = max(a_start + len(a), b_start + len(b))
+    a_off = a_start - start
+    b_off = b_start - start
+
+    if np is not None:
+        dtype = np.result_type(a, b)
+        work = dtype
+        if dtype.kind in 'iu' and not _narrow(dtype) and _peak(a) + _peak(b) > _INT64_MAX:
+            # sums that may leave 64 bits are computed exactly with Python integers
+            work, a, b = np.dtype(object), a.astype(object), b.astype(object)
+        elif _narrow(dtype):
+            # narrow integers are summed in 64 bits and only kept narrow when the sums fit
+            work = np.dtype(np.int64)
+
+        out = np.zeros(stop - start, dtype=work)
+        out[a_off:a_off + len(a)] += a
+        if sign > 0:
+            out[b_off:b_off + len(b)] += b
+        else:
+            out[b_off:b_off + len(b)] -= b
+        return (_fit(out, dtype) if work != dtype else out), start
+
+    out = [0] * (stop - start)
+    out[a_off:a_off + len(a)] = a
+    if sign > 0:
+        out[b_off:b_off + len(b)] = [u + v for u, v in zip(out[b_off:b_off + len(b)], b)]
+    else:
+        out[b_off:b_off + len(b)] = [u - v for u, v in zip(out[b_off:b_off + len(b)], b)]
+    return pack(out, _promote(_code(a), _code(b))), start
+
+
+def accumulate(buf, start, spare, b, b_start, factor=1, inplace=False):
+    """
+    Return buf plus factor times b, aligned by their start indices, along with the
+    start index of the result and its spare room. With inplace the sum is written to
+    buf, and with NumPy a support that grows reuses the room reserved around buf by
+    an earlier call, spare, so a run of accumulations only reallocates a few times.
+    """
+    if not len(b):
+        return buf, start, spare
+
+    if not len(buf):
+        start = b_start
+    first = min(start, b_start)
+    last = max(start + len(buf), b_start + len(b)) - 1
+
+    if np is not None:
+        # like scale, a Python integer factor keeps the type of b while the products fit it
+        dtype = np.result_type(buf.dtype, b.dtype if isinstance(factor, int) else _scalar_type(b.dtype, factor))
+        if dtype.kind == 'O' or dtype.kind in 'iu' and isinstance(factor, int) and (
+                not _INT64_MIN <= factor <= _INT64_MAX
+                or _peak(window(buf, start, b_start, b_start + len(b) - 1)) + _peak(b) * abs(factor) > _INT64_MAX):
+            # sums that may leave 64 bits are computed exactly, the same way as x + y * factor
+            out, first = _combine(buf, start, scale(b, factor), b_start, 1)
+            return out, first, None
+        if _narrow(dtype):
+            # narrow integers widen to 64 bits once a sum no longer fits
+            current = window(buf, start, b_start, b_start + len(b) - 1).astype(np.int64)
+            if _fit(current + factor * b.astype(np.int64), dtype).dtype != dtype:
+                dtype = np.dtype(np.int64)
+
+        if inplace and dtype == buf.dtype and first == start and last == start + len(buf) - 1:
+            store, store_start = buf, start
+        elif (inplace and dtype == buf.dtype and spare is not None and spare[2] is buf
+              and first >= spare[1] and last < spare[1] + len(spare[0])):
+            store, store_start = spare[0], spare[1]
+        else:
+            # reserve as much room again as the samples on every side the support grew on
+            n = last - first + 1
+            left = n if len(buf) and first < start else 0
+            right = n if len(buf) and last >= start + len(buf) else 0
+            store, store_start = np.zeros(left + n + right, dtype=dtype), first - left
+            store[start - store_start:start - store_start + len(buf)] = buf
+
+        # the room around buf is still zero, so the grown samples are buf padded with zeros
+        out = store[first - store_start:last - store_start + 1]
+        segment = out[b_start - first:b_start - first + len(b)]
+        if factor == 1:
+            segment += b
+        elif factor == -1:
+            segment -= b
+        elif _narrow(b.dtype) and isinstance(factor, int):
+            # the sums fit, but the factor itself may not fit the narrow type of b
+            segment += factor * b.astype(np.int64)
+        else:
+            segment += factor * b
+        return out, first, (store, store_start, out)
+
+    code = _promote(_code(buf), _code(b) if isinstance(factor, int) else _promote_scalar(_code(b), factor))
+    if not inplace or code != _code(buf):
+        buf = pack(list(buf), code)
+
+    # lists and arrays grow at either end without a new buffer
+    if start > first:
+        buf[0:0] = zeros(start - first, buf)
+    if last >= first + len(buf):
+        buf.extend(zeros(last - first + 1 - len(buf), buf))
+
+    offset = b_start - first
+    segment = [u + factor * v for u, v in zip(buf[offset:offset + len(b)], b)]
+    if isinstance(buf, array):
+        try:
+            segment = array(buf.typecode, segment)
+        except OverflowError:
+            # narrow integers widen to 64 bits, wider sums are kept as Python integers
+            segment = pack(segment, 'q')
+            buf = pack(list(buf), 'q') if isinstance(segment, array) else list(buf)
+    elif code == 'F':
+        segment = _complex64(segment)
+    buf[offset:offset + len(b)] = segment
+    return buf, first, None
+
+
+def scale(buf, value, inplace=False):
+    """
+    Return a buffer with every element multiplied by a scalar. With inplace the
+    products are written to buf whenever they keep its type.
+    """
+    if np is not None:
+        if buf.dtype.kind in 'iu' and isinstance(value, int) and \
+                (not _INT64_MIN <= value <= _INT64_MAX or _peak(buf) * abs(value) > _INT64_MAX):
+            # products that may leave 64 bits are computed exactly with Python integers
+            out = _fit(buf.astype(object) * value, buf.dtype)
+        elif _narrow(buf.dtype) and isinstance(value, int):
+            # narrow integers are scaled in 64 bits and only kept narrow when the products fit
+            out = _fit(buf.astype(np.int64) * value, buf.dtype)
+        else:
+            out = None
+
+        if out is not None:
+            if inplace and out.dtype == buf.dtype:
+                buf[:] = out
+                return buf
+            return out
+        if inplace and np.result_type(buf.dtype, value) == buf.dtype:
+            buf *= value
+            return buf
+        return buf * value
+
+    code = _code(buf)
+    if code in _INTS and isinstance(value, int):
+        # like NumPy, integer products keep the buffer type while they fit it
+        return pack([v * value for v in buf], code)
+    return pack([v * value for v in buf], _promote_scalar(code, value))
+
+
+def multiply(buf, values):
+    """
+    Return the elementwise product of a buffer and a list of scalars.
+    """
+    if np is not None:
+        return buf * asbuffer(values)
+
+    return pack([u * v for u, v in zip(buf, values)])
+
+
+def conjugate(buf):
+    """
+    Return a buffer with every element complex conjugated.
+    """
+    if np is not None:
+        return np.conjugate(buf)
+
+    code = _code(buf)
+    if code in 'cF':
+        out = [v.conjugate() for v in buf]
+        return _Complex64(out) if code == 'F' else out
+    return buf[:]
+
+
+def _round_scalar(value, ndigits):
+    """
+    Round a single scalar the way the builtin round does, keeping complex values complex.
+    """
+    if isinstance(value, complex):
+        return complex(round(value.real, ndigits) + 0.0, round(value.imag, ndigits) + 0.0)
+    return round(value, ndigits)
+
+
+def round_values(buf, ndigits=None, inplace=False):
+    """
+    Return a buffer with every element rounded to ndigits. Complex buffers whose
+    imaginary parts all round to zero are returned as real buffers. With inplace
+    the rounded values are written to buf whenever they keep its type.
+    """
+    if np is not None and buf.dtype.kind != 'O':
+        if buf.dtype.kind in 'iu':
+            if ndigits is None or ndigits >= 0:
+                return buf if inplace else buf.copy()
+            return np.round(buf, ndigits)
+
+        # adding zero turns the -0.0 left behind by rounding into 0.0
+        if inplace and ndigits is not None:
+            out = np.round(buf, ndigits, out=buf)
+            out += buf.dtype.type(0)
+        else:
+            out = np.round(buf, ndigits or 0) + buf.dtype.type(0)
+
+        if buf.dtype.kind == 'c':
+            if np.any(out.imag):
+                return out
+            out = out.real.copy()
+        elif ndigits is None:
+            if not np.isfinite(out).all():
+                raise ValueError("NaN and infinite samples cannot be rounded to integers.")
+            out = out.astype(np.int64)
+        return out
+
+    code = _code(buf)
+    if code in 'fd' and ndigits is None and not all(math.isfinite(v) for v in buf):
+        raise ValueError("NaN and infinite samples cannot be rounded to integers.")
+    values = [_round_scalar(v, ndigits) for v in buf]
+    if code in 'cF':
+        if not any(v.imag for v in values):
+            return pack([v.real for v in values], 'f' if code == 'F' else 'd')
+        return pack(values, code)
+    if code in 'fd' and ndigits is None:
+        # like NumPy, rounding floats to whole numbers gives 64 bit integers
+        return pack(values, 'q')
+    return pack(values, code)
+
+
+def _parts(buf):
+    """
+    Return the real and imaginary parts of a NumPy buffer as writable views, only the real part for real buffers.
+    """
+    if buf.dtype.kind == 'c':
+        return [buf.real, buf.imag]
+    return [buf]
+
+
+def quantize_values(buf, frac_bits, int_bits=None, inplace=False):
+    """
+    Return a buffer with the real and imaginary part of every element rounded to
+    a multiple of 2**-frac_bits, and saturated to the range of a signed Q format
+    with int_bits integer bits when int_bits is given. The buffer type is kept.
+    """
+    scale = 2.0 ** frac_bits
+    if int_bits is not None:
+        lo, hi = -2.0 ** (int_bits + frac_bits), 2.0 ** (int_bits + frac_bits) - 1
+
+    if np is not None and buf.dtype.kind in 'fc':
+        out = buf if inplace else buf.copy()
+        for part in _parts(out):
+            part *= scale
+            np.rint(part, out=part)
+            if int_bits is not None:
+                np.clip(part, lo, hi, out=part)
+            part /= scale
+        return out
+
+    def quantize(v):
+        v = round(v * scale)
+        if int_bits is not None:
+            v = min(max(v, lo), hi)
+        return v / scale
+
+    if np is not None and buf.dtype.kind in 'iu':
+        # integers are already on the grid of any frac_bits >= 0, only the saturation applies
+        if frac_bits >= 0:
+            if int_bits is None:
+                return buf if inplace else buf.copy()
+            return np.clip(buf, -(1 << int_bits), (1 << int_bits) - 1, out=buf if inplace else None)
+        return asbuffer([int(quantize(v)) for v in buf.tolist()])
+
+    if kind(buf) == 'c':
+        return pack([complex(quantize(v.real), quantize(v.imag)) for v in buf], _code(buf))
+    if kind(buf) == 'f':
+        return pack([quantize(v) for v in buf], _code(buf))
+    return pack([int(quantize(v)) for v in buf], _code(buf))
+
+
+def snap_values(buf, tol, inplace=False):
+    """
+    Return a buffer with every real and imaginary part smaller than tol in magnitude set to zero.
+    The buffer type is kept.
+    """
+    if np is not None:
+        out = buf if inplace else buf.copy()
+        for part in _parts(out):
+            part[np.abs(part) < tol] = 0
+        return out
+
+    def snap(v):
+        return 0 * v if abs(v) < tol else v
+
+    code = _code(buf)
+    if code in 'cF':
+        out = [complex(snap(v.real), snap(v.imag)) for v in buf]
+        return _Complex64(out) if code == 'F' else out
+    return pack([snap(v) for v in buf], _code(buf))
+
+
+def setitem(buf, start, index, value):
+    """
+    Store value at the absolute index, growing the buffer with zeros when the
+    index lies outside of it. Returns the buffer and its start index.
+    """
+    offset = index - start
+
+    if np is not None:
+        dtype = _scalar_type(buf.dtype, value)
+        if offset < 0 or offset >= len(buf):
+            left = max(-offset, 0)
+            right = max(offset - len(buf) + 1, 0)
+            grown = np.zeros(len(buf) + left + right, dtype=dtype)
+            grown[left:left + len(buf)] = buf
+            buf, start, offset = grown, start - left, offset + left
+        elif dtype != buf.dtype:
+            buf = buf.astype(dtype)
+        buf[offset] = value
+        return buf, start
+
+    code = _promote_scalar(_code(buf), value)
+    if code != _code(buf):
+        buf = pack(buf, code)
+
+    if offset < 0:
+        buf = zeros(-offset, buf) + buf
+        start, offset = index, 0
+    elif offset >= len(buf):
+        buf.extend(zeros(offset - len(buf) + 1, buf))
+
+    if code == 'F':
+        value = _complex64([value])[0]
+    buf[offset] = complex(value) if code == 'c' else value
+    return buf, start
+
+
+def widen(buf, start, first, last):
+    """
+    Return the buffer zero-padded to cover at least the absolute indices first
+    through last, along with its start index.
+    """
+    left = max(start - first, 0)
+    right = max(last - (start + len(buf) - 1), 0)
+    if not left and not right:
+        return buf, start
+
+    if np is not None:
+        grown = np.zeros(len(buf) + left + right, dtype=buf.dtype)
+        grown[left:left + len(buf)] = buf
+        return grown, start - left
+
+    return zeros(left, buf) + buf + zeros(right, buf), start - left
+
+
+def window(buf, start, first, last):
+    """
+    Return the samples at the absolute indices first through last, zero where
+    they fall outside of the buffer.
+    """
+    lo = max(first, start)
+    hi = min(last, start + len(buf) - 1)
+
+    # a window inside of the buffer is a plain slice
+    if lo == first and hi == last:
+        return buf[first - start:last - start + 1]
+
+    out = zeros(max(last - first + 1, 0), buf)
+    if lo <= hi:
+        out[lo - first:hi - first + 1] = buf[lo - start:hi - start + 1]
+    return out
+
+
+def first_difference(a, a_start, b, b_start, rtol=0, atol=0):
+    """
+    Return the first absolute index where two buffers aligned by their start
+    indices and zero-padded outside of them differ, or None. Values differ
+    when |a - b| > atol + rtol * |b|, NaN values always differ.
+    """
+    extents = [(start, start + len(buf) - 1) for buf, start in ((a, a_start), (b, b_start)) if len(buf)]
+    if not extents:
+        return None
+
+    first = min(lo for lo, _ in extents)
+    last = max(hi for _, hi in extents)
+    exact = not rtol and not atol
+
+    for block in range(first, last + 1, _COMPARE_BLOCK):
+        end = min(block + _COMPARE_BLOCK - 1, last)
+        u = window(a, a_start, block, end) if len(a) else zeros(end - block + 1, b)
+        v = window(b, b_start, block, end) if len(b) else zeros(end - block + 1, a)
+
+        if np is not None:
+            differ = (u != v) if exact else ~(np.abs(u - v) <= atol + rtol * np.abs(v))
+            positions = np.flatnonzero(differ)
+            if len(positions):
+                return block + int(positions[0])
+            continue
+
+        for k, (p, q) in enumerate(zip(u, v)):
+            if (p != q) if exact else not abs(p - q) <= atol + rtol * abs(q):
+                return block + k
+
+    return None
+
+
+def energy(buf):
+    """
+    Return the sum of the squared magnitudes of the elements of a buffer.
+    """
+    if np is not None:
+        return float(np.vdot(buf, buf).real)
+
+    return float(sum(abs(v) ** 2 for v in buf))
+
+
+def concatenate(bufs):
+    """
+    Return the buffers joined end to end in a buffer that can hold all of their values.
+    """
+    if np is not None:
+        return np.concatenate(bufs)
+
+    values = []
+    for buf in bufs:
+        values.extend(buf)
+    codes = [_code(buf) for buf in bufs if len(buf)]
+    return pack(values, _promote(*codes) if codes else 'q')
+
+
+def _file_dtype(dtype):
+    """
+    Return the little-endian NumPy type of the stored values of a raw file format.
+    """
+    code = _FILE_CODES[dtype]
+    return numpy.dtype('<' + {'h': 'i2', 'i': 'i4', 'q': 'i8', 'f': 'f4', 'd': 'f8'}[code])
+
+
+def frombuffer(data, dtype):
+    """
+    Return a buffer of the raw little-endian samples in a bytes-like object. With
+    NumPy the buffer shares memory with data, except for 'cint16' samples.
+    """
+    if dtype not in FILE_DTYPES:
+        raise ValueError(f"dtype must be one of {', '.join(FILE_DTYPES)}.")
+
+    if np is not None:
+        buf = np.frombuffer(data, dtype=_file_dtype(dtype))
+        return _from_stored(buf, dtype)
+
+    values = array(_FILE_CODES[dtype])
+    values.frombytes(bytes(data))
+    if sys.byteorder == 'big':
+        values.byteswap()
+
+    if dtype.startswith('c'):
+        # like NumPy, cint16 samples are read as complex64
+        out = [complex(re, im) for re, im in zip(values[0::2], values[1::2])]
+        return out if dtype == 'complex128' else _Complex64(out)
+    return values
+
+
+def memmap(path, dtype):
+    """
+    Return a read-only buffer of the raw little-endian samples in a file. With
+    NumPy the file is memory-mapped and only read where it is indexed.
+    """
+    if dtype not in FILE_DTYPES:
+        raise ValueError(f"dtype must be one of {', '.join(FILE_DTYPES)}.")
+
+    if np is not None:
+        stored = _file_dtype(dtype)
+        with open(path, 'rb') as f:
+            f.seek(0, 2)
+            size = f.tell()
+
+        # an empty file cannot be mapped
+        if size < stored.itemsize:
+            return _from_stored(np.zeros(0, dtype=stored), dtype)
+        return _from_stored(np.memmap(path, dtype=stored, mode='r'), dtype)
+
+    with open(path, 'rb') as f:
+        return frombuffer(f.read(), dtype)
+
+
+def _from_stored(buf, dtype):
+    """
+    Return the samples of a NumPy buffer of stored values, pairing up the parts of complex formats.
+    """
+    if dtype == 'cint16':
+        return buf.astype(np.float32).view(np.complex64)
+    if dtype.startswith('complex'):
+        return buf.view(np.complex64 if dtype == 'complex64' else np.complex128)
+    return buf
+
+
+def tofile(buf, f, dtype):
+    """
+    Write a buffer to an open binary file as raw little-endian samples of the
+    given format, rounding and clipping values stored in an integer format.
+    """
+    if dtype not in FILE_DTYPES:
+        raise ValueError(f"dtype must be one of {', '.join(FILE_DTYPES)}.")
+
+    if kind(buf) == 'c' and not dtype.startswith('c'):
+        raise ValueError(f"Complex samples cannot be written as {dtype}.")
+
+    code = _FILE_CODES[dtype]
+    integer = code in 'hiq'
+    limit = 1 << (8 * array(code).itemsize - 1)
+
+    for first in range(0, len(buf), _FILE_CHUNK):
+        part = buf[first:first + _FILE_CHUNK]
+
+        if np is not None:
+            if dtype.startswith('c'):
+                part = np.stack([np.real(part), np.imag(part)], axis=1).reshape(-1)
+            if integer and part.dtype.kind in 'iu':
+                # clip within the range of both the samples and the stored format
+                info = np.iinfo(part.dtype)
+                part = np.clip(part, max(-limit, info.min), min(limit - 1, info.max))
+            elif integer:
+                part = np.clip(np.rint(part), -limit, limit - 1)
+            f.write(part.astype(_file_dtype(dtype)).tobytes())
+            continue
+
+        values = part
+        if dtype.startswith('c'):
+            values = []
+            for v in part:
+                values.append(v.real)
+                values.append(v.imag)
+        if integer:
+            values = [min(max(int(round(v)), -limit), limit - 1) for v in values]
+
+        out = array(code, values)
+        if sys.byteorder == 'big':
+            out.byteswap()
+        f.write(out.tobytes())
@@ -0,0 +1,290 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from DigitalSignal import DigitalSignal
+from DigitalSignal.backend import asbuffer
+from DigitalSignal.convolution import _EXACT_LIMIT, choose_method
+
+
+class SignalBatch:
+    """
+    Many signals stored as the rows of one 2-D array. Column j of every row holds
+    the sample at index start + j, row r only has samples on its own support,
+    indices starts[r] through starts[r] + lengths[r] - 1, and is zero elsewhere.
+
+    Operators act on every row with one vectorized call and follow the rules of
+    the matching DigitalSignal operator. Requires NumPy, which the batch computes
+    with whatever engine set_backend selects. The signals it returns use that engine.
+    """
+
+    def __init__(self, data, start=0, starts=None, lengths=None):
+        if np is None:
+            raise ImportError("SignalBatch requires NumPy to be installed.")
+
+        data = np.array(data)
+        if data.ndim != 2:
+            raise ValueError("data must be a 2-D array with one signal per row.")
+
+        if data.dtype.kind not in 'biufc':
+            raise TypeError("DigitalSignal values can only be scalars.")
+        if data.dtype.kind == 'b':
+            data = data.astype(np.int64)
+
+        rows, columns = data.shape
+        self.data = data
+        self.start = start
+        self.starts = np.full(rows, start) if starts is None else np.asarray(starts, dtype=np.int64)
+        self.lengths = np.full(rows, columns) if lengths is None else np.asarray(lengths, dtype=np.int64)
+
+    @classmethod
+    def _wrap(cls, data, start, starts, lengths):
+        """
+        Build a batch around an existing array without copying or validating it.
+        """
+        batch = cls.__new__(cls)
+        batch.data = data
+        batch.start = start
+        batch.starts = starts
+        batch.lengths = lengths
+        return batch
+
+    @classmethod
+    def from_signals(cls, signals):
+        """
+        Return a batch holding a list of DigitalSignal objects, aligned at their zero indices.
+        """
+        if np is None:
+            raise ImportError("SignalBatch requires NumPy to be installed.")
+
+        signals = list(signals)
+        if not signals or not all(isinstance(signal, DigitalSignal) for signal in signals):
+            raise TypeError("A SignalBatch can only be built from a non-empty list of DigitalSignal objects.")
+
+        shapes = [signal.shape() for signal in signals]
+        start = min(first for first, _ in shapes)
+        stop = max(last for _, last in shapes)
+
+        buffers = [np.asarray(signal._data) for signal in signals]
+        data = np.zeros((len(signals), stop - start + 1), dtype=np.result_type(*buffers))
+        for row, (signal, buf) in enumerate(zip(signals, buffers)):
+            offset = signal._start - start
+            data[row, offset:offset + len(buf)] = buf
+
+        # every row keeps the support of its stored samples, not the padding out to index 0
+        starts = np.array([signal._start for signal in signals], dtype=np.int64)
+        lengths = np.array([len(buf) for buf in buffers], dtype=np.int64)
+        return cls._wrap(data, start, starts, lengths)
+
+    def to_signals(self):
+        """
+        Return the rows of the batch as a list of DigitalSignal objects.
+        """
+        return [self[row] for row in range(len(self))]
+
+    def __len__(self):
+        """
+        Return the number of signals in the batch.
+        """
+        return self.data.shape[0]
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self[row]
+
+    def __getitem__(self, index):
+        """
+        Return one row as a DigitalSignal, or a slice of rows as a SignalBatch.
+        """
+        if isinstance(index, slice):
+            return SignalBatch._wrap(self.data[index], self.start, self.starts[index], self.lengths[index])
+
+        if not isinstance(index, int):
+            raise TypeError("Indexing only supports integers and slices.")
+
+        offset = int(self.starts[index]) - self.start
+        data = asbuffer(self.data[index, offset:offset + int(self.lengths[index])])
+        return DigitalSignal._wrap(data, int(self.starts[index]))
+
+    def __repr__(self):
+        return f"SignalBatch({len(self)} signals, shape={self.shape()}, dtype={self.data.dtype})"
+
+    def shape(self):
+        """
+        Return the first and last index of the columns shared by every row.
+        """
+        return (self.start, self.start + self.data.shape[1] - 1)
+
+    def __call__(self, amount=0):
+        """
+        Return the batch with every signal time shifted by the specified amount.
+        """
+        if not isinstance(amount, int):
+            raise TypeError("Time-shifting only supports integers.")
+
+        return SignalBatch._wrap(self.data, self.start - amount, self.starts - amount, self.lengths)
+
+    def __invert__(self):
+        """
+        Return the batch with every signal time-reversed.
+        """
+        start = -(self.start + self.data.shape[1] - 1)
+        starts = -(self.starts + self.lengths - 1)
+        return SignalBatch._wrap(self.data[:, ::-1], start, starts, self.lengths)
+
+    def complex_conjugate(self):
+        return SignalBatch._wrap(np.conjugate(self.data), self.start, self.starts, self.lengths)
+
+    def _combine(self, other, sign):
+        """
+        Return the rowwise sum of this batch and sign times another batch or a single DigitalSignal.
+        """
+        if isinstance(other, DigitalSignal):
+            other = SignalBatch.from_signals([other])
+        elif not isinstance(other, SignalBatch):
+            raise TypeError("Addition is only supported with SignalBatch or DigitalSignal objects.")
+
+        if len(other) not in (1, len(self)):
+            raise ValueError("Both batches must hold the same number of signals.")
+
+        start = min(self.start, other.start)
+        stop = max(self.shape()[1], other.shape()[1])
+        data = np.zeros((len(self), stop - start + 1), dtype=np.result_type(self.data, other.data))
+
+        offset = self.start - start
+        data[:, offset:offset + self.data.shape[1]] += self.data
+        offset = other.start - start
+        if sign > 0:
+            data[:, offset:offset + other.data.shape[1]] += other.data
+        else:
+            data[:, offset:offset + other.data.shape[1]] -= other.data
+
+        starts = np.minimum(self.starts, other.starts)
+        stops = np.maximum(self.starts + self.lengths, other.starts + other.lengths)
+        return SignalBatch._wrap(data, start, starts, stops - starts)
+
+    def __add__(self, other):
+        return self._combine(other, 1)
+
+    def __sub__(self, other):
+        return self._combine(other, -1)
+
+    def __mul__(self, other):
+        """
+        Return the batch scaled by a scalar, or multiplied elementwise by a callable of the index.
+        """
+        if hasattr(other, 'evaluate'):
+            values = np.asarray(other.evaluate(self.start, self.data.shape[1]))
+            return SignalBatch._wrap(self.data * values, self.start, self.starts, self.lengths)
+
+        if callable(other):
+            indices = range(self.start, self.start + self.data.shape[1])
+            values = np.array([other(idx) for idx in indices])
+            return SignalBatch._wrap(self.data * values, self.start, self.starts, self.lengths)
+
+        if not isinstance(other, (int, float, complex, np.number)):
+            raise TypeError("The scalar must be an integer, float, complex or callable.")
+
+        return SignalBatch._wrap(self.data * other, self.start, self.starts, self.lengths)
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def __neg__(self):
+        return -1 * self
+
+    def round(self, ndigits=None):
+        """
+        Return the batch with every sample rounded, following DigitalSignal.round.
+        """
+        data = self.data
+        if data.dtype.kind in 'iu':
+            data = data.copy() if ndigits is None else np.round(data, ndigits)
+        else:
+            data = np.round(data, ndigits or 0) + data.dtype.type(0)
+            if data.dtype.kind == 'c' and not np.any(data.imag):
+                data = data.real.copy()
+            elif data.dtype.kind == 'f' and ndigits is None:
+                data = data.astype(np.int64)
+
+        return SignalBatch._wrap(data, self.start, self.starts, self.lengths)
+
+    def __matmul__(self, other):
+        return self.convolve(other)
+
+    def convolve(self, other, method='auto'):
+        """
+        Return every signal convolved with one DigitalSignal kernel, or row by row
+        with a batch of kernels. Method can be 'auto', 'direct' or 'fft'.
+        """
+        if isinstance(other, DigitalSignal):
+            kernels = SignalBatch.from_signals([other])
+        elif isinstance(other, SignalBatch):
+            kernels = other
+        else:
+            raise TypeError("Convolution is only supported with SignalBatch or DigitalSignal objects.")
+
+        if len(kernels) not in (1, len(self)):
+            raise ValueError("A batch of kernels must hold one kernel per signal.")
+
+        if method not in ('auto', 'direct', 'fft'):
+            raise ValueError("method must be one of auto, direct, fft.")
+
+        a, b = self.data, kernels.data
+        n, m = a.shape[1], b.shape[1]
+        integer = a.dtype.kind in 'iu' and b.dtype.kind in 'iu'
+
+        if method == 'auto':
+            peak = (int(np.abs(a).max()) * int(np.abs(b).max()) * min(n, m)) if integer and a.size and b.size else 0
+            method = 'direct' if choose_method(n, m, peak >= _EXACT_LIMIT) == 'direct' else 'fft'
+
+        if method == 'direct':
+            # one vectorized multiply-accumulate per kernel tap
+            out = np.zeros((len(self), n + m - 1), dtype=np.result_type(a, b))
+            for k in range(m):
+                out[:, k:k + n] += a * b[:, k:k + 1]
+        else:
+            length = n + m - 1
+            nfft = 1 << (length - 1).bit_length()
+            if a.dtype.kind == 'c' or b.dtype.kind == 'c':
+                out = np.fft.ifft(np.fft.fft(a, nfft, axis=1) * np.fft.fft(b, nfft, axis=1), axis=1)[:, :length]
+            else:
+                out = np.fft.irfft(np.fft.rfft(a, nfft, axis=1) * np.fft.rfft(b, nfft, axis=1), nfft, axis=1)[:, :length]
+                if integer:
+                    out = np.rint(out).astype(np.int64)
+
+        starts = self.starts + kernels.starts
+        lengths = self.lengths + kernels.lengths - 1
+        return SignalBatch._wrap(out, self.start + kernels.start, starts, lengths)
+
+    def __mod__(self, other):
+        return self.correlate(other)
+
+    def correlate(self, other, max_lag=None):
+        """
+        Return the lag indexed correlation of every signal with one DigitalSignal template,
+        or row by row with a batch of templates, limited to -max_lag through max_lag when given.
+        """
+        if isinstance(other, DigitalSignal):
+            other = SignalBatch.from_signals([other])
+        elif not isinstance(other, SignalBatch):
+            raise TypeError("Correlation is only supported with SignalBatch or DigitalSignal objects.")
+
+        corr = self.convolve(~other.complex_conjugate())
+        if max_lag is None:
+            return corr
+
+        if not isinstance(max_lag, int) or max_lag < 0:
+            raise ValueError("max_lag must be a non-negative integer.")
+
+        # keep the columns of the lag window, zero-padded where the correlation has no samples
+        data = np.zeros((len(corr), 2 * max_lag + 1), dtype=corr.data.dtype)
+        lo = max(corr.start, -max_lag)
+        hi = min(corr.shape()[1], max_lag)
+        if lo <= hi:
+            data[:, lo + max_lag:hi + max_lag + 1] = corr.data[:, lo - corr.start:hi - corr.start + 1]
+
+        starts = np.full(len(corr), -max_lag)
+        lengths = np.full(len(corr), 2 * max_lag + 1)
+        return SignalBatch._wrap(data, -max_lag, starts, lengths)
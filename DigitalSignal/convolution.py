@@ -0,0 +1,611 @@
+import cmath
+
+try:
+    from DigitalSignal.backend import (array_module, exact_integers, fit_integers, get_backend, kind, pack,
+                                       set_backend, window, zeros)
+    from DigitalSignal.parallel import PARALLEL_MIN, attach, get_executor, map_tasks, share, uses_processes, worker_count
+    from DigitalSignal.profiling import note
+except ImportError:
+    # this is a hack to allow the convolution engine to be used in the online REPL
+    pass
+
+
+METHODS = ('auto', 'direct', 'fft', 'overlap-add')
+
+# relative cost of one FFT butterfly against one direct multiply-accumulate,
+# measured for each storage engine
+_FFT_COST = {'numpy': 16, 'array': 3}
+
+# FFT lengths whose plans the pure-Python engine keeps, see _plan
+_PLAN_CACHE_SIZE = 32
+_PLANS = {}
+
+# kernel spectra kept for repeated FFT convolutions and correlations, see _kernel_transform
+_KERNEL_CACHE_BYTES = 32 << 20
+_KERNELS = {}
+_kernel_stats = {'hits': 0, 'misses': 0, 'bytes': 0}
+
+# integer results computed with an FFT are rounded back to integers, which is
+# only exact while the largest possible output stays well inside float precision
+_EXACT_LIMIT = 2 ** 40
+
+# integer results that may pass this are summed as exact Python integers instead of in 64 bits
+_INT64_MAX = 2 ** 63 - 1
+
+
+def _next_pow2(n):
+    """
+    Return the smallest power of two that is at least n.
+    """
+    return 1 << max(n - 1, 0).bit_length()
+
+
+def _fft_cost(n):
+    """
+    Return the cost of one forward or inverse transform of length n.
+    """
+    return n * max(n.bit_length() - 1, 1)
+
+
+def _peak(buf):
+    """
+    Return the largest magnitude in an integer buffer as a Python integer.
+    """
+    if not len(buf):
+        return 0
+    np = array_module()
+    if np is not None:
+        return max(-int(buf.min()), int(buf.max()))
+    return max(-min(buf), max(buf))
+
+
+def _wide(a, b, m):
+    """
+    Return True when sums of m products of two integer buffers need exact Python integers,
+    because an operand already holds integers beyond 64 bits or the sums may not fit in them.
+    """
+    kinds = kind(a) + kind(b)
+    return kinds in ('iO', 'Oi', 'OO') or (kinds == 'ii' and _peak(a) * _peak(b) * m > _INT64_MAX)
+
+
+def _accumulator(buf):
+    """
+    Return an integer buffer in 64 bits so that sums of products cannot overflow a narrower type.
+    """
+    np = array_module()
+    if np is not None and buf.dtype.kind in 'iub' and buf.dtype.itemsize < 8:
+        return buf.astype(np.int64)
+    return buf
+
+
+def choose_method(n, m, exact=False):
+    """
+    Return the cheapest convolution method for operands of length n and m.
+    If exact is True only methods that give exact integer results are considered.
+    """
+    n, m = max(n, m), min(n, m)
+    if m <= 1 or exact:
+        return 'direct'
+
+    fft_cost = _FFT_COST[get_backend()]
+
+    costs = {'direct': n * m}
+
+    # one transform of each operand and one inverse transform
+    nfft = _next_pow2(n + m - 1)
+    costs['fft'] = fft_cost * 3 * _fft_cost(nfft)
+
+    # blocks of the long operand sized to a few times the short one, the
+    # short operand is transformed once
+    nblock = _next_pow2(8 * m)
+    if nblock < nfft:
+        step = nblock - m + 1
+        blocks = -(-n // step)
+        costs['overlap-add'] = fft_cost * (2 * blocks + 1) * _fft_cost(nblock)
+
+    return min(costs, key=costs.get)
+
+
+def _plan(n):
+    """
+    Return the bit reversal swaps and the twiddle factors of every stage of a forward
+    radix-2 FFT of length n, computed once and kept for the most recently used lengths.
+    """
+    plan = _PLANS.pop(n, None)
+    if plan is None:
+        swaps = []
+        j = 0
+        for i in range(1, n):
+            bit = n >> 1
+            while j & bit:
+                j ^= bit
+                bit >>= 1
+            j |= bit
+            if i < j:
+                swaps.append((i, j))
+
+        stages = []
+        size = 2
+        while size <= n:
+            stages.append((size, [cmath.exp(-2j * cmath.pi * k / size) for k in range(size // 2)]))
+            size *= 2
+
+        plan = (swaps, stages)
+        if len(_PLANS) >= _PLAN_CACHE_SIZE:
+            del _PLANS[next(iter(_PLANS))]
+
+    # the dictionary keeps its keys in order of use, the least recently used length is dropped first
+    _PLANS[n] = plan
+    return plan
+
+
+def _fft(values, inverse=False):
+    """
+    In-place iterative radix-2 FFT of a list of complex values whose length is a power of two.
+    """
+    n = len(values)
+    swaps, stages = _plan(n)
+
+    for i, j in swaps:
+        values[i], values[j] = values[j], values[i]
+
+    for size, twiddles in stages:
+        half = size // 2
+        if inverse:
+            twiddles = [w.conjugate() for w in twiddles]
+        for start in range(0, n, size):
+            for k in range(half):
+                u = values[start + k]
+                v = values[start + k + half] * twiddles[k]
+                values[start + k] = u + v
+                values[start + k + half] = u - v
+
+    if inverse:
+        for i in range(n):
+            values[i] /= n
+
+    return values
+
+
+def _transform(buf, nfft, real):
+    """
+    Return the spectrum of a buffer zero-padded to nfft samples.
+    """
+    np = array_module()
+    if np is not None:
+        return np.fft.rfft(buf, nfft) if real else np.fft.fft(buf, nfft)
+
+    values = [complex(v) for v in buf]
+    values.extend([0j] * (nfft - len(values)))
+    return _fft(values)
+
+
+def _kernel_key(buf):
+    """
+    Return the exact contents of a buffer as a cache key, None for buffers of Python objects.
+    """
+    np = array_module()
+    if np is not None:
+        return None if buf.dtype.kind == 'O' else (buf.dtype.str, buf.tobytes())
+    return None if isinstance(buf, list) else (buf.typecode, buf.tobytes())
+
+
+def _spectrum_bytes(spectrum):
+    """
+    Return roughly the memory a spectrum takes, a list of complex numbers costs a reference and an object per value.
+    """
+    return getattr(spectrum, 'nbytes', None) or 40 * len(spectrum)
+
+
+def _kernel_transform(buf, nfft, real, conj=False):
+    """
+    Return the spectrum of a kernel zero-padded to nfft samples, conjugated for
+    correlations. Spectra are kept by the kernel contents and the transform size,
+    so repeated convolutions with the same filter or template transform it once.
+    The least recently used spectra are dropped once they take more than the budget
+    of set_kernel_cache. The cached spectrum must not be written to.
+    """
+    content = _kernel_key(buf) if _KERNEL_CACHE_BYTES else None
+    if content is None:
+        spectrum = _transform(buf, nfft, real)
+        return _conjugate(spectrum) if conj else spectrum
+
+    key = (get_backend(), nfft, real, conj) + content
+    spectrum = _KERNELS.pop(key, None)
+    if spectrum is not None:
+        _kernel_stats['hits'] += 1
+    else:
+        _kernel_stats['misses'] += 1
+        spectrum = _transform(buf, nfft, real)
+        if conj:
+            spectrum = _conjugate(spectrum)
+        if array_module() is not None:
+            spectrum.flags.writeable = False
+
+        size = _spectrum_bytes(spectrum) + len(content[1])
+        if size > _KERNEL_CACHE_BYTES:
+            return spectrum
+        _evict(_KERNEL_CACHE_BYTES - size)
+        if key not in _KERNELS:
+            _kernel_stats['bytes'] += size
+
+    # the dictionary keeps its keys in order of use, the least recently used spectrum is dropped first
+    _KERNELS[key] = spectrum
+    return spectrum
+
+
+def _evict(budget):
+    """
+    Drop the least recently used kernel spectra until the rest take at most budget bytes.
+    """
+    while _KERNELS and _kernel_stats['bytes'] > budget:
+        key = next(iter(_KERNELS))
+        _kernel_stats['bytes'] -= _spectrum_bytes(_KERNELS.pop(key)) + len(key[-1])
+
+
+def set_kernel_cache(max_bytes):
+    """
+    Set the memory budget of the kernel spectrum cache in bytes, 0 turns the cache off.
+    """
+    global _KERNEL_CACHE_BYTES
+
+    if not isinstance(max_bytes, int) or max_bytes < 0:
+        raise ValueError("max_bytes must be a non-negative integer.")
+
+    _KERNEL_CACHE_BYTES = max_bytes
+    _evict(max_bytes)
+
+
+def kernel_cache_info():
+    """
+    Return the hits, misses, entries, bytes and max_bytes of the kernel spectrum cache.
+    """
+    return {'hits': _kernel_stats['hits'], 'misses': _kernel_stats['misses'], 'entries': len(_KERNELS),
+            'bytes': _kernel_stats['bytes'], 'max_bytes': _KERNEL_CACHE_BYTES}
+
+
+def clear_kernel_cache(kernel=None):
+    """
+    Drop the cached spectra of one kernel, a DigitalSignal or a buffer, or of every
+    kernel along with the hit and miss counts.
+    """
+    if kernel is None:
+        _KERNELS.clear()
+        _kernel_stats.update(hits=0, misses=0, bytes=0)
+        return
+
+    content = _kernel_key(_accumulator(getattr(kernel, '_data', kernel)))
+    for key in [key for key in _KERNELS if key[-2:] == content]:
+        _kernel_stats['bytes'] -= _spectrum_bytes(_KERNELS.pop(key)) + len(key[-1])
+
+
+def _inverse(spectrum, nfft, real):
+    """
+    Return the first nfft samples of the inverse transform of a spectrum.
+    """
+    np = array_module()
+    if np is not None:
+        return np.fft.irfft(spectrum, nfft) if real else np.fft.ifft(spectrum, nfft)
+
+    values = _fft(list(spectrum), inverse=True)
+    return [v.real for v in values] if real else values
+
+
+def _multiply(x, y):
+    """
+    Return the elementwise product of two spectra.
+    """
+    np = array_module()
+    if np is not None:
+        return x * y
+    return [u * v for u, v in zip(x, y)]
+
+
+def _finish(values, length, integer):
+    """
+    Trim an FFT result to length samples, rounding it back to integers when both operands were integers.
+    """
+    np = array_module()
+    if np is not None:
+        values = values[:length]
+        if integer:
+            return np.rint(values).astype(np.int64)
+        return values
+
+    values = values[:length]
+    if integer:
+        return pack([int(round(v)) for v in values])
+    return pack(values)
+
+
+def direct_convolve(a, b):
+    """
+    Return the full linear convolution of two buffers by summing shifted copies.
+    """
+    np = array_module()
+    if np is not None:
+        if len(a) == 0 or len(b) == 0:
+            return np.zeros(0, dtype=np.result_type(a, b))
+        return np.convolve(a, b)
+
+    if len(a) < len(b):
+        a, b = b, a
+
+    # accumulate one shifted and scaled copy of the longer operand per sample of the shorter one
+    out = [0] * max(len(a) + len(b) - 1, 0)
+    a = list(a)
+    for k, bk in enumerate(b):
+        if bk:
+            out[k:k + len(a)] = [o + bk * av for o, av in zip(out[k:k + len(a)], a)]
+
+    return pack(out)
+
+
+def fft_convolve(a, b):
+    """
+    Return the full linear convolution of two buffers using one zero-padded FFT.
+    """
+    length = len(a) + len(b) - 1
+    if length <= 0:
+        return direct_convolve(a, b)
+
+    kinds = kind(a) + kind(b)
+    real = 'c' not in kinds
+    nfft = _next_pow2(length)
+
+    # the shorter operand is usually the filter, its spectrum is kept for the next call
+    if len(a) < len(b):
+        a, b = b, a
+    spectrum = _multiply(_transform(a, nfft, real), _kernel_transform(b, nfft, real))
+    return _finish(_inverse(spectrum, nfft, real), length, kinds == 'ii')
+
+
+def overlap_add_convolve(a, b, block=None):
+    """
+    Return the full linear convolution of two buffers by transforming the longer
+    operand in blocks and adding the overlapping block outputs together.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+
+    n, m = len(a), len(b)
+    if m == 0:
+        return direct_convolve(a, b)
+
+    nblock = _next_pow2(block + m - 1) if block else _next_pow2(8 * m)
+    step = nblock - m + 1
+
+    kinds = kind(a) + kind(b)
+    real = 'c' not in kinds
+
+    # the kernel spectrum is shared by every block
+    kernel = _kernel_transform(b, nblock, real)
+
+    np = array_module()
+    if np is not None:
+        out = np.zeros(n + m - 1, dtype=complex if not real else float)
+        for start in range(0, n, step):
+            chunk = _inverse(_multiply(_transform(a[start:start + step], nblock, real), kernel), nblock, real)
+            stop = min(start + nblock, n + m - 1)
+            out[start:stop] += chunk[:stop - start]
+        return _finish(out, n + m - 1, kinds == 'ii')
+
+    out = [0] * (n + m - 1)
+    for start in range(0, n, step):
+        chunk = _inverse(_multiply(_transform(a[start:start + step], nblock, real), kernel), nblock, real)
+        stop = min(start + nblock, n + m - 1)
+        out[start:stop] = [o + c for o, c in zip(out[start:stop], chunk)]
+    return _finish(out, n + m - 1, kinds == 'ii')
+
+
+def convolve_buffers(a, b, method='auto'):
+    """
+    Return the full linear convolution of two buffers with the given method,
+    'auto', 'direct', 'fft' or 'overlap-add'. With an executor set, a long
+    operand is split into one block per worker and the block outputs are
+    added together, integer results are identical to the serial ones.
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {', '.join(METHODS)}.")
+
+    a, b = _accumulator(a), _accumulator(b)
+    if _wide(a, b, min(len(a), len(b))):
+        note('direct')
+        return fit_integers(direct_convolve(exact_integers(a), exact_integers(b)))
+
+    if get_executor() is not None and worker_count() > 1 and max(len(a), len(b)) >= PARALLEL_MIN and min(len(a), len(b)):
+        return _parallel_convolve(a, b, method)
+
+    return _convolve(a, b, method)
+
+
+def _convolve(a, b, method):
+    """
+    Return the full linear convolution of two buffers in the calling thread.
+    """
+    if method == 'auto':
+        kinds = kind(a) + kind(b)
+        if 'O' in kinds:
+            method = 'direct'
+        else:
+            # only trust rounded FFT results for integers while they are exactly representable
+            exact = kinds == 'ii' and _peak(a) * _peak(b) * min(len(a), len(b)) >= _EXACT_LIMIT
+            method = choose_method(len(a), len(b), exact)
+
+    note(method)
+    if method == 'direct':
+        return direct_convolve(a, b)
+    if method == 'fft':
+        return fft_convolve(a, b)
+    return overlap_add_convolve(a, b)
+
+
+def _parallel_convolve(a, b, method):
+    """
+    Return the full linear convolution of two buffers, convolving one block of the
+    longer operand per worker and adding the overlapping block outputs.
+    """
+    note('parallel')
+    if len(a) < len(b):
+        a, b = b, a
+
+    n, m = len(a), len(b)
+    step = -(-n // worker_count())
+    firsts = list(range(0, n, step))
+
+    np = array_module()
+    if np is not None and uses_processes():
+        # the workers read their blocks straight from shared memory
+        block, handle = share(a)
+        try:
+            count = len(firsts)
+            parts = map_tasks(_convolve_shared, [handle] * count, firsts, [step] * count,
+                              [b] * count, [method] * count, [get_backend()] * count)
+        finally:
+            block.close()
+            block.unlink()
+    else:
+        parts = map_tasks(_convolve, [a[first:first + step] for first in firsts],
+                          [b] * len(firsts), [method] * len(firsts))
+
+    if np is not None:
+        out = np.zeros(n + m - 1, dtype=np.result_type(*parts))
+        for first, part in zip(firsts, parts):
+            out[first:first + len(part)] += part
+        return out
+
+    out = [0] * (n + m - 1)
+    for first, part in zip(firsts, parts):
+        out[first:first + len(part)] = [o + p for o, p in zip(out[first:first + len(part)], part)]
+    return pack(out)
+
+
+def _convolve_shared(handle, first, count, b, method, backend):
+    """
+    Convolve one block of a buffer in shared memory with b, run in a worker process.
+    """
+    set_backend(backend)
+    block, a = attach(handle)
+    try:
+        return _convolve(a[first:first + count], b, method)
+    finally:
+        del a
+        block.close()
+
+
+def _conjugate(spectrum):
+    """
+    Return the complex conjugate of a spectrum.
+    """
+    np = array_module()
+    if np is not None:
+        return np.conj(spectrum)
+    return [v.conjugate() for v in spectrum]
+
+
+def direct_correlate(a, b):
+    """
+    Return the lags 0 through len(a)-len(b) of the cross-correlation of a buffer
+    with a shorter one, r[n] = sum_k a[k+n] conj(b[k]).
+    """
+    np = array_module()
+    if np is not None:
+        return np.correlate(a, b, 'valid')
+
+    m = len(b)
+    b = [v.conjugate() for v in b]
+    return pack([sum(u * v for u, v in zip(a[n:n + m], b)) for n in range(len(a) - m + 1)])
+
+
+def fft_correlate(a, b):
+    """
+    Return the lags 0 through len(a)-len(b) of the cross-correlation of a buffer
+    with a shorter one using one FFT the length of the longer buffer.
+    """
+    kinds = kind(a) + kind(b)
+    real = 'c' not in kinds
+    nfft = _next_pow2(len(a))
+
+    # no lag in the window wraps around, so a circular correlation gives the linear one
+    spectrum = _multiply(_transform(a, nfft, real), _kernel_transform(b, nfft, real, conj=True))
+    return _finish(_inverse(spectrum, nfft, real), len(a) - len(b) + 1, kinds == 'ii')
+
+
+def correlate_buffers(a, a_start, b, b_start, first, last, method='auto'):
+    """
+    Return the cross-correlation r[n] = sum_k a[k+n] conj(b[k]) of two buffers
+    that start at the given indices, for the lags first through last only.
+    Method can be 'auto', 'direct' or 'fft'.
+    """
+    if method not in ('auto', 'direct', 'fft'):
+        raise ValueError("method must be one of auto, direct, fft.")
+
+    a, b = _accumulator(a), _accumulator(b)
+    width = last - first + 1
+    if width <= 0 or len(a) == 0 or len(b) == 0:
+        return zeros(max(width, 0), a)
+
+    # the samples of a that meet b somewhere in the lag window
+    m = len(b)
+    segment = window(a, a_start, b_start + first, b_start + m - 1 + last)
+
+    if method == 'auto':
+        kinds = kind(a) + kind(b)
+        exact = kinds == 'ii' and _peak(a) * _peak(b) * m >= _EXACT_LIMIT
+        fft_cost = _FFT_COST[get_backend()] * 3 * _fft_cost(_next_pow2(len(segment)))
+        if 'O' in kinds or exact or width * m <= fft_cost:
+            method = 'direct'
+        else:
+            method = 'fft'
+
+    if _wide(segment, b, m):
+        method = 'direct'
+        segment, b = exact_integers(segment), exact_integers(b)
+
+    note(method)
+    if method == 'direct':
+        return fit_integers(direct_correlate(segment, b))
+    return fft_correlate(segment, b)
+
+
+def valid_convolve(a, b, method='auto'):
+    """
+    Return the len(a)-len(b)+1 samples of the convolution of two buffers where
+    the shorter buffer b overlaps a completely. Method can be 'auto', 'direct' or 'fft'.
+    """
+    if method not in ('auto', 'direct', 'fft'):
+        raise ValueError("method must be one of auto, direct, fft.")
+
+    a, b = _accumulator(a), _accumulator(b)
+    n, m = len(a), len(b)
+    if m == 0 or n < m:
+        return zeros(0, a)
+
+    kinds = kind(a) + kind(b)
+    if method == 'auto':
+        exact = kinds == 'ii' and _peak(a) * _peak(b) * m >= _EXACT_LIMIT
+        fft_cost = _FFT_COST[get_backend()] * 3 * _fft_cost(_next_pow2(n))
+        if 'O' in kinds or exact or (n - m + 1) * m <= fft_cost:
+            method = 'direct'
+        else:
+            method = 'fft'
+
+    if _wide(a, b, m):
+        method = 'direct'
+        a, b = exact_integers(a), exact_integers(b)
+
+    note(method)
+    if method == 'direct':
+        np = array_module()
+        if np is not None:
+            return fit_integers(np.convolve(a, b, 'valid'))
+
+        b = list(b)[::-1]
+        return pack([sum(u * v for u, v in zip(a[k:k + m], b)) for k in range(n - m + 1)])
+
+    # overlap-save, the circular wrap around only corrupts the first m-1 samples
+    real = 'c' not in kinds
+    nfft = _next_pow2(n)
+    spectrum = _multiply(_transform(a, nfft, real), _kernel_transform(b, nfft, real))
+    values = _inverse(spectrum, nfft, real)[m - 1:n]
+    return _finish(values, n - m + 1, kinds == 'ii')
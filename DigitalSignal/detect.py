@@ -0,0 +1,237 @@
+from itertools import accumulate
+
+from DigitalSignal import DigitalSignal
+from DigitalSignal.backend import array_module, concatenate, copy, item, tolist
+from DigitalSignal.convolution import correlate_buffers
+from DigitalSignal.filters import _samples
+
+
+# correlation lags computed together, the detector never holds more than this many per template
+_BLOCK = 1 << 14
+
+
+def cfar_scale(train, pfa):
+    """
+    Return the factor a cell averaging CFAR multiplies the mean training power by so
+    that 2 * train training cells of complex Gaussian noise give a false alarm
+    probability of pfa.
+    """
+    cells = 2 * train
+    return cells * (pfa ** (-1 / cells) - 1)
+
+
+class MatchedFilterDetector:
+    """
+    A matched filter for a bank of templates that only keeps the correlation peaks
+    that cross a threshold.
+
+    A detection is a tuple (lag, template, value), where value is the correlation
+    (x % templates[template])[lag] at a peak of its magnitude, so the template
+    starts at index lag + templates[template].shape()[0] of x. A peak is at least
+    as large as every value within distance lags and larger than the ones before it.
+
+    With a fixed threshold a peak is kept when its magnitude reaches threshold.
+    Without one a cell averaging CFAR keeps a peak when its power |value|**2 reaches
+    scale times the mean power of the train cells on either side, skipping guard
+    cells next to it. scale defaults to cfar_scale(train, pfa).
+
+    The correlation is computed block lags at a time, so memory stays proportional
+    to block instead of the signal length times the number of templates.
+    """
+
+    def __init__(self, templates, threshold=None, guard=2, train=16, pfa=1e-6, scale=None,
+                 distance=1, block=_BLOCK, method='auto'):
+        if isinstance(templates, DigitalSignal):
+            templates = [templates]
+        if not templates or not all(isinstance(t, DigitalSignal) for t in templates):
+            raise TypeError("The templates must be a DigitalSignal or a list of DigitalSignal objects.")
+
+        if threshold is None and (train < 1 or guard < 0):
+            raise ValueError("A CFAR needs at least one training cell and no negative guard cells.")
+        if distance < 1 or block < 1:
+            raise ValueError("distance and block must be positive.")
+
+        self.templates = list(templates)
+        self.threshold = threshold
+        self.guard, self.train = guard, train
+        self.scale = cfar_scale(train, pfa) if scale is None and threshold is None else scale
+        self.distance = distance
+        self.block = block
+        self.method = method
+
+        # the templates keep their samples as they are now, later writes to them copy them first
+        for t in self.templates:
+            t._shared = True
+        self._taps = [(t._data, t._start) for t in self.templates]
+
+        # the lags on either side of a peak that decide whether it is kept
+        self._margin = max(distance, guard + train if threshold is None else 0)
+
+        self.reset()
+
+    def detect(self, x):
+        """
+        Return the detections of every template in the signal x, sorted by lag.
+        """
+        if not isinstance(x, DigitalSignal):
+            raise TypeError("Detection is only supported for DigitalSignal objects.")
+
+        data, start = x._data, x._start
+        detections = []
+        for index, (taps, taps_start) in enumerate(self._taps):
+            if not len(data) or not len(taps):
+                continue
+            # every lag where the template meets a stored sample
+            lo = start - (taps_start + len(taps) - 1)
+            hi = start + len(data) - 1 - taps_start
+            for first in range(lo, hi + 1, self.block):
+                detections += self._peaks(data, start, index, first, min(first + self.block - 1, hi), lo, hi)
+
+        detections.sort(key=lambda d: (d[0], d[1]))
+        return detections
+
+    def reset(self):
+        """
+        Clear the stream state as if no samples had been pushed.
+        """
+        self._history = None
+        self._history_start = 0
+        self._received = 0
+        # the next lag to decide for every template
+        self._next = [-(taps_start + len(taps) - 1) for taps, taps_start in self._taps]
+
+    def push(self, chunk):
+        """
+        Append the next chunk of a signal arriving in chunks, x starting at index 0,
+        and return the detections it completes, sorted by lag.
+        """
+        samples = _samples(chunk)
+        if self._history is None:
+            self._history = samples
+        else:
+            self._history = concatenate([self._history, samples])
+        self._received += len(samples)
+
+        # a lag is decided once every lag within the margin has all its samples
+        return self._emit([self._received - 1 - (taps_start + len(taps) - 1) - self._margin
+                           for taps, taps_start in self._taps], None)
+
+    def flush(self):
+        """
+        Return the remaining detections once the signal has ended and reset the stream.
+        """
+        last = [self._received - 1 - taps_start for _, taps_start in self._taps]
+        detections = self._emit(last, last) if self._history is not None else []
+        self.reset()
+        return detections
+
+    def _emit(self, ready, ends):
+        """
+        Return the detections at the lags from the next one through ready of every
+        template, then drop the samples no later lag reads. ends holds the last
+        lag of every template once the signal has ended.
+        """
+        detections = []
+        for index, (taps, taps_start) in enumerate(self._taps):
+            lo = -(taps_start + len(taps) - 1)
+            hi = ends[index] if ends is not None else ready[index] + self._margin
+            for first in range(self._next[index], ready[index] + 1, self.block):
+                last = min(first + self.block - 1, ready[index])
+                detections += self._peaks(self._history, self._history_start, index, first, last, lo, hi)
+            self._next[index] = max(self._next[index], ready[index] + 1)
+
+        # the earliest sample a later lag or its margin reads
+        keep = min(lag - self._margin + taps_start for lag, (_, taps_start) in zip(self._next, self._taps))
+        drop = min(max(keep - self._history_start, 0), len(self._history))
+        if drop:
+            self._history = copy(self._history[drop:])
+            self._history_start += drop
+
+        detections.sort(key=lambda d: (d[0], d[1]))
+        return detections
+
+    def _peaks(self, data, start, index, first, last, lo, hi):
+        """
+        Return the detections of one template at the lags first through last, where
+        lo through hi are the lags that count as correlation cells.
+        """
+        taps, taps_start = self._taps[index]
+        d = self.distance
+
+        # the cells around the block that decide its peaks
+        a, b = max(first - self._margin, lo), min(last + self._margin, hi)
+        values = correlate_buffers(data, start, taps, taps_start, a, b, self.method)
+
+        np = array_module()
+        if np is not None:
+            power = np.abs(values).astype(float) ** 2
+            cells = np.arange(first - a, last - a + 1)
+            threshold = self._thresholds_numpy(np, power, cells)
+            candidates = cells[(power[cells] > 0) & (power[cells] >= threshold)]
+
+            # cells outside a through b never stop a peak
+            padded = np.full(len(power) + 2 * d, -1.0)
+            padded[d:d + len(power)] = power
+            for k in range(1, d + 1):
+                peak = padded[candidates + d]
+                candidates = candidates[(peak > padded[candidates + d - k]) & (peak >= padded[candidates + d + k])]
+
+            return [(a + int(j), index, item(values, int(j))) for j in candidates]
+
+        power = [abs(v) ** 2 for v in tolist(values)]
+        cells = range(first - a, last - a + 1)
+        threshold = self._thresholds_list(power, cells)
+        detections = []
+        for j, limit in zip(cells, threshold):
+            p = power[j]
+            if p > 0 and p >= limit \
+                    and all(p > power[i] for i in range(max(j - d, 0), j)) \
+                    and all(p >= power[i] for i in range(j + 1, min(j + d + 1, len(power)))):
+                detections.append((a + j, index, item(values, j)))
+        return detections
+
+    def _thresholds_numpy(self, np, power, cells):
+        """
+        Return the power every cell must reach, from the training cells that lie in power.
+        """
+        if self.threshold is not None:
+            return self.threshold ** 2
+
+        g, t, n = self.guard, self.train, len(power)
+        total = np.concatenate(([0.0], np.cumsum(power)))
+
+        # the training cells before and after every cell, clipped to the computed cells
+        left_stop = np.clip(cells - g, 0, n)
+        left_start = np.clip(cells - g - t, 0, n)
+        right_start = np.clip(cells + g + 1, 0, n)
+        right_stop = np.clip(cells + g + t + 1, 0, n)
+
+        sums = total[left_stop] - total[left_start] + total[right_stop] - total[right_start]
+        counts = left_stop - left_start + right_stop - right_start
+        return self.scale * sums / np.maximum(counts, 1)
+
+    def _thresholds_list(self, power, cells):
+        """
+        Return the power every cell must reach, see _thresholds_numpy.
+        """
+        if self.threshold is not None:
+            return [self.threshold ** 2] * len(cells)
+
+        g, t, n = self.guard, self.train, len(power)
+        total = [0.0] + list(accumulate(power))
+
+        thresholds = []
+        for j in cells:
+            left_stop, left_start = min(max(j - g, 0), n), min(max(j - g - t, 0), n)
+            right_start, right_stop = min(j + g + 1, n), min(j + g + t + 1, n)
+            sums = total[left_stop] - total[left_start] + total[right_stop] - total[right_start]
+            counts = left_stop - left_start + right_stop - right_start
+            thresholds.append(self.scale * sums / max(counts, 1))
+        return thresholds
+
+
+def detect(x, templates, threshold=None, **kwargs):
+    """
+    Return the (lag, template, value) detections of a bank of templates in x, see MatchedFilterDetector.
+    """
+    return MatchedFilterDetector(templates, threshold, **kwargs).detect(x)
@@ -1,10 +1,26 @@
 import cmath
+import json
+
+try:
+    from DigitalSignal.backend import (FILE_DTYPES, SCALAR_TYPES, accumulate, accumulate_type, add, asbuffer, astype,
+                                       conjugate, copy, dtype_name, energy, first_difference, frombuffer, full, item,
+                                       kind, memmap, quantize_values, reverse, round_values, scale, multiply, setitem,
+                                       snap_values, strided, subtract, tofile, tolist, widen)
+    from DigitalSignal.convolution import convolve_buffers, correlate_buffers
+except ImportError:
+    # this is a hack to allow DigitalSignal to be used in the online REPL
+    pass
 
 
 class DigitalSignal:
-    def __init__(self, data=[0], shape=None):
+    # the zero-filled room reserved around _data by the in-place operators, see backend.accumulate
+    _spare = None
+
+    def __init__(self, data=[0], shape=None, dtype=None, validate=True):
         """
         Initialize the DigitalSignal with data, identifying the zero index by a list element.
+        dtype selects the sample type, one of DTYPES, instead of the one inferred from data.
+        validate=False skips the check that every element is a scalar, for data already known to be numeric.
         """
         # Ensure the zero_index is within the bounds of the data array
         
@@ -20,20 +36,40 @@ class DigitalSignal:
 
             start, stop = shape
 
-            self.positive_indices = [data for _ in range(0, stop+1)]
-            self.negative_indices = [data for _ in range(start, 0)]  # index order doesn't matter because all elements are the same value
+            # the support always covers the zero index
+            start, stop = min(start, 0), max(stop, -1)
+
+            self._data = full(stop - start + 1, data)
+            if dtype is not None:
+                self._data = astype(self._data, dtype)
+            self._start = start
+            self._shared = False
             
             return
-            
-        zero_index=0
-        for ind, element in enumerate(data):
-            if isinstance(element, list):
-                zero_index=ind
-                data[ind] = element[0]
 
-        for element in data:
-            if not isinstance(element, (int, float, complex)):
-                raise TypeError("DigitalSignal values can only be scalars.")
+        # one pass finds the zero index marker, unwrapped in a copy of the caller's list, and checks the elements
+        zero_index=0
+        if isinstance(data, (list, tuple)):
+            values = data
+            for ind, element in enumerate(data):
+                if isinstance(element, list):
+                    if values is data:
+                        values = list(data)
+                    zero_index=ind
+                    values[ind] = element = element[0]
+
+                if validate and not isinstance(element, SCALAR_TYPES):
+                    raise TypeError("DigitalSignal values can only be scalars.")
+            data = values
+
+        # Store the samples contiguously, _start is the index of the first sample
+        self._data = asbuffer(data)
+
+        # buffers of other types are only checked element by element when their element type is not numeric
+        if validate and not isinstance(data, (list, tuple)) and kind(self._data) not in ('i', 'f', 'c'):
+            for element in data:
+                if not isinstance(element, SCALAR_TYPES):
+                    raise TypeError("DigitalSignal values can only be scalars.")
 
         if len(data) > 0:
             if zero_index < 0 or zero_index >= len(data):
@@ -42,17 +78,113 @@ class DigitalSignal:
             if zero_index != 0:
                 raise ValueError("zero_index must be within the range of the data array.")
         
-        # Separate the data into positive and negative indices
-        self.positive_indices = data[zero_index:]    # Values at 0 and positive indices
-        self.negative_indices = data[:zero_index][::-1]  # Values at negative indices (reversed order)
+        if dtype is not None:
+            self._data = astype(self._data, dtype)
+        self._start = -zero_index
+
+        # True while _data may be referenced by another signal, it is copied before being written to
+        self._shared = False
+
+    @classmethod
+    def _wrap(cls, data, start=0, shared=False):
+        """
+        Build a signal around an existing buffer without copying or validating it.
+        """
+        signal = cls.__new__(cls)
+        signal._data = data
+        signal._start = start
+        signal._shared = shared
+        return signal
+
+    @classmethod
+    def from_array(cls, values, origin=0, copy=False):
+        """
+        Return a DigitalSignal of a sequence of numbers, the first sample at index origin,
+        without looking for a zero index marker or checking the elements one by one.
+        Unless copy is True an array or ndarray is used as it is, and copied before the signal is written to.
+        """
+        data = asbuffer(values, copy)
+        return cls._wrap(data, origin, shared=not copy)
+
+    @classmethod
+    def from_buffer(cls, data, dtype='float32', origin=0):
+        """
+        Return a DigitalSignal of the raw little-endian samples in a bytes-like object,
+        the first sample at index origin. dtype is one of FILE_DTYPES.
+        """
+        # the samples belong to data, writing to the signal copies them first
+        return cls._wrap(frombuffer(data, dtype), origin, shared=True)
+
+    @classmethod
+    def from_file(cls, path, dtype=None, origin=None):
+        """
+        Return a DigitalSignal of the raw samples in a file, memory-mapped when NumPy is
+        installed. dtype and origin default to the values in the sidecar file path + '.json'.
+        """
+        try:
+            with open(path + '.json') as f:
+                header = json.load(f)
+        except OSError:
+            header = {}
+
+        dtype = dtype or header.get('dtype')
+        if dtype is None:
+            raise ValueError("dtype must be given when the file has no sidecar.")
+        if dtype not in FILE_DTYPES:
+            raise ValueError(f"dtype must be one of {', '.join(FILE_DTYPES)}.")
+
+        return cls._wrap(memmap(path, dtype), header.get('origin', 0) if origin is None else origin, shared=True)
+
+    def to_file(self, path, dtype=None):
+        """
+        Write the stored samples to a raw file and their format and origin to the sidecar
+        file path + '.json'. dtype defaults to the 64 bit format of the samples.
+        """
+        if dtype is None:
+            dtype = {'i': 'int64', 'f': 'float64', 'c': 'complex128'}.get(kind(self._data))
+            if dtype is None:
+                raise ValueError("dtype must be given for samples that do not fit in 64 bits.")
+
+        with open(path, 'wb') as f:
+            tofile(self._data, f, dtype)
+
+        with open(path + '.json', 'w') as f:
+            json.dump({'dtype': dtype, 'origin': self._start}, f)
+
+    @property
+    def dtype(self):
+        """
+        Return the sample type of the signal, one of DTYPES or 'object' for integers beyond 64 bits.
+        """
+        return dtype_name(self._data)
+
+    def astype(self, dtype):
+        """
+        Return a copy of the signal with its samples converted to the sample type dtype.
+        """
+        return DigitalSignal._wrap(copy(astype(self._data, dtype)), self._start)
+
+    @property
+    def positive_indices(self):
+        """
+        Return the values at index 0 and the positive indices as a list.
+        """
+        return self[0:self.shape()[1]+1]
+
+    @property
+    def negative_indices(self):
+        """
+        Return the values at the negative indices as a list, starting at index -1.
+        """
+        return self[-1:self.shape()[0]-1:-1]
 
     def __repr__(self):
         """
         Return the string representation of the DigitalSignal.
         """
-        neg = self.negative_indices[:]
-        neg.reverse()
-        pos = self.positive_indices[:]
+        start, stop = self.shape()
+        neg = self[start:0]
+        pos = self[0:stop+1] or [0]
         string_of_list = f"{' '.join(map(str, neg))} [{pos[0]}] {' '.join(map(str, pos[1:]))}"
         return f"DigitalSignal({string_of_list.strip()})"
 
@@ -60,7 +192,8 @@ class DigitalSignal:
         """
         Return the total length of the non-zero portion of the signal.
         """
-        return len(self.negative_indices) + len(self.positive_indices)
+        start, stop = self.shape()
+        return stop - start + 1
 
     def __getitem__(self, index):
         """
@@ -74,25 +207,12 @@ class DigitalSignal:
         if isinstance(index, slice):
             return self.__slice_getitem(index)
 
-        if index >= 0:
-            # If the index is non-negative, return from positive_indices if in range
+        # Indices outside of the stored samples are zero
+        offset = index - self._start
+        if 0 <= offset < len(self._data):
+            return item(self._data, offset)
 
-            if index < len(self.positive_indices):
-                value = self.positive_indices[index]
-            else:
-                value = 0
-
-            return value
-        
-        else:
-            # If the index is negative, return from negative_indices after flipping sign
-            index = -index - 1  # Convert negative index to zero-based positive index for negative_indices
-            if index < len(self.negative_indices):
-                value = self.negative_indices[index] 
-            else:
-                value = 0
-
-            return value
+        return 0
 
     def __setitem__(self, index, value):
         """
@@ -102,25 +222,15 @@ class DigitalSignal:
         if not isinstance(index, int):
             raise TypeError("Indexing only supports integers.")
 
-        if not isinstance(value, (int, float, complex)):
+        if not isinstance(value, SCALAR_TYPES):
             raise TypeError("DigitalSignal values can only be scalars.")
         
-        if index >= 0:
-            # If the index is non-negative
-
-            while index > len(self.positive_indices):
-                self.positive_indices.append(self[len(self.positive_indices)])
+        if self._shared:
+            self._data = copy(self._data)
+            self._shared = False
 
-            self.positive_indices.append(value)
-
-        else:
-            # If the index is negative
-            index = -index - 1
-
-            while index > len(self.negative_indices):
-                self.negative_indices.append(self[-(len(self.negative_indices)+1)])
-
-            self.negative_indices.append(value)
+        # Overwrite the sample, zero-filling the gap when the index is outside of the stored samples
+        self._data, self._start = setitem(self._data, self._start, index, value)
 
     def __call__(self, amount=0):
         """
@@ -130,101 +240,60 @@ class DigitalSignal:
         if not isinstance(amount, int):
             raise TypeError("Time-shifting only supports integers.")
 
-        # Create a clone of the current Signal object
-        clone = DigitalSignal()
-        clone.positive_indices = self.positive_indices[:]
-        clone.negative_indices = self.negative_indices[:]
-
-        if amount < 0:
-            # Shift to the left (negative shift)
-            amount = abs(amount)
-            for _ in range(amount):
-                if clone.negative_indices:
-                    # Pop from the front of the negative list
-                    value = clone.negative_indices.pop(0)
-                    # Append to the front of the positive list
-                    clone.positive_indices.insert(0, value)
-                else:
-                    # No more negative values to shift, just insert zeros
-                    clone.positive_indices.insert(0, 0)
-        elif amount > 0:
-            # Shift to the right (positive shift)
-            for _ in range(amount):
-                if clone.positive_indices:
-                    # Pop from the front of the positive list
-                    value = clone.positive_indices.pop(0)
-                    # Append to the front of the negative list
-                    clone.negative_indices.insert(0, value)
-                else:
-                    # No more positive values to shift, just insert zeros
-                    clone.negative_indices.insert(0, 0)
-        
-        if len(clone.positive_indices) == 0:
-            clone.positive_indices.append(0)
-
-        return clone
+        # Create a clone of the current Signal object that shares its samples with a moved origin, x(-1) is x[n-1]
+        self._shared = True
+        return DigitalSignal._wrap(self._data, self._start - amount, shared=True)
 
     def __add__(self, other):
         """
         Return the elementwise addition of this signal and another DigitalSignal alined at the zero index.
         """
         if not isinstance(other, DigitalSignal):
+            if _defers(other, '__radd__'):
+                return NotImplemented
             raise TypeError("Addition is only supported between two DigitalSignal objects.")
 
-        # Determine the maximum length of the positive and negative lists
-        max_pos_length = max(len(self.positive_indices), len(other.positive_indices))
-        max_neg_length = max(len(self.negative_indices), len(other.negative_indices))
-        
-        # Create new lists with the appropriate size, initialized to zero
-        new_pos = [0] * max_pos_length
-        new_neg = [0] * max_neg_length
-        
-        # Add the positive parts of the two signals
-        for i in range(max_pos_length):
-            val_self = self.positive_indices[i] if i < len(self.positive_indices) else 0
-            val_other = other.positive_indices[i] if i < len(other.positive_indices) else 0
-            new_pos[i] = val_self + val_other
-        
-        # Add the negative parts of the two signals
-        for i in range(max_neg_length):
-            val_self = self.negative_indices[i] if i < len(self.negative_indices) else 0
-            val_other = other.negative_indices[i] if i < len(other.negative_indices) else 0
-            new_neg[i] = val_self + val_other
-
-        # Return a new Signal object with the summed lists
-        clone = DigitalSignal()
-        clone.positive_indices = new_pos
-        clone.negative_indices = new_neg
-        return clone
+        # Return a new Signal object with the summed samples aligned at the zero index
+        return DigitalSignal._wrap(*add(self._data, self._start, other._data, other._start))
 
     def __sub__(self, other):
         """
         Return the elementwise subtraction of another DigitalSignal from this signal alined at the zero index.
         """
         if not isinstance(other, DigitalSignal):
+            if _defers(other, '__rsub__'):
+                return NotImplemented
             raise TypeError("Subtraction is only supported between two DigitalSignal objects.")
         
-        # Multiply the 'other' signal by -1 and add it to the current signal
-        return self.__add__(other * -1)
+        # Return a new Signal object with the difference of the samples aligned at the zero index
+        return DigitalSignal._wrap(*subtract(self._data, self._start, other._data, other._start))
 
     def __mul__(self, other):
         """
         Return a new DigitalSignal scaled by the given scalar.
         """
-        if not isinstance(other, (int, float, complex)) and not callable(other):
-            raise TypeError("The scalar must be an integer, float, complex or callable.")
+        try:
+            from DigitalSignal.helpers import E
+        except ImportError:
+            # this is a hack to allow DigitalSignal to be used in the online REPL
+            pass
 
-        # Return a new Signal object with the scaled lists
-        clone = DigitalSignal()
+        # signals are callable too, but a product of two signals is not defined
+        if isinstance(other, DigitalSignal) or _defers(other, '__rmul__') \
+                or not isinstance(other, (int, float, complex)) and not callable(other):
+            raise TypeError("The scalar must be an integer, float, complex or callable.")
 
-        if callable(other):
-            clone.positive_indices = [value * other(idx) for idx, value in enumerate(self.positive_indices)]
-            clone.negative_indices = [value * other(-(idx+1)) for idx, value in enumerate(self.negative_indices)]
+        # Return a new Signal object with the scaled samples
+        if isinstance(other, E):
+            # array-capable callables like E compute every index in one call
+            data = multiply(self._data, other.evaluate(self._start, len(self._data)))
+        elif callable(other):
+            indices = range(self._start, self._start + len(self._data))
+            data = multiply(self._data, [other(idx) for idx in indices])
         else:
-            clone.positive_indices = [value * other for value in self.positive_indices]
-            clone.negative_indices = [value * other for value in self.negative_indices]
+            data = scale(self._data, other)
 
-        return clone
+        return DigitalSignal._wrap(data, self._start)
 
     def __rmul__(self, other):
         """
@@ -238,46 +307,115 @@ class DigitalSignal:
         """
         return -1 * self
     
+    def accumulate(self, other, scale=1, shift=0):
+        """
+        Add scale times other(shift) to this signal in place and return it. The support
+        only grows when other reaches past it, and then into room reserved on both sides,
+        so summing many delayed and scaled echoes into one signal reallocates a few times.
+        """
+        if not isinstance(other, DigitalSignal):
+            raise TypeError("Accumulation is only supported between two DigitalSignal objects.")
+        if not isinstance(scale, (int, float, complex)):
+            raise TypeError("The scalar must be an integer, float or complex.")
+        if not isinstance(shift, int):
+            raise TypeError("Time-shifting only supports integers.")
+
+        if len(other._data):
+            # the samples of other must not move while they are added to themselves
+            b = copy(other._data) if other._data is self._data else other._data
+            self._data, self._start, self._spare = accumulate(self._data, self._start, self._spare, b,
+                                                              other._start - shift, scale, inplace=not self._shared)
+            self._shared = False
+
+        return self
+
+    def __iadd__(self, other):
+        """
+        Add another DigitalSignal to this signal in place.
+        """
+        if not isinstance(other, DigitalSignal):
+            raise TypeError("Addition is only supported between two DigitalSignal objects.")
+
+        return self.accumulate(other)
+
+    def __isub__(self, other):
+        """
+        Subtract another DigitalSignal from this signal in place.
+        """
+        if not isinstance(other, DigitalSignal):
+            raise TypeError("Subtraction is only supported between two DigitalSignal objects.")
+
+        return self.accumulate(other, -1)
+
+    def __imul__(self, other):
+        """
+        Scale this signal in place, the samples are replaced when the scalar changes their type.
+        """
+        if not isinstance(other, (int, float, complex)) and not callable(other):
+            raise TypeError("The scalar must be an integer, float, complex or callable.")
+
+        if callable(other):
+            return self._adopt(self * other)
+
+        self._data = scale(self._data, other, inplace=not self._shared)
+        self._shared = False
+        return self
+
+    def __imatmul__(self, other):
+        """
+        Replace this signal with its convolution with another DigitalSignal.
+        """
+        return self._adopt(self @ other)
+
+    def _adopt(self, signal):
+        """
+        Take over the samples of another signal and return self, for in-place operators that cannot write to _data.
+        """
+        self._data, self._start = signal._data, signal._start
+        self._shared = signal._shared
+        self._spare = None
+        return self
+
     def __invert__(self):
         """
         Return the time-reversed DigitalSignal.
         """
-        inverse = DigitalSignal()
-        inverse.positive_indices = self.negative_indices[:]
-        inverse.positive_indices.insert(0, self.positive_indices[0])
-        inverse.negative_indices = self.positive_indices[1:]
+        data, shared = reverse(self._data)
+
+        # The reversed samples may be a view of this signal's samples
+        if shared:
+            self._shared = True
 
-        return inverse
+        return DigitalSignal._wrap(data, -(self._start + len(self._data) - 1), shared)
     
     def __matmul__(self, other):
         """
         Return the convolution of this signal with another DigitalSignal.
         """
         if not isinstance(other, DigitalSignal):
+            if _defers(other, '__rmatmul__'):
+                return NotImplemented
             raise TypeError("Convolution is only supported between two DigitalSignal objects.")
 
-        # Determine the maximum lag value
-        neg_n = len(other.negative_indices) + len(self.negative_indices)
-        pos_n = len(self.positive_indices) + len(other.positive_indices)
-        n_range = [i for i in range(-(neg_n), pos_n-1)]
-    
-        # Initialize a list for storing cross-correlation results
-        conv = DigitalSignal()
+        return self.convolve(other)
 
-        # Iterate over all possible lags
-        for n in n_range:
-            sum_conv = 0  # Initialize the cross-correlation sum for this lag
-            
-            # Compute cross-correlation for each lag by summing over all valid n
-            for k in range(-len(self.negative_indices), len(self.positive_indices)):
-                # Values of y[n] and x[n-l] 
-                y_k = self[k]
-                x_k_n = other[n - k]
+    def convolve(self, other, method='auto'):
+        """
+        Return the convolution of this signal with another DigitalSignal using the
+        'direct', 'fft' or 'overlap-add' method, 'auto' picks the cheapest one.
+        """
+        if not isinstance(other, DigitalSignal):
+            raise TypeError("Convolution is only supported between two DigitalSignal objects.")
 
-                sum_conv += y_k * x_k_n  # Accumulate the sum
+        data = convolve_buffers(self._data, other._data, method)
+        if dtype_name(data) != 'object':
+            # integer results that do not fit in 64 bits are kept exactly
+            data = astype(data, accumulate_type(self.dtype, other.dtype))
+        conv = DigitalSignal._wrap(data, self._start + other._start)
 
-            # Append the computed correlation value for the current lag
-            conv[n] = (sum_conv)
+        # The output runs from the sum of the start indices to the sum of the stop indices
+        (self_start, self_stop), (other_start, other_stop) = self.shape(), other.shape()
+        conv._data, conv._start = widen(conv._data, conv._start, self_start + other_start, self_stop + other_stop)
 
         return conv
 
@@ -285,37 +423,100 @@ class DigitalSignal:
         """
         Return the lag indexed correlation of this signal with another DigitalSignal.
         """
+        if not isinstance(other, DigitalSignal):
+            if _defers(other, '__rmod__'):
+                return NotImplemented
+            raise TypeError("Correlation is only supported between two DigitalSignal objects.")
+        return self.correlate(other)
+
+    def correlate(self, other, max_lag=None, normalize=None, method='auto'):
+        """
+        Return the lag indexed correlation r[n] = sum_k x[k+n] conj(y[k]) of this signal with another
+        DigitalSignal. If max_lag is given only the lags -max_lag through max_lag are computed. normalize
+        can be None, 'biased', 'unbiased' or 'coeff'.
+        """
         if not isinstance(other, DigitalSignal):
             raise TypeError("Correlation is only supported between two DigitalSignal objects.")
-        return self @ (~(other.complex_conjugate()))
+
+        if normalize not in (None, 'biased', 'unbiased', 'coeff'):
+            raise ValueError("normalize must be None, 'biased', 'unbiased' or 'coeff'.")
+
+        # The same lags x @ ~cconj(y) covers, clipped to the requested window
+        (self_start, self_stop), (other_start, other_stop) = self.shape(), other.shape()
+        first, last = self_start - other_stop, self_stop - other_start
+        if max_lag is not None:
+            if not isinstance(max_lag, int) or max_lag < 0:
+                raise ValueError("max_lag must be a non-negative integer.")
+            first, last = -max_lag, max_lag
+
+        # Only the lags where the stored samples overlap need computing
+        lo = max(first, self._start - (other._start + len(other._data) - 1))
+        hi = min(last, self._start + len(self._data) - 1 - other._start)
+
+        data = correlate_buffers(self._data, self._start, other._data, other._start, lo, hi, method)
+        if dtype_name(data) != 'object':
+            data = astype(data, accumulate_type(self.dtype, other.dtype))
+        corr = DigitalSignal._wrap(data, lo if lo <= hi else first)
+
+        if normalize == 'biased':
+            corr._data = scale(corr._data, 1 / max(len(self), len(other)))
+        elif normalize == 'unbiased':
+            overlaps = [min(self_stop, other_stop + n) - max(self_start, other_start + n) + 1 for n in range(lo, hi+1)]
+            corr._data = multiply(corr._data, [1 / max(count, 1) for count in overlaps])
+        elif normalize == 'coeff':
+            norm = (energy(self._data) * energy(other._data)) ** 0.5
+            corr._data = scale(corr._data, 1 / norm if norm else 0.0)
+
+        corr._data, corr._start = widen(corr._data, corr._start, first, last)
+
+        return corr
 
     def __eq__(self, other):
         """
-        Return True both signals are equivalent, return False if not equivalent. 
+        Return True when both signals have the same value at every index.
         """
+        if not isinstance(other, DigitalSignal):
+            return NotImplemented
 
-        max_neg_len = max(len(self.negative_indices), len(other.negative_indices))
-        max_pos_len = max(len(self.positive_indices), len(other.positive_indices))
+        return self.equals(other)
 
-        for idx in range(max_neg_len+2):
-            if self[idx] != other[idx]:
-                return False
-                
-        for idx in range(max_pos_len+2):
-            if self[-idx] != other[-idx]:
-                return False
-            
-        return True
-       
-    def complex_conjugate(self):
+    def first_difference(self, other, rtol=0, atol=0):
+        """
+        Return the first index where the signals differ by more than atol + rtol * |other|,
+        None when they match everywhere. Indices outside of either support are zero.
+        """
+        if not isinstance(other, DigitalSignal):
+            raise TypeError("Comparison is only supported between two DigitalSignal objects.")
+
+        return first_difference(self._data, self._start, other._data, other._start, rtol, atol)
+
+    def equals(self, other):
+        """
+        Return True when both signals have the same value at every index.
+        """
+        return self.first_difference(other) is None
 
-        new_pos = [n.conjugate() if isinstance(n, complex) else n for n in self.positive_indices]
-        new_neg = [n.conjugate() if isinstance(n, complex) else n for n in self.negative_indices]
+    def allclose(self, other, rtol=1e-05, atol=1e-08):
+        """
+        Return True when |self[n] - other[n]| <= atol + rtol * |other[n]| at every index.
+        """
+        return self.first_difference(other, rtol, atol) is None
+
+    def lazy(self):
+        """
+        Return a LazySignal of this signal, operators on it build an expression that is only computed when needed.
+        """
+        try:
+            from DigitalSignal.lazy import LazySignal
+        except ImportError:
+            # this is a hack to allow DigitalSignal to be used in the online REPL
+            pass
 
-        clone = DigitalSignal()
-        clone.positive_indices = new_pos
-        clone.negative_indices = new_neg
-        return clone        
+        return LazySignal(self)
+
+    def complex_conjugate(self):
+
+        return DigitalSignal._wrap(conjugate(self._data), self._start)        
 
     def __slice_getitem(self, s):
         """
@@ -323,70 +524,111 @@ class DigitalSignal:
         """
         start, stop, step = s.start, s.stop, s.step
 
-        n_len = len(self.negative_indices)
-        p_len = len(self.positive_indices)
+        first, last = self.shape()
 
         if step == None:
             step = 1
 
         if step >= 0:
             if start == None:
-                start = -n_len
+                start = first
             if stop == None:
-                stop = p_len
+                stop = last+1
         else: 
             if start == None:
-                start = (p_len-1)
+                start = last
             if stop == None:
-                stop = -(n_len+1)
+                stop = first-1
 
-        return [self[idx] for idx in range(start, stop, step)]
-    
-    def round(self, ndigits=None):
-
-        # Initialize empty lists to store the rounded values
-        new_pos = []
-        new_neg = []
-
-        # Iterate over positive indices and round each element
-        for n in self.positive_indices:
-            if isinstance(n, complex):
-                rounded_value = complex(round(n.real, ndigits), round(n.imag, ndigits))
-                
-                # clean up zero values
-                if rounded_value.imag == 0 or rounded_value.imag == -0:
-                    rounded_value = rounded_value.real
-                elif rounded_value.real == 0 or rounded_value.real == -0:
-                    rounded_value = rounded_value.imag * 1j
-
-            else:
-                rounded_value = round(n, ndigits)
-            new_pos.append(rounded_value)
-
-        # Iterate over negative indices and round each element
-        for n in self.negative_indices:
-            if isinstance(n, complex):
-                rounded_value = complex(round(n.real, ndigits), round(n.imag, ndigits))
-
-                # clean up zero values
-                if rounded_value.imag == 0 or rounded_value.imag == -0:
-                    rounded_value = rounded_value.real
-                elif rounded_value.real == 0 or rounded_value.real == -0:
-                    rounded_value = rounded_value.imag * 1j
-                
-            else:
-                rounded_value = round(n, ndigits)
-            new_neg.append(rounded_value)
-
-        clone = DigitalSignal()
-        clone.positive_indices = new_pos
-        clone.negative_indices = new_neg
-        return clone     
+        indices = range(start, stop, step)
+        return tolist(strided(self._data, self._start, start, len(indices), step)[0])
+
+    def view(self, start=None, stop=None, step=1):
+        """
+        Return the samples at the indices range(start, stop, step) as a DigitalSignal whose
+        first sample keeps its index start, zero-padded outside of the stored samples.
+        Samples that are all stored are shared with this signal when NumPy is installed.
+        start and stop default to the first and one past the last index of the shape.
+        """
+        if not all(isinstance(value, int) for value in (start or 0, stop or 0, step)):
+            raise TypeError("view only supports integer indices and steps.")
+        if step == 0:
+            raise ValueError("step must not be zero.")
+
+        first, last = self.shape()
+        if start is None:
+            start = first if step > 0 else last
+        if stop is None:
+            stop = last + 1 if step > 0 else first - 1
+
+        data, shared = strided(self._data, self._start, start, len(range(start, stop, step)), step)
+        if shared:
+            self._shared = True
+        return DigitalSignal._wrap(data, start, shared)
+
+    def frames(self, size, hop=None, start=None, stop=None):
+        """
+        Generate views of size samples every hop samples (size by default) from start up to stop,
+        the first and one past the last index of the shape by default. Each view keeps the
+        indices of its samples, zero-padded where they run past the stored samples.
+        """
+        if not isinstance(size, int) or size < 1:
+            raise ValueError("size must be a positive integer.")
+        hop = size if hop is None else hop
+        if not isinstance(hop, int) or hop < 1:
+            raise ValueError("hop must be a positive integer.")
+
+        first, last = self.shape()
+        start = first if start is None else start
+        stop = last + 1 if stop is None else stop
+
+        for begin in range(start, stop, hop):
+            yield self.view(begin, begin + size)
+
+    def round(self, ndigits=None, inplace=False):
+
+        # Round every sample, complex signals that round to real values become real signals
+        return self._with_samples(round_values, inplace, ndigits)
+
+    def quantize(self, frac_bits, int_bits=None, inplace=False):
+        """
+        Round every sample to the signed fixed point Q format with frac_bits fractional bits,
+        saturating to int_bits integer bits when given. Complex parts are quantized separately.
+        """
+        return self._with_samples(quantize_values, inplace, frac_bits, int_bits)
+
+    def snap(self, tol=1e-12, inplace=False):
+        """
+        Set the real and imaginary parts smaller than tol in magnitude to zero.
+        """
+        return self._with_samples(snap_values, inplace, tol)
+
+    def _with_samples(self, func, inplace, *args):
+        """
+        Return a signal of the samples transformed by func, or transform this signal's samples and return it when inplace is True.
+        """
+        if not inplace:
+            return DigitalSignal._wrap(func(self._data, *args), self._start)
+
+        # samples shared with another signal are replaced instead of written to
+        self._data = func(self._data, *args, inplace=not self._shared)
+        self._shared = False
+        return self
     
     def shape(self):
-        start = -len(self.negative_indices)
-        stop = len(self.positive_indices)-1
+        # The stored samples padded with zeros to always cover the zero index
+        if len(self._data) == 0:
+            return (0, -1)
+
+        start = min(self._start, 0)
+        stop = max(self._start + len(self._data) - 1, 0)
 
         return (start, stop)
 
 
+def _defers(other, name):
+    """
+    Return True when an operand that is not a DigitalSignal implements the reflected
+    operator name itself, like a LazySignal, so Python should try it instead.
+    """
+    return not isinstance(other, (DigitalSignal,) + SCALAR_TYPES) and hasattr(type(other), name)
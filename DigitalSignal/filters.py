@@ -0,0 +1,256 @@
+from DigitalSignal import DigitalSignal
+from DigitalSignal.backend import add, array_module, asbuffer, concatenate, copy, pack, widen, zeros
+from DigitalSignal.convolution import convolve_buffers, valid_convolve
+
+
+def _samples(signal):
+    """
+    Return the samples of a DigitalSignal over its whole support, or a buffer of the given scalars.
+    """
+    if isinstance(signal, DigitalSignal):
+        start, stop = signal.shape()
+        return widen(signal._data, signal._start, start, stop)[0]
+
+    return asbuffer(signal)
+
+
+def _signal(data):
+    """
+    Wrap a buffer of output samples in a DigitalSignal starting at index 0.
+    """
+    return DigitalSignal._wrap(data)
+
+
+class StreamingFIR:
+    """
+    A stateful FIR filter that convolves a signal arriving in chunks with h.
+
+    Every pushed chunk returns the next output samples of x @ h, where x is the
+    concatenation of all pushed chunks starting at index 0. Output chunks start
+    at index 0, the first output sample belongs to index 'start' of x @ h.
+    flush() returns the remaining len(h)-1 output samples.
+    """
+
+    def __init__(self, h, method='overlap-save'):
+        if not isinstance(h, DigitalSignal):
+            raise TypeError("The filter taps must be a DigitalSignal.")
+
+        if method not in ('overlap-save', 'overlap-add'):
+            raise ValueError("method must be either 'overlap-save' or 'overlap-add'.")
+
+        self.h = h
+        self.method = method
+        self.start = h.shape()[0]
+        self._taps = _samples(h)
+
+        self.reset()
+
+    def reset(self):
+        """
+        Clear the filter state as if no samples had been pushed.
+        """
+        # the last len(h)-1 input samples for overlap-save, the pending output tail for overlap-add
+        self._state = zeros(len(self._taps) - 1, self._taps)
+
+    def push(self, chunk):
+        """
+        Filter the next chunk of input samples and return the same number of output samples.
+        """
+        samples = _samples(chunk)
+        count = len(samples)
+
+        if self.method == 'overlap-save':
+            # the saved input samples complete the first len(h)-1 outputs of this chunk
+            segment = concatenate([self._state, samples])
+            out = valid_convolve(segment, self._taps)
+            self._state = copy(segment[len(segment) - len(self._state):])
+            return _signal(out)
+
+        # add the tail left by the previous chunks to this chunk's full convolution
+        full = convolve_buffers(samples, self._taps)
+        combined = add(full, 0, self._state, 0)[0]
+
+        self._state = copy(combined[count:count + len(self._state)])
+        return _signal(combined[:count])
+
+    def flush(self):
+        """
+        Return the remaining output samples once the input has ended and reset the filter.
+        """
+        if self.method == 'overlap-save':
+            out = self.push(zeros(len(self._state), self._taps))
+        else:
+            out = _signal(self._state)
+
+        self.reset()
+        return out
+
+
+# output samples of a recursive filter solved together, see _recursive
+_IIR_BLOCK = 1024
+
+
+def _coefficients(coefficients, name):
+    """
+    Return the coefficients of a DigitalSignal at the indices 0 and up, or of a sequence of scalars, as a list.
+    """
+    if isinstance(coefficients, DigitalSignal):
+        start, stop = coefficients.shape()
+        if any(coefficients[k] for k in range(start, 0)):
+            raise ValueError(f"{name} must only have coefficients at the indices 0 and up.")
+        values = coefficients[0:stop + 1]
+    else:
+        values = list(coefficients)
+
+    if not values:
+        raise ValueError(f"{name} must have at least one coefficient.")
+    return values
+
+
+def _recursive(v, a):
+    """
+    Return y[n] = v[n] - sum over k of a[k] * y[n-k], for a NumPy buffer v with y zero
+    before its first sample and a[0] = 1. The outputs of every block of _IIR_BLOCK
+    samples are the response to that block's inputs plus the response to the last
+    outputs of the previous block, so only those few outputs are carried from block
+    to block in Python and everything else is computed for all blocks at once.
+    """
+    np = array_module()
+    p = len(a) - 1
+    a = np.asarray(a[1:])
+
+    def solve(values):
+        out = values.astype(np.result_type(values, a))
+        for n in range(1, len(out)):
+            k = min(n, p)
+            out[n] -= np.dot(a[:k], out[n - 1::-1][:k])
+        return out
+
+    # a signal no longer than a block costs no more than the impulse response
+    if len(v) <= _IIR_BLOCK:
+        return solve(v)
+
+    # impulse response of 1 / A(z) over one block
+    size = max(_IIR_BLOCK, p)
+    impulse = np.zeros(size, dtype=v.dtype)
+    impulse[0] = 1
+    h = solve(impulse)
+
+    # column j is the response to y[-1-j] = 1, a forcing of -a[k] at n = k - j - 1 for every k > j
+    zero_input = np.zeros((size, p), dtype=h.dtype)
+    for j in range(p):
+        for k in range(j, p):
+            zero_input[k - j:, j] -= a[k] * h[:size - (k - j)]
+
+    blocks = -(-len(v) // size)
+    rows = np.zeros((blocks, size), dtype=h.dtype)
+    rows.reshape(-1)[:len(v)] = v
+
+    # the response of every block to its own inputs, a truncated convolution with h
+    nfft = 1 << (2 * size - 1).bit_length()
+    if h.dtype.kind == 'c':
+        forced = np.fft.ifft(np.fft.fft(rows, nfft, axis=1) * np.fft.fft(h, nfft), axis=1)[:, :size]
+    else:
+        forced = np.fft.irfft(np.fft.rfft(rows, nfft, axis=1) * np.fft.rfft(h, nfft), nfft, axis=1)[:, :size]
+
+    # the last p outputs of each block, latest first, start the next block
+    states = np.zeros((blocks, p), dtype=h.dtype)
+    tail = zero_input[size - p:][::-1]
+    state = np.zeros(p, dtype=h.dtype)
+    for row in range(blocks):
+        states[row] = state
+        state = forced[row, size - p:][::-1] + tail @ state
+
+    return (forced + states @ zero_input.T).reshape(-1)[:len(v)]
+
+
+def _final_state(x, y, b, a, zi):
+    """
+    Return the transposed direct form II state after the last sample: entry k holds the part
+    of output len(x) + k that the inputs x and outputs y already determine.
+    """
+    order = len(zi)
+    count = len(x)
+    state = []
+    for k in range(order):
+        n = count + k
+        value = zi[n] if n < order else 0
+        for j in range(k + 1, order + 1):
+            if n - j >= 0:
+                value += b[j] * x[n - j] - a[j] * y[n - j]
+        state.append(value)
+    return state
+
+
+def lfilter(b, a, x, zi=None):
+    """
+    Filter x with the difference equation a[0]*y[n] = sum over k of b[k]*x[n-k] - sum over
+    k >= 1 of a[k]*y[n-k]. b and a are DigitalSignal coefficients at the indices 0 and up,
+    or sequences of scalars. The output has the shape of x and starts at its first index.
+
+    zi is the initial transposed direct form II state, max(len(a), len(b)) - 1 values,
+    zero by default. Returns the output and the final state, which continues the filter
+    on the samples that follow x.
+    """
+    b = _coefficients(b, 'b')
+    a = _coefficients(a, 'a')
+    if a[0] == 0:
+        raise ValueError("a[0] must not be zero.")
+
+    # normalize so a[0] is 1 and pad b and a to the same order
+    b = [value / a[0] for value in b]
+    a = [value / a[0] for value in a]
+    order = max(len(a), len(b)) - 1
+    b += [0] * (order + 1 - len(b))
+    a += [0] * (order + 1 - len(a))
+
+    zi = [0] * order if zi is None else list(zi)
+    if len(zi) != order:
+        raise ValueError(f"zi must hold {order} values.")
+
+    samples = _samples(x)
+    start = x.shape()[0] if isinstance(x, DigitalSignal) else 0
+
+    np = array_module()
+    if np is not None:
+        samples = samples.astype(np.result_type(samples, np.asarray(b), np.asarray(a), np.asarray(zi), np.float64))
+        v = convolve_buffers(samples, np.asarray(b, dtype=samples.dtype))[:len(samples)] if len(samples) else samples.copy()
+        count = min(order, len(v))
+        v[:count] += np.asarray(zi[:count], dtype=v.dtype)
+        y = _recursive(v, a) if len(a) > 1 and any(a[1:]) and len(v) else v
+        state = _final_state(samples, y, b, a, zi)
+        return DigitalSignal._wrap(y, start), np.asarray(state, dtype=y.dtype)
+
+    # one pass of the transposed direct form II without NumPy
+    z = list(zi) + [0]
+    y = []
+    for value in samples:
+        out = b[0] * value + z[0]
+        for k in range(order):
+            z[k] = b[k + 1] * value + z[k + 1] - a[k + 1] * out
+        y.append(out)
+    y = [value + 0.0 for value in y]
+    return DigitalSignal._wrap(pack(y), start), z[:order]
+
+
+def sosfilt(sos, x, zi=None):
+    """
+    Filter x with a cascade of second order sections, each a row b0, b1, b2, a0, a1, a2,
+    which stays accurate for high order filters where a single lfilter loses precision.
+    zi holds two state values per section. Returns the output and the final states.
+    """
+    sections = [list(section) for section in sos]
+    if not sections or any(len(section) != 6 for section in sections):
+        raise ValueError("sos must be a non-empty sequence of rows b0, b1, b2, a0, a1, a2.")
+
+    zi = [[0, 0]] * len(sections) if zi is None else [list(state) for state in zi]
+    if len(zi) != len(sections) or any(len(state) != 2 for state in zi):
+        raise ValueError("zi must hold two values for every section.")
+
+    y, states = x, []
+    for section, state in zip(sections, zi):
+        y, final = lfilter(section[:3], section[3:], y, state)
+        states.append(final)
+
+    np = array_module()
+    return y, np.asarray(states) if np is not None else states
@@ -1,8 +1,20 @@
 import cmath
+import math
+
+try:
+    from DigitalSignal.digital_signal import DigitalSignal
+    from DigitalSignal.backend import array_module, get_backend, pack, set_backend
+    from DigitalSignal.parallel import attach, map_tasks, share, uses_processes
+except ImportError:
+    # this is a hack to allow the helpers to be used in the online REPL
+    pass
 
 
 PI = cmath.pi
 
+# largest difference between E.evaluate and calling E once per index
+TOLERANCE = 1e-12
+
 
 class E():
     """
@@ -27,6 +39,28 @@ class E():
 
         return  complex(round(z.real, self.ndigits), round(z.imag, self.ndigits))
 
+    def evaluate(self, first, count):
+        """
+        Return the values at the indices first through first+count-1 as a buffer,
+        equal to calling E once per index within TOLERANCE. With ndigits set a
+        value that close to a rounding boundary may round the other way.
+        """
+        np = array_module()
+        if np is not None:
+            phase = self.imag_const * np.arange(first, first + count)
+            z = np.cos(phase) + 1j * np.sin(phase)
+            if self.ndigits is None:
+                return z
+            return np.round(z, self.ndigits)
+
+        # every phase is the same product as in __call__, a recurrence drifts from it at large indices
+        c = self.imag_const
+        values = [complex(math.cos(c * n), math.sin(c * n)) for n in range(first, first + count)]
+
+        if self.ndigits is not None:
+            values = [complex(round(z.real, self.ndigits), round(z.imag, self.ndigits)) for z in values]
+        return pack(values, 'c')
+
 
 def cconj(signal):
     """
@@ -36,4 +70,56 @@ def cconj(signal):
     try:
         return signal.complex_conjugate() 
     except AttributeError:
-        raise AttributeError
\ No newline at end of file
+        raise AttributeError
+
+
+def convolve(x, h, method='auto'):
+    """
+    A helper function that calls the convolve method on a DigitalSignal object,
+    method can be 'auto', 'direct', 'fft' or 'overlap-add'
+    """
+
+    return x.convolve(h, method=method)
+
+
+def correlate(x, y, max_lag=None, normalize=None):
+    """
+    A helper function that calls the correlate method on a DigitalSignal object,
+    normalize can be None, 'biased', 'unbiased' or 'coeff'
+    """
+
+    return x.correlate(y, max_lag=max_lag, normalize=normalize)
+
+
+def correlate_many(x, templates, max_lag=None, normalize=None):
+    """
+    Return the correlations of x with each of a list of templates, spread across
+    the workers of the active executor, see set_executor.
+    """
+    count = len(templates)
+
+    if array_module() is not None and uses_processes():
+        # the workers read x straight from shared memory instead of receiving a copy each
+        block, handle = share(x._data)
+        try:
+            return map_tasks(_correlate_shared, [handle] * count, [x._start] * count, templates,
+                             [max_lag] * count, [normalize] * count, [get_backend()] * count)
+        finally:
+            block.close()
+            block.unlink()
+
+    return map_tasks(correlate, [x] * count, templates, [max_lag] * count, [normalize] * count)
+
+
+def _correlate_shared(handle, start, template, max_lag, normalize, backend):
+    """
+    Correlate a signal in shared memory with one template, run in a worker process.
+    """
+    set_backend(backend)
+    block, data = attach(handle)
+    try:
+        x = DigitalSignal._wrap(data, start)
+        return correlate(x, template, max_lag, normalize)
+    finally:
+        del x, data
+        block.close()
@@ -0,0 +1,234 @@
+try:
+    from DigitalSignal import DigitalSignal
+    from DigitalSignal.backend import SCALAR_TYPES, array_module, item, pack, window
+except ImportError:
+    # this is a hack to allow LazySignal to be used in the online REPL
+    pass
+
+
+# output samples computed together, the temporaries of every term stay this small
+_BLOCK = 1 << 16
+
+
+class LazySignal:
+    """
+    A DigitalSignal expression that is only computed when it is indexed, printed or
+    evaluated. Created with x.lazy().
+
+    Shifts, folds, scales, conjugates, sums and differences are kept as a list of
+    terms coef * x[sign*n + offset], conjugated or not, and computed together in a
+    single pass over the output support. Any other operator evaluates the
+    expression first and continues lazily from the result.
+    """
+
+    def __init__(self, signal):
+        if not isinstance(signal, DigitalSignal):
+            raise TypeError("A LazySignal can only be built from a DigitalSignal.")
+
+        # the expression keeps the samples as they are now, later writes to signal copy them first
+        signal._shared = True
+        self._terms = [(1, signal._data, signal._start, 1, 0, False)]
+
+    @classmethod
+    def _from_terms(cls, terms):
+        lazy = cls.__new__(cls)
+        lazy._terms = terms
+        return lazy
+
+    def _support(self, term):
+        """
+        Return the first and last output index where a term reads stored samples.
+        """
+        _, data, start, sign, offset, _ = term
+        if sign > 0:
+            return start - offset, start + len(data) - 1 - offset
+        return offset - (start + len(data) - 1), offset - start
+
+    def shape(self):
+        """
+        Return the shape the evaluated signal will have.
+        """
+        supports = [self._support(term) for term in self._terms if len(term[1])]
+        if not supports:
+            return (0, -1)
+
+        return (min(min(first for first, _ in supports), 0), max(max(last for _, last in supports), 0))
+
+    def __len__(self):
+        start, stop = self.shape()
+        return stop - start + 1
+
+    def __repr__(self):
+        return repr(self.evaluate())
+
+    def __getitem__(self, index):
+        """
+        Return the value at an index without evaluating the rest of the signal, or a slice of the evaluated signal.
+        """
+        if isinstance(index, slice):
+            return self.evaluate()[index]
+
+        if not isinstance(index, int):
+            raise TypeError("Indexing only supports integers and slices.")
+
+        total = 0
+        for coef, data, start, sign, offset, conj in self._terms:
+            position = sign * index + offset - start
+            if 0 <= position < len(data):
+                value = item(data, position)
+                total += coef * (value.conjugate() if conj else value)
+        return total
+
+    def __call__(self, amount=0):
+        """
+        Return the expression time shifted by the specified amount.
+        """
+        if not isinstance(amount, int):
+            raise TypeError("Time-shifting only supports integers.")
+
+        return LazySignal._from_terms([(coef, data, start, sign, offset + sign * amount, conj)
+                                       for coef, data, start, sign, offset, conj in self._terms])
+
+    def __invert__(self):
+        """
+        Return the time-reversed expression.
+        """
+        return LazySignal._from_terms([(coef, data, start, -sign, offset, conj)
+                                       for coef, data, start, sign, offset, conj in self._terms])
+
+    def complex_conjugate(self):
+        return LazySignal._from_terms([(coef.conjugate(), data, start, sign, offset, not conj)
+                                       for coef, data, start, sign, offset, conj in self._terms])
+
+    def _combine(self, other, factor):
+        """
+        Return the sum of this expression and factor times another, merging terms that read the same samples.
+        """
+        if isinstance(other, DigitalSignal):
+            other = LazySignal(other)
+        elif not isinstance(other, LazySignal):
+            raise TypeError("Addition is only supported with DigitalSignal or LazySignal objects.")
+
+        terms = list(self._terms)
+        for coef, data, start, sign, offset, conj in other._terms:
+            for i, (c, d, st, sg, of, cj) in enumerate(terms):
+                if d is data and (st, sg, of, cj) == (start, sign, offset, conj):
+                    terms[i] = (c + factor * coef, d, st, sg, of, cj)
+                    break
+            else:
+                terms.append((factor * coef, data, start, sign, offset, conj))
+
+        return LazySignal._from_terms(terms)
+
+    def __add__(self, other):
+        return self._combine(other, 1)
+
+    def __radd__(self, other):
+        return self._combine(other, 1)
+
+    def __sub__(self, other):
+        return self._combine(other, -1)
+
+    def __rsub__(self, other):
+        return (-self)._combine(other, 1)
+
+    def __mul__(self, other):
+        """
+        Return the expression scaled by a scalar, a callable is applied to the evaluated signal.
+        """
+        if callable(other):
+            return LazySignal(self.evaluate() * other)
+
+        if not isinstance(other, SCALAR_TYPES):
+            raise TypeError("The scalar must be an integer, float, complex or callable.")
+
+        return LazySignal._from_terms([(coef * other, data, start, sign, offset, conj)
+                                       for coef, data, start, sign, offset, conj in self._terms])
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def __neg__(self):
+        return -1 * self
+
+    def __matmul__(self, other):
+        return LazySignal(self.evaluate() @ _evaluated(other))
+
+    def __rmatmul__(self, other):
+        return LazySignal(_evaluated(other) @ self.evaluate())
+
+    def __mod__(self, other):
+        return LazySignal(self.evaluate() % _evaluated(other))
+
+    def __rmod__(self, other):
+        return LazySignal(_evaluated(other) % self.evaluate())
+
+    def __eq__(self, other):
+        return self.evaluate() == _evaluated(other)
+
+    def round(self, ndigits=None):
+        return LazySignal(self.evaluate().round(ndigits))
+
+    def evaluate(self):
+        """
+        Return the value of the expression as a DigitalSignal.
+        """
+        terms = [term for term in self._terms if len(term[1])]
+        if not terms:
+            return DigitalSignal._wrap(pack([]))
+
+        supports = [self._support(term) for term in terms]
+        first = min(lo for lo, _ in supports)
+        last = max(hi for _, hi in supports)
+
+        np = array_module()
+        if np is not None:
+            dtype = np.result_type(*[data for _, data, _, _, _, _ in terms], *[coef for coef, _, _, _, _, _ in terms])
+            out = np.zeros(last - first + 1, dtype=dtype)
+
+            for block in range(first, last + 1, _BLOCK):
+                segment = out[block - first:block - first + _BLOCK]
+                end = block + len(segment) - 1
+                for term, (lo, hi) in zip(terms, supports):
+                    lo, hi = max(lo, block), min(hi, end)
+                    if lo <= hi:
+                        segment[lo - block:hi - block + 1] += _samples(term, lo, hi)
+        else:
+            out = [0] * (last - first + 1)
+            for term, (lo, hi) in zip(terms, supports):
+                values = _samples(term, lo, hi)
+                out[lo - first:hi - first + 1] = [o + v for o, v in zip(out[lo - first:hi - first + 1], values)]
+            out = pack(out)
+
+        return DigitalSignal._wrap(out, first)
+
+
+def _samples(term, lo, hi):
+    """
+    Return the values of a term at the output indices lo through hi.
+    """
+    coef, data, start, sign, offset, conj = term
+
+    if sign > 0:
+        values = window(data, start, lo + offset, hi + offset)
+    else:
+        values = window(data, start, offset - hi, offset - lo)[::-1]
+
+    np = array_module()
+    if np is not None:
+        if conj:
+            values = np.conjugate(values)
+        return values if coef == 1 else coef * values
+
+    if conj:
+        values = [v.conjugate() for v in values]
+    return [coef * v for v in values]
+
+
+def _evaluated(signal):
+    """
+    Return a DigitalSignal for either a DigitalSignal or a LazySignal.
+    """
+    if isinstance(signal, LazySignal):
+        return signal.evaluate()
+    return signal
@@ -0,0 +1,279 @@
+from array import array
+
+try:
+    from DigitalSignal.backend import array_module
+except ImportError:
+    # this is a hack to allow the LFSR engine to be used in the online REPL
+    pass
+
+
+# preferred pairs of feedback polynomials for Gold codes, keyed by degree
+PREFERRED_PAIRS = {
+    5: ((5, 2), (5, 4, 3, 2)),
+    6: ((6, 1), (6, 5, 2, 1)),
+    7: ((7, 3), (7, 3, 2, 1)),
+    9: ((9, 4), (9, 6, 4, 3)),
+    10: ((10, 3), (10, 8, 3, 2)),
+    11: ((11, 2), (11, 8, 5, 2)),
+}
+
+# widest block of bits computed with one set of big integer operations
+_MAX_BLOCK = 4096
+
+# bytes handed out per chunk by the block generator
+_CHUNK_BYTES = 4096
+
+# the eight bits of every byte value, least significant bit first, and the
+# byte translation mapping the bits 0 and 1 to the int8 values -1 and 1
+_BITS = [bytes((byte >> i) & 1 for i in range(8)) for byte in range(256)]
+_BIPOLAR = bytes([255, 1]) + bytes(254)
+
+
+class LFSR:
+    """
+    A linear feedback shift register over GF(2) with the feedback polynomial
+    x^n + ... + 1 given by its exponents, e.g. taps=(4, 3) for x^4 + x^3 + 1.
+    The output sequence satisfies s[k] = s[k-n] ^ s[k-n+t] for every tap t < n.
+
+    In the 'fibonacci' form bit i of state is output bit i, in the 'galois' form
+    state is the contents of the Galois register.
+    """
+
+    def __init__(self, taps, state=1, form='fibonacci'):
+        taps = sorted(set(taps), reverse=True)
+
+        if not taps or not all(isinstance(t, int) and t > 0 for t in taps):
+            raise ValueError("taps must be positive integers.")
+
+        if form not in ('fibonacci', 'galois'):
+            raise ValueError("form must be either 'fibonacci' or 'galois'.")
+
+        self.degree = taps[0]
+        self.taps = tuple(taps)
+        self.form = form
+
+        if not isinstance(state, int) or state <= 0 or state >> self.degree:
+            raise ValueError("state must be a non-zero integer of at most 'degree' bits.")
+        self.state = state
+
+        # delays of the output recurrence, s[k] is the xor of s[k-d]
+        self._delays = [self.degree] + [self.degree - t for t in self.taps[1:]]
+
+        self.reset()
+
+    def reset(self):
+        """
+        Restart the output sequence from the initial state.
+        """
+        self._stream = self._blocks()
+        self._leftover = _unpack(b'')
+
+    def _initial_bits(self):
+        """
+        Return the first 'degree' output bits as an integer, least significant bit first.
+        """
+        if self.form == 'fibonacci':
+            return self.state
+
+        # the Galois register implementing the same recurrence uses the reciprocal polynomial
+        mask = 1 << (self.degree - 1)
+        for d in self._delays[1:]:
+            mask |= 1 << (d - 1)
+
+        register, bits = self.state, 0
+        for i in range(self.degree):
+            out = register & 1
+            bits |= out << i
+            register >>= 1
+            if out:
+                register ^= mask
+        return bits
+
+    def _blocks(self):
+        """
+        Yield the output sequence as chunks of bytes, least significant bit first.
+
+        The recurrence still holds with every delay multiplied by a power of two
+        (p(x)^2 = p(x^2) over GF(2)), so with delays scaled by S the next S bits
+        only depend on bits already generated and are computed together with a
+        handful of shifts and xors on Python integers.
+        """
+        n = self.degree
+        delays = self._delays
+
+        # grow the seed, doubling the block size whenever the history allows it
+        seq, length, scale = self._initial_bits(), n, 1
+        while scale < _MAX_BLOCK or length < n * scale:
+            if length >= 2 * n * scale and scale < _MAX_BLOCK:
+                scale *= 2
+            mask = (1 << scale) - 1
+            block = 0
+            for d in delays:
+                block ^= (seq >> (length - d * scale)) & mask
+            seq |= block << length
+            length += scale
+
+        # keep only the history the scaled recurrence reaches back to
+        history = n * scale
+        recent = seq >> (length - history)
+        mask = (1 << scale) - 1
+        shifts = [history - d * scale for d in delays]
+        top = history - scale
+
+        pending, pending_bits = seq, length
+        while True:
+            while pending_bits < 8 * _CHUNK_BYTES:
+                block = 0
+                for shift in shifts:
+                    block ^= (recent >> shift) & mask
+                recent = (recent >> scale) | (block << top)
+                pending |= block << pending_bits
+                pending_bits += scale
+
+            nbytes = pending_bits // 8
+            yield (pending & ((1 << (8 * nbytes)) - 1)).to_bytes(nbytes, 'little')
+            pending >>= 8 * nbytes
+            pending_bits -= 8 * nbytes
+
+    def generate(self, length, bipolar=False):
+        """
+        Return the next length output bits as a compact buffer of 0s and 1s, or
+        of -1s and 1s when bipolar is True.
+        """
+        if not isinstance(length, int) or length < 0:
+            raise ValueError("length must be a non-negative integer.")
+
+        parts, have = [self._leftover], len(self._leftover)
+        while have < length:
+            part = _unpack(next(self._stream))
+            parts.append(part)
+            have += len(part)
+
+        bits = _concatenate(parts)
+        self._leftover = bits[length:]
+        return _to_output(bits[:length], bipolar)
+
+    def chunks(self, chunk_size, length=None, bipolar=False):
+        """
+        Yield the output sequence in buffers of chunk_size bits, stopping after
+        length bits when length is given.
+        """
+        if not isinstance(chunk_size, int) or chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer.")
+
+        while length is None or length > 0:
+            size = chunk_size if length is None else min(chunk_size, length)
+            yield self.generate(size, bipolar)
+            if length is not None:
+                length -= size
+
+
+def _unpack(data):
+    """
+    Return the bits of a bytes object as a buffer of 0s and 1s, least significant bit first.
+    """
+    np = array_module()
+    if np is not None:
+        return np.unpackbits(np.frombuffer(data, dtype=np.uint8), bitorder='little').view(np.int8)
+
+    return array('b', b''.join([_BITS[byte] for byte in data]))
+
+
+def _concatenate(parts):
+    """
+    Return the buffers of bits joined end to end.
+    """
+    np = array_module()
+    if np is not None:
+        return np.concatenate(parts)
+
+    out = array('b')
+    for part in parts:
+        out.extend(part)
+    return out
+
+
+def _to_output(bits, bipolar):
+    """
+    Return a buffer of bits mapped to -1s and 1s when bipolar is True.
+    """
+    np = array_module()
+    if np is not None:
+        return 2 * bits - 1 if bipolar else bits.copy()
+
+    if bipolar:
+        return array('b', bits.tobytes().translate(_BIPOLAR))
+    return array('b', bits)
+
+
+def _xor(a, b):
+    """
+    Return the elementwise xor of two buffers of bits.
+    """
+    np = array_module()
+    if np is not None:
+        return a ^ b
+    return array('b', [u ^ v for u, v in zip(a, b)])
+
+
+def _roll(bits, shift):
+    """
+    Return a buffer of bits cyclically advanced by shift samples.
+    """
+    shift %= max(len(bits), 1)
+    return _concatenate([bits[shift:], bits[:shift]])
+
+
+def m_sequence(taps, state=1, bipolar=False):
+    """
+    Return one full period of the maximal length sequence of a primitive feedback polynomial.
+    """
+    lfsr = LFSR(taps, state)
+    return lfsr.generate(2 ** lfsr.degree - 1, bipolar)
+
+
+def gold_codes(taps_u=None, taps_v=None, degree=None, bipolar=False):
+    """
+    Return the Gold code family of a preferred pair of feedback polynomials as
+    a list of 2^n + 1 buffers: u, v and u ^ v advanced by 0 through 2^n - 2.
+    A degree selects a preferred pair from PREFERRED_PAIRS.
+    """
+    if degree is not None:
+        if degree not in PREFERRED_PAIRS:
+            raise ValueError(f"No preferred pair is known for degree {degree}.")
+        taps_u, taps_v = PREFERRED_PAIRS[degree]
+
+    if taps_u is None or taps_v is None:
+        raise ValueError("Either both polynomials or a degree must be given.")
+
+    u, v = m_sequence(taps_u), m_sequence(taps_v)
+    if len(u) != len(v):
+        raise ValueError("Both polynomials must have the same degree.")
+
+    codes = [u, v] + [_xor(u, _roll(v, shift)) for shift in range(len(v))]
+    return [_to_output(code, bipolar) for code in codes]
+
+
+def kasami_codes(taps, bipolar=False):
+    """
+    Return the small set of Kasami codes of a primitive feedback polynomial of
+    even degree n as a list of 2^(n/2) buffers: u and u ^ w advanced by 0
+    through 2^(n/2) - 2, where w is u decimated by 2^(n/2) + 1.
+    """
+    u = m_sequence(taps)
+    degree = max(taps)
+    if degree % 2:
+        raise ValueError("Kasami codes need a feedback polynomial of even degree.")
+
+    period = len(u)
+    q = 2 ** (degree // 2) + 1
+    short = 2 ** (degree // 2) - 1
+
+    np = array_module()
+    if np is not None:
+        w = u[(q * np.arange(period)) % period]
+    else:
+        w = array('b', [u[(q * k) % period] for k in range(period)])
+
+    codes = [u] + [_xor(u, _roll(w, shift)) for shift in range(short)]
+    return [_to_output(code, bipolar) for code in codes]
@@ -0,0 +1,131 @@
+import os
+
+try:
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    from multiprocessing.shared_memory import SharedMemory
+except ImportError:
+    # worker pools are not available in the online REPL, everything runs serially there
+    ProcessPoolExecutor = ThreadPoolExecutor = SharedMemory = None
+
+try:
+    from DigitalSignal.backend import array_module
+except ImportError:
+    # this is a hack to allow the executor settings to be used in the online REPL
+    pass
+
+
+# operands shorter than this many samples are never split across workers
+PARALLEL_MIN = 1 << 16
+
+# the active executor, None runs everything in the calling thread
+_executor = None
+
+# True when the active executor was created by set_executor and is shut down when replaced
+_owned = False
+
+
+def set_executor(executor=None, workers=None):
+    """
+    Select the executor that long convolutions and many-template correlations are
+    split across: None runs serially, 'thread' or 'process' start a pool of workers
+    (os.cpu_count() by default), or pass any concurrent.futures.Executor.
+    """
+    global _executor, _owned
+
+    if _owned:
+        _executor.shutdown()
+
+    if executor == 'thread':
+        executor, _owned = ThreadPoolExecutor(workers or os.cpu_count()), True
+    elif executor == 'process':
+        executor, _owned = ProcessPoolExecutor(workers or os.cpu_count()), True
+    elif executor is None or hasattr(executor, 'submit'):
+        _owned = False
+    else:
+        raise ValueError("executor must be None, 'thread', 'process' or a concurrent.futures.Executor.")
+
+    _executor = executor
+
+
+def get_executor():
+    """
+    Return the active executor, None when everything runs serially.
+    """
+    return _executor
+
+
+class parallel:
+    """
+    Run the enclosed operations with the given executor and restore the previous one afterwards.
+
+        with parallel('thread', workers=8):
+            y = x @ h
+    """
+
+    def __init__(self, executor='thread', workers=None):
+        self.executor = executor
+        self.workers = workers
+
+    def __enter__(self):
+        global _owned
+
+        self._previous, self._previous_owned = _executor, _owned
+        # keep the previous executor alive while this one is active
+        _owned = False
+        set_executor(self.executor, self.workers)
+        return _executor
+
+    def __exit__(self, *exc):
+        global _executor, _owned
+
+        if _owned:
+            _executor.shutdown()
+        _executor, _owned = self._previous, self._previous_owned
+        return False
+
+
+def worker_count():
+    """
+    Return the number of workers of the active executor.
+    """
+    if _executor is None:
+        return 1
+    return getattr(_executor, '_max_workers', None) or os.cpu_count() or 1
+
+
+def uses_processes():
+    """
+    Return True when the active executor runs tasks in other processes.
+    """
+    return ProcessPoolExecutor is not None and isinstance(_executor, ProcessPoolExecutor)
+
+
+def map_tasks(func, *iterables):
+    """
+    Return the results of func over the iterables, computed by the active executor.
+    """
+    if _executor is None:
+        return list(map(func, *iterables))
+    return list(_executor.map(func, *iterables))
+
+
+def share(buf):
+    """
+    Copy a NumPy buffer into shared memory. Returns the shared memory block, which
+    the caller closes and unlinks, and a handle that attach() opens in a worker.
+    """
+    np = array_module()
+    block = SharedMemory(create=True, size=max(buf.nbytes, 1))
+    np.ndarray(buf.shape, dtype=buf.dtype, buffer=block.buf)[:] = buf
+    return block, (block.name, buf.dtype.str, len(buf))
+
+
+def attach(handle):
+    """
+    Return the shared memory block of a handle from share() and a NumPy buffer
+    viewing it. Delete the buffer before closing the block.
+    """
+    np = array_module()
+    name, dtype, length = handle
+    block = SharedMemory(name=name)
+    return block, np.ndarray(length, dtype=dtype, buffer=block.buf)
@@ -0,0 +1,191 @@
+import time
+
+try:
+    import tracemalloc
+except ImportError:
+    # memory tracing is not available in the online REPL
+    tracemalloc = None
+
+
+# the methods profile() records, wrapped only while a profile is active
+OPERATORS = ('__add__', '__radd__', '__sub__', '__rsub__', '__neg__', '__mul__', '__rmul__', '__matmul__',
+             '__rmatmul__', '__mod__', '__rmod__', '__invert__', '__call__', '__setitem__', '__iadd__',
+             '__isub__', '__imul__', '__imatmul__', 'accumulate')
+
+# the active profiles, every recorded call goes to each of them
+_profiles = []
+
+# the operators running right now, innermost last, each [paths, base, peak]
+_frames = []
+
+# the original methods replaced by the wrappers, restored when the last profile ends
+_originals = []
+
+
+def note(path):
+    """
+    Record that an engine path, such as 'direct', 'fft' or 'sparse', ran for every operator running right now.
+    """
+    for paths, _, _ in _frames:
+        paths[path] = paths.get(path, 0) + 1
+
+
+def _size(value):
+    """
+    Return the support length and the stored bytes of a signal, (0, 0) for anything else.
+    """
+    from DigitalSignal.digital_signal import DigitalSignal
+    from DigitalSignal.sparse import SparseDigitalSignal
+
+    if isinstance(value, SparseDigitalSignal):
+        bufs = (value._indices, value._values)
+    elif isinstance(value, DigitalSignal):
+        bufs = (value._data,)
+    else:
+        return 0, 0
+
+    stored = 0
+    for buf in bufs:
+        # a list stores one 8 byte reference per sample
+        stored += getattr(buf, 'nbytes', None) or len(buf) * getattr(buf, 'itemsize', 8)
+    return len(value), stored
+
+
+def _instrument(func):
+    """
+    Return func wrapped to record every call in the active profiles.
+    """
+    name = func.__qualname__
+
+    def wrapper(*args, **kwargs):
+        frame = [{}, 0, 0]
+        tracing = tracemalloc is not None and tracemalloc.is_tracing()
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if _frames:
+                _frames[-1][2] = max(_frames[-1][2], peak)
+            tracemalloc.reset_peak()
+            frame[1] = frame[2] = current
+
+        samples = sum(_size(arg)[0] for arg in args)
+        _frames.append(frame)
+        begin = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - begin
+            _frames.pop()
+
+        allocated = 0
+        if tracing:
+            frame[2] = max(frame[2], tracemalloc.get_traced_memory()[1])
+            allocated = frame[2] - frame[1]
+            if _frames:
+                _frames[-1][2] = max(_frames[-1][2], frame[2])
+
+        # __setitem__ and the in-place operators leave their result in the signal itself
+        out_samples, out_bytes = _size(args[0] if result is None else result)
+        for prof in _profiles:
+            prof._record(name, elapsed, samples, out_samples, out_bytes, allocated, frame[0])
+        return result
+
+    wrapper.__name__, wrapper.__qualname__, wrapper.__doc__ = func.__name__, name, func.__doc__
+    return wrapper
+
+
+def _install():
+    """
+    Replace the recorded methods with wrappers.
+    """
+    # imported here, the convolution engine imports this module before the signal classes exist
+    from DigitalSignal.digital_signal import DigitalSignal
+    from DigitalSignal.shift_register import ShiftRegister
+    from DigitalSignal.sparse import SparseDigitalSignal
+
+    for cls, names in ((DigitalSignal, OPERATORS), (SparseDigitalSignal, OPERATORS), (ShiftRegister, ('__call__',))):
+        for name in names:
+            if name in cls.__dict__:
+                func = cls.__dict__[name]
+                _originals.append((cls, name, func))
+                setattr(cls, name, _instrument(func))
+
+
+def _uninstall():
+    """
+    Restore the original methods.
+    """
+    while _originals:
+        cls, name, func = _originals.pop()
+        setattr(cls, name, func)
+
+
+class profile:
+    """
+    Record the DigitalSignal and ShiftRegister operators that run inside the block.
+
+        with profile() as prof:
+            y = x @ h
+        print(prof.report())
+
+    For every operator, stats holds the number of calls, the wall time in seconds,
+    the support lengths of the signal operands and results, the bytes the results
+    store and how often each engine path ran ('direct', 'fft', 'overlap-add',
+    'parallel' or 'sparse'). Times include the operators an operator calls, which
+    are recorded as well. With memory=True tracemalloc also measures the peak bytes
+    every call allocates. hook, when given, receives stats once the block ends.
+
+    Operators are only wrapped while a profile is active, so they cost nothing otherwise.
+    """
+
+    def __init__(self, memory=False, hook=None):
+        self.memory = memory
+        self.hook = hook
+        self.stats = {}
+
+    def __enter__(self):
+        if not _profiles:
+            _install()
+        _profiles.append(self)
+
+        self._tracing = self.memory and tracemalloc is not None and not tracemalloc.is_tracing()
+        if self._tracing:
+            tracemalloc.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self._tracing:
+            tracemalloc.stop()
+
+        _profiles.remove(self)
+        if not _profiles:
+            _uninstall()
+
+        if self.hook is not None:
+            self.hook(self.stats)
+        return False
+
+    def _record(self, name, elapsed, samples, out_samples, out_bytes, allocated, paths):
+        entry = self.stats.get(name)
+        if entry is None:
+            entry = self.stats[name] = {'calls': 0, 'time': 0.0, 'input_samples': 0, 'output_samples': 0,
+                                        'output_bytes': 0, 'allocated': 0, 'paths': {}}
+        entry['calls'] += 1
+        entry['time'] += elapsed
+        entry['input_samples'] += samples
+        entry['output_samples'] += out_samples
+        entry['output_bytes'] += out_bytes
+        entry['allocated'] += allocated
+        for path, count in paths.items():
+            entry['paths'][path] = entry['paths'].get(path, 0) + count
+
+    def report(self):
+        """
+        Return the stats as a table, the slowest operators first.
+        """
+        lines = [f"{'operator':<36}{'calls':>8}{'time (s)':>12}{'in samples':>14}{'out samples':>14}"
+                 f"{'out bytes':>12}{'allocated':>12}  paths"]
+        for name, entry in sorted(self.stats.items(), key=lambda item: -item[1]['time']):
+            paths = ', '.join(f"{path} {count}" for path, count in sorted(entry['paths'].items()))
+            lines.append(f"{name:<36}{entry['calls']:>8}{entry['time']:>12.6f}{entry['input_samples']:>14}"
+                         f"{entry['output_samples']:>14}{entry['output_bytes']:>12}{entry['allocated']:>12}  {paths}")
+        return '\n'.join(lines)
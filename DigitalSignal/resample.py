@@ -0,0 +1,324 @@
+import math
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from DigitalSignal import DigitalSignal
+from DigitalSignal.backend import array_module, asbuffer, concatenate, copy, get_backend, pack, strided, window, zeros
+from DigitalSignal.convolution import convolve_buffers
+from DigitalSignal.batch import SignalBatch
+from DigitalSignal.filters import _samples
+
+
+# default filters kept for the most recently used rate pairs
+_FILTER_CACHE_SIZE = 32
+_FILTERS = {}
+
+
+def _check_factor(factor, name='factor'):
+    if not isinstance(factor, int) or factor < 1:
+        raise ValueError(f"{name} must be a positive integer.")
+
+
+def upsample(signal, factor):
+    """
+    Return the signal with factor - 1 zeros inserted between its samples, y[n] = x[n/factor]
+    when factor divides n and 0 otherwise, so the zero index stays in place.
+    Works on a DigitalSignal or on every row of a SignalBatch.
+    """
+    _check_factor(factor)
+
+    if isinstance(signal, SignalBatch):
+        data = signal.data
+        out = numpy.zeros((len(signal), max((data.shape[1] - 1) * factor + 1, 0)), dtype=data.dtype)
+        out[:, ::factor] = data
+        lengths = numpy.maximum((signal.lengths - 1) * factor + 1, 0)
+        return SignalBatch._wrap(out, signal.start * factor, signal.starts * factor, lengths)
+
+    if not isinstance(signal, DigitalSignal):
+        raise TypeError("Upsampling is only supported for DigitalSignal or SignalBatch objects.")
+
+    data = signal._data
+    np = array_module()
+    if np is not None:
+        out = np.zeros(max((len(data) - 1) * factor + 1, 0), dtype=data.dtype)
+        out[::factor] = data
+    else:
+        out = [0] * max((len(data) - 1) * factor + 1, 0)
+        out[::factor] = list(data)
+        out = pack(out)
+
+    return DigitalSignal._wrap(out, signal._start * factor)
+
+
+def downsample(signal, factor):
+    """
+    Return every factor-th sample of the signal, y[n] = x[n*factor], so the zero index stays in place.
+    The samples are a view of the signal's samples when NumPy is installed.
+    Works on a DigitalSignal or on every row of a SignalBatch.
+    """
+    _check_factor(factor)
+
+    if isinstance(signal, SignalBatch):
+        first = -(-signal.start // factor)
+        out = signal.data[:, first * factor - signal.start::factor]
+        starts = -(-signal.starts // factor)
+        lengths = numpy.maximum((signal.starts + signal.lengths - 1) // factor - starts + 1, 0)
+        return SignalBatch._wrap(out, first, starts, lengths)
+
+    if not isinstance(signal, DigitalSignal):
+        raise TypeError("Downsampling is only supported for DigitalSignal or SignalBatch objects.")
+
+    data, start = signal._data, signal._start
+    first = -(-start // factor)
+    last = (start + len(data) - 1) // factor
+
+    out, shared = strided(data, start, first * factor, max(last - first + 1, 0), factor)
+    if shared:
+        signal._shared = True
+    return DigitalSignal._wrap(out, first, shared)
+
+
+def _bessel_i0(x):
+    """
+    Return the modified Bessel function of the first kind of order zero.
+    """
+    term = total = 1.0
+    k = 1
+    while term > 1e-17 * total:
+        term *= (x / (2 * k)) ** 2
+        total += term
+        k += 1
+    return total
+
+
+def lowpass(up, down, half_length=None, beta=5.0):
+    """
+    Return the filter resample uses by default: a Kaiser windowed sinc with taps at
+    the indices -half_length through half_length (10 * max(up, down) by default), its
+    cutoff at the lower of the input and output Nyquist frequencies and a gain of up.
+    Centered on index 0, it resamples without moving the zero index.
+    """
+    _check_factor(up, 'up')
+    _check_factor(down, 'down')
+    rate = max(up, down)
+    half_length = 10 * rate if half_length is None else half_length
+
+    key = (up, down, half_length, beta, get_backend())
+    h = _FILTERS.pop(key, None)
+    if h is None:
+        taps = []
+        for k in range(-half_length, half_length + 1):
+            sinc = math.sin(math.pi * k / rate) / (math.pi * k / rate) if k else 1.0
+            taper = _bessel_i0(beta * math.sqrt(max(1 - (k / half_length) ** 2, 0.0))) if half_length else 1.0
+            taps.append(sinc * taper)
+
+        # a gain of exactly up at DC
+        total = sum(taps)
+        h = DigitalSignal._wrap(asbuffer([up * tap / total for tap in taps]), -half_length)
+
+        if len(_FILTERS) >= _FILTER_CACHE_SIZE:
+            del _FILTERS[next(iter(_FILTERS))]
+
+    # the filter is shared between calls, writing to it copies its samples first
+    h._shared = True
+    _FILTERS[key] = h
+    return h
+
+
+def _polyphase_rows(rows, start, taps, taps_start, up, down, first, count):
+    """
+    Return count output samples from index first of every row of a 2-D NumPy array,
+    each row a signal whose samples start at index start, upsampled by up, filtered by
+    taps starting at index taps_start and downsampled by down. Every output only sums
+    the taps that meet a sample of the signal rather than an inserted zero.
+    """
+    np = numpy
+    dtype = np.result_type(rows, taps)
+    if dtype.kind in 'iub':
+        dtype = np.dtype(np.int64)
+
+    out = np.zeros((rows.shape[0], max(count, 0)), dtype=dtype)
+    if count <= 0 or not len(taps) or not rows.shape[1]:
+        return out
+
+    # the signal padded with zeros over every index an output reads
+    lo = min((first * down - taps_start - len(taps) + 1) // up, start)
+    hi = max(((first + count - 1) * down - taps_start) // up, start + rows.shape[1] - 1)
+    padded = np.zeros((rows.shape[0], hi - lo + 1), dtype=rows.dtype)
+    padded[:, start - lo:start - lo + rows.shape[1]] = rows
+
+    # the outputs r, r + up, r + 2*up, ... use the same taps, reading every down-th sample
+    for r in range(min(up, count)):
+        offset = (first + r) * down - taps_start
+        phase = offset % up
+        base = (offset - phase) // up - lo
+        group = len(range(r, count, up))
+        for i, tap in enumerate(taps[phase::up]):
+            if tap:
+                begin = base - i
+                out[:, r::up] += tap * padded[:, begin:begin + (group - 1) * down + 1:down]
+    return out
+
+
+def _polyphase(data, start, taps, taps_start, up, down, first, count):
+    """
+    Return count output samples from index first of a signal upsampled by up,
+    filtered by taps and downsampled by down, see _polyphase_rows. The taps of
+    every output phase are split again into down components, each a plain
+    convolution with every down-th sample of the signal.
+    """
+    np = array_module()
+    if np is not None:
+        dtype = np.result_type(data, taps)
+        out = np.zeros(max(count, 0), dtype=np.int64 if dtype.kind in 'iub' else dtype)
+    else:
+        out = [0] * max(count, 0)
+
+    stop = start + len(data) - 1
+    for r in range(min(up, max(count, 0))):
+        # output t of this phase is the sum over i of g[i] * x[base + t*down - i]
+        offset = (first + r) * down - taps_start
+        phase = offset % up
+        base = (offset - phase) // up
+        group = len(range(r, count, up))
+        g = taps[phase::up]
+
+        for a in range(min(down, len(g))):
+            # the samples x[base - a + m*down] for every m that has a stored sample
+            lo = -(-(start - base + a) // down)
+            hi = (stop - base + a) // down
+            if lo > hi:
+                continue
+            z = strided(data, start, base - a + lo * down, hi - lo + 1, down)[0]
+            values = window(convolve_buffers(z, g[a::down]), lo, 0, group - 1)
+
+            if np is not None:
+                out[r::up] += values
+            else:
+                out[r::up] = [o + v for o, v in zip(out[r::up], values)]
+
+    return out if np is not None else pack(out)
+
+
+def _rates(up, down, h):
+    """
+    Check the resampling arguments and return the rates and the filter, the rates reduced to lowest terms for the default filter.
+    """
+    _check_factor(up, 'up')
+    _check_factor(down, 'down')
+
+    if h is None:
+        # the default filter only depends on the ratio
+        common = math.gcd(up, down)
+        up, down = up // common, down // common
+        h = lowpass(up, down)
+    elif not isinstance(h, DigitalSignal):
+        raise TypeError("The filter taps must be a DigitalSignal.")
+
+    return up, down, h
+
+
+def _output_range(first, last, up, down, h):
+    """
+    Return the first and last output index that can be nonzero for input samples from first through last.
+    """
+    taps_start, taps_stop = h._start, h._start + len(h._data) - 1
+    return -(-(first * up + taps_start) // down), (last * up + taps_stop) // down
+
+
+def resample(signal, up, down, h=None):
+    """
+    Return the signal resampled by the rational factor up / down: upsampled by up,
+    filtered by h and downsampled by down, y[n] = sum over k of h[k] * u[n*down - k].
+    h defaults to lowpass(up, down). Polyphase filtering only computes the kept
+    outputs and skips the inserted zeros, so the cost is proportional to the number
+    of output samples times len(h) / up. Works on a DigitalSignal or on every row of
+    a SignalBatch.
+    """
+    up, down, h = _rates(up, down, h)
+    taps, taps_start = h._data, h._start
+
+    if isinstance(signal, SignalBatch):
+        first, last = _output_range(signal.start, signal.shape()[1], up, down, h)
+        out = _polyphase_rows(signal.data, signal.start, numpy.asarray(taps), taps_start, up, down,
+                              first, last - first + 1)
+
+        starts, stops = _output_range(signal.starts, signal.starts + signal.lengths - 1, up, down, h)
+        return SignalBatch._wrap(out, first, starts, numpy.maximum(stops - starts + 1, 0))
+
+    if not isinstance(signal, DigitalSignal):
+        raise TypeError("Resampling is only supported for DigitalSignal or SignalBatch objects.")
+
+    data, start = signal._data, signal._start
+    if not len(data):
+        return DigitalSignal._wrap(pack([]))
+
+    first, last = _output_range(start, start + len(data) - 1, up, down, h)
+    return DigitalSignal._wrap(_polyphase(data, start, taps, taps_start, up, down, first, last - first + 1), first)
+
+
+class StreamingResampler:
+    """
+    A stateful resampler for a signal arriving in chunks.
+
+    Every pushed chunk returns the next output samples of resample(x, up, down, h)
+    that the samples pushed so far determine, where x is the concatenation of all
+    pushed chunks starting at index 0. Output chunks start at index 0, the first
+    output sample belongs to index 'start' of the resampled signal. flush() returns
+    the remaining output samples.
+    """
+
+    def __init__(self, up, down, h=None):
+        self.up, self.down, self.h = _rates(up, down, h)
+        self.start = _output_range(0, 0, self.up, self.down, self.h)[0]
+        self._taps = self.h._data
+
+        self.reset()
+
+    def reset(self):
+        """
+        Clear the resampler state as if no samples had been pushed.
+        """
+        self._history = zeros(0, self._taps)
+        self._history_start = 0
+        self._received = 0
+        self._next = self.start
+
+    def _emit(self, last):
+        """
+        Return the outputs from the next one through index last, then drop the input samples no later output reads.
+        """
+        count = max(last - self._next + 1, 0)
+        out = _polyphase(self._history, self._history_start, self._taps, self.h._start,
+                         self.up, self.down, self._next, count)
+        self._next += count
+
+        # the earliest input index the next output reads
+        keep = (self._next * self.down - self.h._start - len(self._taps) + 1) // self.up
+        drop = min(max(keep - self._history_start, 0), len(self._history))
+        self._history = copy(self._history[drop:])
+        self._history_start += drop
+        return DigitalSignal._wrap(out)
+
+    def push(self, chunk):
+        """
+        Resample the next chunk of input samples and return the output samples it completes.
+        """
+        samples = _samples(chunk)
+        self._history = concatenate([self._history, samples])
+        self._received += len(samples)
+
+        # an output is complete once the last input sample it reads has arrived
+        last = (self._received * self.up - 1 + self.h._start) // self.down
+        return self._emit(last)
+
+    def flush(self):
+        """
+        Return the remaining output samples once the input has ended and reset the resampler.
+        """
+        out = self._emit(_output_range(0, self._received - 1, self.up, self.down, self.h)[1])
+        self.reset()
+        return out
@@ -1,35 +1,68 @@
 try:
     from DigitalSignal import DigitalSignal
+    from DigitalSignal.backend import astype
+    from DigitalSignal.lfsr import LFSR, gold_codes, kasami_codes
 except:
     # this is a hack to allow ShiftRegister to be used in the online REPL
     pass
 
 class ShiftRegister:
-    def __init__(self, length):
+    def __init__(self, length, taps=None, state=None, form='fibonacci'):
+        """
+        A shift register of the given length. By default it feeds back the last two
+        stages (taps=(length, length-1)) and starts from a single leading '1'.
+        """
         self.shift_size = length
+        self.taps = tuple(taps) if taps is not None else (length, length-1) if length > 1 else (1,)
+        self.state = state if state is not None else 1 << (length-1)
+        self.form = form
+
+        if max(self.taps) != self.shift_size:
+            raise ValueError("The largest tap must equal the length of the shift register.")
+
+    def _lfsr(self):
+        return LFSR(self.taps, self.state, self.form)
+
+    def __call__(self, signal_length, bipolar=True, dtype='int64'):
+        """
+        Generate a signal of the given length from this shift register object,
+        dtype='int8' keeps the chips in one byte each
+        """
+
+        # the output always holds at least the initial contents of the register
+        bits = self._lfsr().generate(max(signal_length, self.shift_size), bipolar)
+
+        return _signal(bits, dtype)
 
-    def __call__(self, signal_length):
+    def chunks(self, chunk_size, signal_length=None, bipolar=True, dtype='int64'):
         """
-        Generate a signal of the given length from this shift register object
+        Generate the output of this shift register as consecutive signals of chunk_size samples,
+        without end unless signal_length is given
         """
 
-        # create a shift register of length 'shift_size' with a leading '1'
-        internal_signal = DigitalSignal([1]) + DigitalSignal()(-(self.shift_size-1))
-
-        # generate an output of length 'signal_length'
-        while len(internal_signal) < (signal_length):
-            
-            # modulus 2 add
-            new_value = internal_signal[0] ^ internal_signal[self.shift_size-1]
-            
-            # shift signal and append to end
-            internal_signal = internal_signal(-1)
-            internal_signal[0] = new_value
-
-        # convert 0s to -1s
-        internal_signal = 2 * internal_signal
-        ones = DigitalSignal(1, internal_signal.shape())
-        internal_signal = internal_signal - ones
-
-        # reverse the explicit signal
-        return DigitalSignal(internal_signal[::-1])
\ No newline at end of file
+        for bits in self._lfsr().chunks(chunk_size, signal_length, bipolar):
+            yield _signal(bits, dtype)
+
+
+def _signal(bits, dtype='int64'):
+    """
+    Wrap a buffer of generated chips in a DigitalSignal of the given sample type starting at index 0
+    """
+
+    return DigitalSignal._wrap(astype(bits, dtype))
+
+
+def gold_signals(taps_u=None, taps_v=None, degree=None, bipolar=True, dtype='int64'):
+    """
+    Return the Gold code family of a preferred pair of feedback polynomials as a list of DigitalSignal objects
+    """
+
+    return [_signal(code, dtype) for code in gold_codes(taps_u, taps_v, degree, bipolar)]
+
+
+def kasami_signals(taps, bipolar=True, dtype='int64'):
+    """
+    Return the small set of Kasami codes of an even degree feedback polynomial as a list of DigitalSignal objects
+    """
+
+    return [_signal(code, dtype) for code in kasami_codes(taps, bipolar)]
@@ -0,0 +1,497 @@
+from bisect import bisect_left
+
+try:
+    from DigitalSignal import DigitalSignal
+    from DigitalSignal.digital_signal import _defers
+    from DigitalSignal.backend import (SCALAR_TYPES, array_module, asbuffer, conjugate, multiply, pack, round_values,
+                                       scale, tolist, widen)
+    from DigitalSignal.profiling import note
+except ImportError:
+    # this is a hack to allow SparseDigitalSignal to be used in the online REPL
+    pass
+
+
+# results with more nonzero samples than this fraction of their support are returned as dense signals
+DENSITY_THRESHOLD = 0.25
+
+
+class SparseDigitalSignal(DigitalSignal):
+    """
+    A DigitalSignal that only stores its nonzero samples, as sorted index and
+    value buffers, over the support first through last.
+
+    Shifts, folds, scaling and sums cost proportional to the number of nonzero
+    samples, and so do convolution and correlation, where every nonzero sample
+    adds one scaled copy of the other operand. Results denser than
+    DENSITY_THRESHOLD become DigitalSignal objects. Every other DigitalSignal
+    operation works on the equivalent dense samples.
+    """
+
+    def __init__(self, indices=(), values=(), support=None):
+        indices, values = list(indices), list(values)
+
+        if len(indices) != len(values):
+            raise ValueError("indices and values must have the same length.")
+
+        if not all(isinstance(idx, int) for idx in indices):
+            raise TypeError("Indices can only be integers.")
+
+        if not all(isinstance(value, SCALAR_TYPES) for value in values):
+            raise TypeError("DigitalSignal values can only be scalars.")
+
+        if len(set(indices)) != len(indices):
+            raise ValueError("indices must not repeat.")
+
+        if support is None:
+            support = (min(indices), max(indices)) if indices else (0, -1)
+        first, last = support
+        if indices and (min(indices) < first or max(indices) > last):
+            raise ValueError("Every index must lie within the support.")
+
+        pairs = sorted((idx, value) for idx, value in zip(indices, values) if value != 0)
+        self._set(asbuffer([idx for idx, _ in pairs]), asbuffer([value for _, value in pairs]), first, last)
+
+    def _set(self, indices, values, first, last):
+        self._indices = _as_indices(indices)
+        self._values = values
+        self._first = first
+        self._last = last
+        self._dense = None
+        self._shared = False
+
+    @classmethod
+    def _build(cls, indices, values, first, last):
+        sparse = cls.__new__(cls)
+        sparse._set(indices, values, first, last)
+        return sparse
+
+    @classmethod
+    def from_dense(cls, signal):
+        """
+        Return the sparse form of a DigitalSignal, with the same shape.
+        """
+        if not isinstance(signal, DigitalSignal):
+            raise TypeError("Only a DigitalSignal can be made sparse.")
+
+        if isinstance(signal, SparseDigitalSignal):
+            return signal
+
+        first, last = signal.shape()
+        data, start = widen(signal._data, signal._start, first, last)
+
+        np = array_module()
+        if np is not None:
+            positions = np.flatnonzero(data)
+            return cls._build(positions + start, data[positions], first, last)
+
+        positions = [k for k, value in enumerate(data) if value != 0]
+        return cls._build([k + start for k in positions], pack([data[k] for k in positions]), first, last)
+
+    def to_dense(self):
+        """
+        Return the equivalent DigitalSignal.
+        """
+        return DigitalSignal._wrap(self._data, self._start, shared=True)
+
+    @property
+    def _data(self):
+        """
+        The dense samples over the support, computed once and kept until the signal is written to.
+        """
+        if self._dense is None:
+            self._dense = _scatter(self._indices, self._values, self._first, self._last)
+        return self._dense
+
+    @_data.setter
+    def _data(self, data):
+        # dense samples written by a DigitalSignal operation are stored sparse again
+        np = array_module()
+        if np is not None:
+            positions = np.flatnonzero(data)
+            indices, values = positions + self._first, data[positions]
+        else:
+            positions = [k for k, value in enumerate(data) if value != 0]
+            indices, values = [k + self._first for k in positions], pack([data[k] for k in positions])
+
+        self._set(indices, values, self._first, self._first + len(data) - 1)
+        self._dense = data
+
+    @property
+    def _start(self):
+        return self._first
+
+    @_start.setter
+    def _start(self, start):
+        delta = start - self._first
+        if array_module() is not None:
+            self._indices = self._indices + delta
+        else:
+            self._indices = [idx + delta for idx in self._indices]
+        self._first += delta
+        self._last += delta
+
+    @property
+    def nnz(self):
+        """
+        Return the number of nonzero samples.
+        """
+        return len(self._indices)
+
+    def density(self):
+        """
+        Return the fraction of the support that holds nonzero samples.
+        """
+        return self.nnz / max(self._last - self._first + 1, 1)
+
+    def __repr__(self):
+        samples = ', '.join(f"{idx}: {value}" for idx, value in zip(tolist(self._indices), tolist(self._values)))
+        return f"SparseDigitalSignal({{{samples}}}, support={(self._first, self._last)})"
+
+    def shape(self):
+        if self._first > self._last:
+            return (0, -1)
+
+        return (min(self._first, 0), max(self._last, 0))
+
+    def __getitem__(self, index):
+        if not isinstance(index, int):
+            return super().__getitem__(index)
+
+        position = _find(self._indices, index)
+        if position < len(self._indices) and self._indices[position] == index:
+            return tolist(self._values[position:position + 1])[0]
+        return 0
+
+    def __setitem__(self, index, value):
+        """
+        Set the signal value at the specified index, without filling the gap to it with zeros.
+        """
+        if not isinstance(index, int):
+            raise TypeError("Indexing only supports integers.")
+
+        if not isinstance(value, SCALAR_TYPES):
+            raise TypeError("DigitalSignal values can only be scalars.")
+
+        indices, values = tolist(self._indices), tolist(self._values)
+        position = _find(self._indices, index)
+        if position < len(indices) and indices[position] == index:
+            del indices[position], values[position]
+        if value != 0:
+            indices.insert(position, index)
+            values.insert(position, value)
+
+        first, last = (index, index) if self._first > self._last else (min(self._first, index), max(self._last, index))
+        self._set(asbuffer(indices), asbuffer(values), first, last)
+
+    def __call__(self, amount=0):
+        if not isinstance(amount, int):
+            raise TypeError("Time-shifting only supports integers.")
+
+        if array_module() is not None:
+            indices = self._indices - amount
+        else:
+            indices = [idx - amount for idx in self._indices]
+
+        return SparseDigitalSignal._build(indices, self._values, self._first - amount, self._last - amount)
+
+    def __invert__(self):
+        if array_module() is not None:
+            indices = -self._indices[::-1]
+        else:
+            indices = [-idx for idx in reversed(self._indices)]
+
+        return SparseDigitalSignal._build(indices, self._values[::-1], -self._last, -self._first)
+
+    def complex_conjugate(self):
+        return SparseDigitalSignal._build(self._indices, conjugate(self._values), self._first, self._last)
+
+    def round(self, ndigits=None, inplace=False):
+        if inplace:
+            indices, values = _nonzero(self._indices, round_values(self._values, ndigits))
+            self._set(indices, values, self._first, self._last)
+            return self
+
+        return _result(self._indices, round_values(self._values, ndigits), self._first, self._last)
+
+    def __mul__(self, other):
+        """
+        Return the signal scaled by a scalar, or multiplied by a callable evaluated at the nonzero samples only.
+        """
+        if callable(other):
+            values = multiply(self._values, [other(idx) for idx in tolist(self._indices)])
+        elif isinstance(other, SCALAR_TYPES):
+            values = scale(self._values, other)
+        else:
+            raise TypeError("The scalar must be an integer, float, complex or callable.")
+
+        return _result(self._indices, values, self._first, self._last)
+
+    def _combine(self, other, sign):
+        """
+        Return self plus sign times other.
+        """
+        if not isinstance(other, DigitalSignal):
+            if _defers(other, '__radd__' if sign > 0 else '__rsub__'):
+                return NotImplemented
+            raise TypeError("Addition is only supported between two DigitalSignal objects.")
+
+        if not isinstance(other, SparseDigitalSignal) or _empty(self) or _empty(other):
+            dense, other = self.to_dense(), _dense(other)
+            return dense + other if sign > 0 else dense - other
+
+        if sign < 0:
+            other = other._negated()
+
+        first, last = min(self._first, other._first), max(self._last, other._last)
+        indices, values = _merge([self._indices, other._indices], [self._values, other._values])
+        return _result(indices, values, first, last)
+
+    def __add__(self, other):
+        return self._combine(other, 1)
+
+    def __radd__(self, other):
+        return self._combine(other, 1)
+
+    def __sub__(self, other):
+        return self._combine(other, -1)
+
+    def __rsub__(self, other):
+        return self._negated()._combine(other, 1)
+
+    def _negated(self):
+        """
+        Return the negated signal, sparse whatever its density.
+        """
+        return SparseDigitalSignal._build(self._indices, scale(self._values, -1), self._first, self._last)
+
+    def accumulate(self, other, scale=1, shift=0):
+        """
+        Add scale times other(shift) to this signal and return it, the sum is stored sparse.
+        """
+        if not isinstance(other, DigitalSignal):
+            raise TypeError("Accumulation is only supported between two DigitalSignal objects.")
+
+        return self._adopt(self + other(shift) * scale)
+
+    def __imul__(self, other):
+        return self._adopt(self * other)
+
+    def _adopt(self, signal):
+        if not isinstance(signal, SparseDigitalSignal):
+            return super()._adopt(signal)
+
+        self._set(signal._indices, signal._values, signal._first, signal._last)
+        return self
+
+    def __matmul__(self, other):
+        if _defers(other, '__rmatmul__'):
+            return NotImplemented
+        return self.convolve(other)
+
+    def __rmatmul__(self, other):
+        return self.convolve(other)
+
+    def convolve(self, other, method='auto'):
+        """
+        Return the convolution with another DigitalSignal, adding one scaled copy of
+        the other operand per nonzero sample. method only applies once this signal
+        is dense enough to be convolved as a DigitalSignal.
+        """
+        if not isinstance(other, DigitalSignal):
+            raise TypeError("Convolution is only supported between two DigitalSignal objects.")
+
+        if _empty(self) or _empty(other):
+            return self.to_dense().convolve(_dense(other), method)
+
+        (a_start, a_stop), (b_start, b_stop) = self.shape(), other.shape()
+        first, last = a_start + b_start, a_stop + b_stop
+
+        if isinstance(other, SparseDigitalSignal):
+            indices, values = _outer(self._indices, self._values, other._indices, other._values)
+            return _result(indices, values, first, last)
+
+        if self.density() > DENSITY_THRESHOLD:
+            return self.to_dense().convolve(other, method)
+
+        data, start = _shifted_sum(self._indices, self._values, other._data, other._start)
+        return DigitalSignal._wrap(*widen(data, start, first, last))
+
+    def __mod__(self, other):
+        if _defers(other, '__rmod__'):
+            return NotImplemented
+        return self.correlate(other)
+
+    def __rmod__(self, other):
+        """
+        Return the correlation of a DigitalSignal with this signal, other % self.
+        """
+        if _empty(self) or _empty(other):
+            return _dense(other).correlate(self.to_dense())
+
+        # r[n] = sum_j conj(v_j) other[i_j + n], one scaled copy of other per nonzero sample
+        return (~self.complex_conjugate()).convolve(other)
+
+    def correlate(self, other, max_lag=None, normalize=None, method='auto'):
+        """
+        Return the cross-correlation with another DigitalSignal, r[n] = sum_k x[k+n] conj(y[k]).
+        A max_lag or normalization is applied to the equivalent dense signal.
+        """
+        if not isinstance(other, DigitalSignal):
+            raise TypeError("Correlation is only supported between two DigitalSignal objects.")
+
+        if max_lag is not None or normalize is not None or _empty(self) or _empty(other):
+            return self.to_dense().correlate(_dense(other), max_lag, normalize, method)
+
+        return self.convolve(~other.complex_conjugate(), method)
+
+
+def _as_indices(indices):
+    """
+    Return a buffer of 64 bit indices.
+    """
+    np = array_module()
+    if np is not None:
+        return np.asarray(indices, dtype=np.int64)
+    return list(indices)
+
+
+def _find(indices, index):
+    """
+    Return the position of index in a sorted buffer of indices, or where it would be inserted.
+    """
+    np = array_module()
+    if np is not None:
+        return int(np.searchsorted(indices, index))
+    return bisect_left(indices, index)
+
+
+def _empty(signal):
+    """
+    Return True for a sparse signal with an empty support. Like an empty DigitalSignal
+    its start index still pads a sum or convolution, so it is computed densely.
+    """
+    return isinstance(signal, SparseDigitalSignal) and signal._first > signal._last
+
+
+def _dense(signal):
+    """
+    Return the equivalent DigitalSignal of a sparse or dense signal.
+    """
+    return signal.to_dense() if isinstance(signal, SparseDigitalSignal) else signal
+
+
+def _scatter(indices, values, first, last):
+    """
+    Return a dense buffer over first through last holding values at indices and zeros elsewhere.
+    """
+    length = max(last - first + 1, 0)
+
+    np = array_module()
+    if np is not None:
+        out = np.zeros(length, dtype=values.dtype if len(values) else np.int64)
+        out[indices - first] = values
+        return out
+
+    out = [0] * length
+    for idx, value in zip(indices, values):
+        out[idx - first] = value
+    return pack(out)
+
+
+def _merge(index_bufs, value_bufs):
+    """
+    Return the sorted indices and summed values of several index and value buffers, dropping zero sums.
+    """
+    np = array_module()
+    if np is not None:
+        indices = np.concatenate(index_bufs)
+        values = np.concatenate(value_bufs)
+        if len(indices) == 0:
+            return indices, values
+
+        order = np.argsort(indices, kind='stable')
+        indices, values = indices[order], values[order]
+        starts = np.concatenate([[0], np.flatnonzero(np.diff(indices)) + 1])
+        indices, values = indices[starts], np.add.reduceat(values, starts)
+
+        keep = values != 0
+        return indices[keep], values[keep]
+
+    sums = {}
+    for indices, values in zip(index_bufs, value_bufs):
+        for idx, value in zip(indices, values):
+            sums[idx] = sums.get(idx, 0) + value
+
+    pairs = sorted((idx, value) for idx, value in sums.items() if value != 0)
+    return [idx for idx, _ in pairs], pack([value for _, value in pairs])
+
+
+def _outer(a_indices, a_values, b_indices, b_values):
+    """
+    Return the nonzero samples of the convolution of two sparse signals.
+    """
+    note('sparse')
+    np = array_module()
+    if np is not None:
+        indices = (a_indices[:, None] + b_indices[None, :]).reshape(-1)
+        values = (a_values[:, None] * b_values[None, :]).reshape(-1)
+        return _merge([indices], [values])
+
+    indices = [i + j for i in a_indices for j in b_indices]
+    values = [u * v for u in a_values for v in b_values]
+    return _merge([indices], [values])
+
+
+def _shifted_sum(indices, values, data, start):
+    """
+    Return the sum of one copy of data per nonzero sample, scaled by its value and
+    shifted by its index, along with the start index of the result.
+    """
+    note('sparse')
+    n = len(data)
+    if len(indices) == 0 or n == 0:
+        return _scatter(indices[:0], values[:0], 0, -1), 0
+
+    first = indices[0] + start
+    length = indices[-1] - indices[0] + n
+
+    np = array_module()
+    if np is not None:
+        out = np.zeros(length, dtype=np.result_type(values, data))
+        for idx, value in zip(tolist(indices), tolist(values)):
+            offset = idx + start - first
+            out[offset:offset + n] += value * data
+        return out, int(first)
+
+    out = [0] * length
+    data = list(data)
+    for idx, value in zip(indices, values):
+        offset = idx + start - first
+        out[offset:offset + n] = [o + value * v for o, v in zip(out[offset:offset + n], data)]
+    return pack(out), first
+
+
+def _nonzero(indices, values):
+    """
+    Return the indices and values without the zero values.
+    """
+    np = array_module()
+    if np is not None:
+        keep = values != 0
+        if keep.all():
+            return indices, values
+        return _as_indices(indices)[keep], values[keep]
+
+    pairs = [(idx, value) for idx, value in zip(indices, values) if value != 0]
+    return [idx for idx, _ in pairs], pack([value for _, value in pairs])
+
+
+def _result(indices, values, first, last):
+    """
+    Return a sparse signal, or a DigitalSignal when it is denser than DENSITY_THRESHOLD.
+    """
+    indices, values = _nonzero(indices, values)
+    sparse = SparseDigitalSignal._build(indices, values, first, last)
+    if first <= last and sparse.density() > DENSITY_THRESHOLD:
+        return sparse.to_dense()
+    return sparse
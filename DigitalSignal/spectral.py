@@ -0,0 +1,316 @@
+import cmath
+import math
+
+from DigitalSignal import DigitalSignal
+from DigitalSignal.backend import array_module, asbuffer, kind, pack
+from DigitalSignal.convolution import _fft, _next_pow2
+
+
+WINDOWS = ('boxcar', 'hann', 'hamming', 'blackman')
+
+# window shapes kept for the most recently used lengths
+_WINDOW_CACHE_SIZE = 32
+_WINDOWS = {}
+
+# frequencies times samples evaluated at once by dtft, the temporaries stay this small
+_DTFT_BLOCK = 1 << 20
+
+# segments transformed at once by welch
+_SEGMENT_BLOCK = 256
+
+
+def _dft(values, inverse=False):
+    """
+    Return the DFT of a list of complex values of any length, using Bluestein's
+    algorithm on top of the radix-2 FFT when the length is not a power of two.
+    """
+    n = len(values)
+    if n & (n - 1) == 0:
+        return _fft(list(values), inverse)
+
+    # jk = (j*j + k*k - (k - j)**2) / 2 turns the DFT into a convolution with a chirp
+    sign = 1 if inverse else -1
+    chirp = [cmath.exp(sign * 1j * math.pi * (k * k % (2 * n)) / n) for k in range(n)]
+    m = _next_pow2(2 * n - 1)
+
+    a = [v * c for v, c in zip(values, chirp)] + [0j] * (m - n)
+    b = [c.conjugate() for c in chirp]
+    b = b + [0j] * (m - 2 * n + 1) + b[:0:-1]
+
+    conv = _fft([u * v for u, v in zip(_fft(a), _fft(b))], inverse=True)
+    out = [conv[k] * chirp[k] for k in range(n)]
+    return [v / n for v in out] if inverse else out
+
+
+def _circular(signal, nfft):
+    """
+    Return the stored samples of a signal summed into nfft bins by their index modulo nfft,
+    so the DFT of the bins is the sum of x[n] * exp(-2j*pi*k*n/nfft) over every index n.
+    """
+    data, start = signal._data, signal._start
+    np = array_module()
+    if np is not None:
+        if len(data) > nfft:
+            # fold the samples into rows of nfft first
+            rows = -(-len(data) // nfft)
+            folded = np.zeros(rows * nfft, dtype=np.result_type(data, np.float64))
+            folded[:len(data)] = data
+            data = folded.reshape(rows, nfft).sum(axis=0)
+
+        # the first sample goes to bin start % nfft, the samples past the last bin wrap around
+        offset = start % nfft
+        split = min(nfft - offset, len(data))
+        bins = np.zeros(nfft, dtype=np.result_type(data, np.float64))
+        bins[offset:offset + split] = data[:split]
+        bins[:len(data) - split] = data[split:]
+        return bins
+
+    bins = [0j] * nfft
+    for k, value in enumerate(data):
+        bins[(start + k) % nfft] += value
+    return bins
+
+
+def fft(signal, nfft=None):
+    """
+    Return the nfft point DFT of a signal as a DigitalSignal indexed by the frequency bin k,
+    X[k] = sum over n of x[n] * exp(-2j*pi*k*n/nfft), with n the index of each sample so
+    negative indices get the right phase. nfft defaults to the length of the signal,
+    shorter transforms alias the samples.
+    """
+    if not isinstance(signal, DigitalSignal):
+        raise TypeError("The DFT is only supported for DigitalSignal objects.")
+
+    nfft = len(signal) if nfft is None else nfft
+    if not isinstance(nfft, int) or nfft < 1:
+        raise ValueError("nfft must be a positive integer.")
+
+    bins = _circular(signal, nfft)
+    np = array_module()
+    spectrum = np.fft.fft(bins) if np is not None else _dft(bins)
+    return DigitalSignal._wrap(asbuffer(spectrum, copy=False))
+
+
+def ifft(spectrum, origin=0, real=False):
+    """
+    Return the inverse DFT of the bins 0 through N-1 of a spectrum, N being one past
+    its last index, as the samples at the indices origin through origin + N - 1.
+    real keeps only the real part, for the spectrum of a real signal.
+    """
+    if not isinstance(spectrum, DigitalSignal):
+        raise TypeError("The inverse DFT is only supported for DigitalSignal objects.")
+
+    nfft = spectrum.shape()[1] + 1
+    bins = spectrum.view(0, nfft)._data
+
+    np = array_module()
+    if np is not None:
+        values = np.roll(np.fft.ifft(bins), -(origin % nfft))
+        values = values.real.copy() if real else values
+    else:
+        values = _dft([complex(v) for v in bins], inverse=True)
+        values = values[origin % nfft:] + values[:origin % nfft]
+        values = pack([v.real for v in values] if real else values)
+
+    return DigitalSignal._wrap(values, origin)
+
+
+dft = fft
+
+
+def dtft(signal, omega):
+    """
+    Return the DTFT of a signal, X(w) = sum over n of x[n] * exp(-1j*w*n), at every
+    angular frequency in omega, or at the omega grid points 2*pi*k/omega when omega is
+    an integer. Returned as a NumPy array, a list without NumPy.
+    """
+    if not isinstance(signal, DigitalSignal):
+        raise TypeError("The DTFT is only supported for DigitalSignal objects.")
+
+    if isinstance(omega, int):
+        # a uniform grid is exactly the DFT of the samples aliased into omega bins
+        return fft(signal, omega)._data
+
+    data, start = signal._data, signal._start
+    np = array_module()
+    if np is not None:
+        omega = np.asarray(omega, dtype=np.float64).reshape(-1)
+        out = np.zeros(len(omega), dtype=np.complex128)
+        if not len(data):
+            return out
+
+        # one block of phasors serves every block of samples, each block adds its own starting phase
+        block = min(max(_DTFT_BLOCK // max(len(omega), 1), 1), len(data))
+        phasors = np.exp(-1j * np.outer(omega, np.arange(block)))
+        for first in range(0, len(data), block):
+            part = data[first:first + block]
+            out += np.exp(-1j * omega * (start + first)) * (phasors[:, :len(part)] @ part)
+        return out
+
+    # Horner's rule in z = exp(-1j*w) over the samples, then the phase of the first index
+    out = []
+    for w in omega:
+        z = cmath.exp(-1j * w)
+        total = 0j
+        for value in reversed(data):
+            total = total * z + value
+        out.append(total * cmath.exp(-1j * w * start))
+    return out
+
+
+def window(name, n):
+    """
+    Return the periodic window of n samples with the given name, one of WINDOWS,
+    as used for spectral estimates. Returned as a NumPy array, a list without NumPy.
+    """
+    if name not in WINDOWS:
+        raise ValueError(f"window must be one of {', '.join(WINDOWS)}.")
+
+    np = array_module()
+    key = (name, n, np is not None)
+    shape = _WINDOWS.pop(key, None)
+    if shape is None:
+        coefficients = {'boxcar': (1.0,), 'hann': (0.5, 0.5), 'hamming': (0.54, 0.46),
+                        'blackman': (0.42, 0.5, 0.08)}[name]
+        if np is not None:
+            phase = 2 * np.pi * np.arange(n) / n
+            shape = sum((-1) ** k * c * np.cos(k * phase) for k, c in enumerate(coefficients))
+        else:
+            shape = [sum((-1) ** k * c * math.cos(2 * math.pi * k * i / n) for k, c in enumerate(coefficients))
+                     for i in range(n)]
+        if len(_WINDOWS) >= _WINDOW_CACHE_SIZE:
+            del _WINDOWS[next(iter(_WINDOWS))]
+
+    _WINDOWS[key] = shape
+    return shape
+
+
+def _segments(signal, segment, overlap, taper, nfft):
+    """
+    Check the segmentation arguments and return the stored samples, the segment length,
+    hop, window and transform length to use.
+    """
+    if not isinstance(signal, DigitalSignal):
+        raise TypeError("Spectral estimates are only supported for DigitalSignal objects.")
+
+    data = signal._data
+    if not len(data):
+        raise ValueError("The signal has no samples.")
+
+    if not isinstance(segment, int) or segment < 1:
+        raise ValueError("segment must be a positive integer.")
+    segment = min(segment, len(data))
+
+    overlap = segment // 2 if overlap is None else overlap
+    if not isinstance(overlap, int) or not 0 <= overlap < segment:
+        raise ValueError("overlap must be an integer from 0 up to the segment length.")
+
+    if isinstance(taper, str):
+        taper = window(taper, segment)
+    elif len(taper) != segment:
+        raise ValueError("A window given as samples must be as long as the segment.")
+
+    nfft = segment if nfft is None else nfft
+    if not isinstance(nfft, int) or nfft < segment:
+        raise ValueError("nfft must be an integer no smaller than the segment length.")
+
+    return data, segment, segment - overlap, taper, nfft
+
+
+def _frequencies(nfft, fs, onesided):
+    """
+    Return the frequencies of the bins kept by a spectral estimate, in the order of the DFT bins.
+    """
+    count = nfft // 2 + 1 if onesided else nfft
+    values = [(k if k < (nfft + 1) // 2 or onesided else k - nfft) * fs / nfft for k in range(count)]
+    np = array_module()
+    return np.array(values) if np is not None else values
+
+
+def _power(data, first, count, segment, hop, taper, nfft, onesided):
+    """
+    Return the squared magnitude spectra of count windowed segments, starting with the
+    segment at sample first, as rows of a NumPy array or a list of lists.
+    """
+    np = array_module()
+    if np is not None:
+        frames = np.lib.stride_tricks.sliding_window_view(data, segment)[first:first + count * hop:hop]
+        spectra = np.fft.rfft(frames * taper, nfft) if onesided else np.fft.fft(frames * taper, nfft)
+        return spectra.real ** 2 + spectra.imag ** 2
+
+    rows = []
+    for k in range(first, first + count * hop, hop):
+        values = [complex(v * w) for v, w in zip(data[k:k + segment], taper)] + [0j] * (nfft - segment)
+        spectrum = _dft(values)
+        rows.append([abs(v) ** 2 for v in spectrum[:nfft // 2 + 1 if onesided else nfft]])
+    return rows
+
+
+def _scaling(taper, nfft, fs, onesided):
+    """
+    Return the factor of every bin that turns a squared magnitude into a power spectral density.
+    """
+    scale = 1 / (fs * sum(w * w for w in taper))
+    if not onesided:
+        return [scale] * nfft
+
+    # the power of the negative frequencies is folded onto the positive ones
+    factors = [2 * scale] * (nfft // 2 + 1)
+    factors[0] = scale
+    if nfft % 2 == 0:
+        factors[-1] = scale
+    return factors
+
+
+def welch(signal, segment=256, overlap=None, window='hann', nfft=None, fs=1.0):
+    """
+    Return the frequencies and the power spectral density of a signal estimated with
+    Welch's method: the average of the periodograms of segments of the stored samples,
+    overlapping by overlap samples (half a segment by default) and tapered by window,
+    one of WINDOWS or a sequence of segment samples. Real signals get a one-sided
+    estimate, complex ones a two-sided estimate in the order of the DFT bins.
+    Returned as NumPy arrays, lists without NumPy.
+    """
+    data, segment, hop, taper, nfft = _segments(signal, segment, overlap, window, nfft)
+    onesided = kind(data) != 'c'
+    count = (len(data) - segment) // hop + 1
+
+    np = array_module()
+    if np is not None:
+        taper = np.asarray(taper)
+        total = np.zeros(nfft // 2 + 1 if onesided else nfft)
+        for first in range(0, count, _SEGMENT_BLOCK):
+            rows = min(_SEGMENT_BLOCK, count - first)
+            total += _power(data, first * hop, rows, segment, hop, taper, nfft, onesided).sum(axis=0)
+        psd = total * np.asarray(_scaling(taper, nfft, fs, onesided)) / count
+    else:
+        rows = _power(data, 0, count, segment, hop, taper, nfft, onesided)
+        psd = [sum(column) * factor / count for column, factor in zip(zip(*rows), _scaling(taper, nfft, fs, onesided))]
+
+    return _frequencies(nfft, fs, onesided), psd
+
+
+def spectrogram(signal, segment=256, overlap=None, window='hann', nfft=None, fs=1.0):
+    """
+    Return the frequencies, times and power spectral density of every segment of the
+    stored samples, segmented and scaled as in welch. The time of a segment is the index
+    of its middle sample divided by fs, so it follows the origin of the signal. The
+    densities are a NumPy array with one row per frequency and one column per segment,
+    a list of rows without NumPy.
+    """
+    data, segment, hop, taper, nfft = _segments(signal, segment, overlap, window, nfft)
+    onesided = kind(data) != 'c'
+    count = (len(data) - segment) // hop + 1
+    times = [(signal._start + k * hop + (segment - 1) / 2) / fs for k in range(count)]
+
+    np = array_module()
+    if np is not None:
+        taper = np.asarray(taper)
+        power = _power(data, 0, count, segment, hop, taper, nfft, onesided)
+        power = (power * np.asarray(_scaling(taper, nfft, fs, onesided))).T
+        return _frequencies(nfft, fs, onesided), np.array(times), power
+
+    rows = _power(data, 0, count, segment, hop, taper, nfft, onesided)
+    factors = _scaling(taper, nfft, fs, onesided)
+    power = [[value * factor for value in column] for column, factor in zip(zip(*rows), factors)]
+    return _frequencies(nfft, fs, onesided), times, power
@@ -0,0 +1,188 @@
+"""
+Benchmarks for the DigitalSignal operators and ShiftRegister.
+
+Every case is timed best-of-n and its peak memory is traced once. Results can
+be saved as a baseline, later runs fail when a case is slower or uses more
+memory than the baseline by more than the threshold.
+
+    python benchmarks/run_benchmarks.py --save            # record a baseline
+    python benchmarks/run_benchmarks.py                   # compare against it
+    python benchmarks/run_benchmarks.py --quick -k conv   # a subset of the cases
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from DigitalSignal import DigitalSignal, E, ShiftRegister
+from DigitalSignal.backend import get_backend, set_backend
+
+
+LENGTHS = (1000, 100000, 1000000)
+QUICK_LENGTHS = (1000, 10000)
+ORIGINS = ('first', 'middle', 'last')
+DTYPES = ('real', 'complex')
+KERNELS = (8, 256, 4096)
+DEGREES = (10, 20)
+
+# the operators timed on every signal x, y is a second signal of the same length
+OPERATIONS = {
+    'shift': lambda x, y: x(5),
+    'fold': lambda x, y: ~x,
+    'add': lambda x, y: x + y,
+    'sub': lambda x, y: x - y,
+    'accumulate': lambda x, y: DigitalSignal([0]).accumulate(x, 0.5, 3).accumulate(y, 0.5, -3),
+    'scale': lambda x, y: x * 3,
+    'modulate': lambda x, y: x * E(0.1j),
+    'eq': lambda x, y: x == y,
+    'round': lambda x, y: x.round(3),
+    'slice': lambda x, y: x[:],
+    'conjugate': lambda x, y: x.complex_conjugate(),
+}
+
+# the operators timed with every kernel h no longer than x
+KERNEL_OPERATIONS = {
+    'conv': lambda x, h: x @ h,
+    'corr': lambda x, h: x % h,
+}
+
+# memory differences below this many bytes are treated as noise
+_MEMORY_SLACK = 64 * 1024
+
+
+def make_signal(length, origin, dtype, seed=1):
+    """
+    Return a signal of pseudo-random samples whose zero index is its first, middle or last sample.
+    """
+    values, state = [], seed
+    for _ in range(length):
+        state = (1103515245 * state + 12345) % 2 ** 31
+        values.append(state / 2 ** 30 - 1)
+
+    if dtype == 'complex':
+        values = [complex(v, values[-k - 1]) for k, v in enumerate(values)]
+
+    zero = {'first': 0, 'middle': length // 2, 'last': length - 1}[origin]
+    values[zero] = [values[zero]]
+    return DigitalSignal(values)
+
+
+def cases(lengths, keyword=''):
+    """
+    Yield the name, number of samples processed and function of every benchmark case
+    whose name contains keyword. Signals are only built for the cases that are run.
+    """
+    for n in lengths:
+        for origin in ORIGINS:
+            for dtype in DTYPES:
+                tag = f"n={n},origin={origin},dtype={dtype}"
+                selected = [(f"{op}[{tag}]", func) for op, func in OPERATIONS.items() if keyword in f"{op}[{tag}]"]
+                kernels = [(m, [(f"{op}[{tag},kernel={m}]", func) for op, func in KERNEL_OPERATIONS.items()
+                                if keyword in f"{op}[{tag},kernel={m}]"]) for m in KERNELS if m <= n]
+                kernels = [(m, ops) for m, ops in kernels if ops]
+                if not selected and not kernels:
+                    continue
+
+                x = make_signal(n, origin, dtype)
+                y = make_signal(n, origin, dtype, seed=2)
+                for name, func in selected:
+                    yield name, n, lambda x=x, y=y, func=func: func(x, y)
+
+                for m, ops in kernels:
+                    h = make_signal(m, origin, dtype, seed=3)
+                    for name, func in ops:
+                        yield name, n, lambda x=x, h=h, func=func: func(x, h)
+
+        for degree in DEGREES:
+            name = f"shift_register[n={n},degree={degree}]"
+            if keyword in name:
+                yield name, n, lambda n=n, d=degree: ShiftRegister(d)(n)
+
+
+def measure(func, min_time):
+    """
+    Return the best time of repeated calls lasting at least min_time in total, and the peak traced memory of one call.
+    """
+    func()
+
+    best, total, runs = float('inf'), 0.0, 0
+    while total < min_time or runs < 3:
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        total += elapsed
+        runs += 1
+
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return best, peak
+
+
+def compare(results, baseline, threshold):
+    """
+    Return a description of every case that regressed against the baseline by more than threshold.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        old = baseline[name]
+
+        if result['seconds'] > old['seconds'] * (1 + threshold):
+            regressions.append(f"{name}: {old['seconds'] * 1e3:.3f} ms -> {result['seconds'] * 1e3:.3f} ms")
+
+        grown = result['peak_bytes'] - old['peak_bytes']
+        if grown > _MEMORY_SLACK and result['peak_bytes'] > old['peak_bytes'] * (1 + threshold):
+            regressions.append(f"{name}: {old['peak_bytes']} B -> {result['peak_bytes']} B peak memory")
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backend', choices=('numpy', 'array'), default=get_backend())
+    parser.add_argument('--baseline', help="baseline file, default benchmarks/baseline-<backend>.json")
+    parser.add_argument('--save', action='store_true', help="store the results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.25, help="allowed relative slowdown, default 0.25")
+    parser.add_argument('--min-time', type=float, default=0.05, help="seconds spent timing each case")
+    parser.add_argument('--quick', action='store_true', help="only sweep the short signal lengths")
+    parser.add_argument('-k', dest='keyword', default='', help="only run cases whose name contains this")
+    args = parser.parse_args(argv)
+
+    set_backend(args.backend)
+    path = args.baseline or os.path.join(os.path.dirname(__file__), f"baseline-{args.backend}.json")
+
+    results = {}
+    for name, samples, func in cases(QUICK_LENGTHS if args.quick else LENGTHS, args.keyword):
+        seconds, peak = measure(func, args.min_time)
+        results[name] = {'seconds': seconds, 'samples_per_second': samples / seconds, 'peak_bytes': peak}
+        print(f"{name:70s} {seconds * 1e3:10.3f} ms {samples / seconds:14.0f} samples/s {peak:12d} B")
+
+    if args.save:
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+        print(f"saved {len(results)} results to {path}")
+        return 0
+
+    if not os.path.exists(path):
+        print(f"no baseline at {path}, run with --save to record one")
+        return 0
+
+    with open(path) as f:
+        regressions = compare(results, json.load(f), args.threshold)
+
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
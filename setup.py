@@ -20,4 +20,7 @@ setup(
     install_requires=[
         'pytest'
     ],
+    extras_require={
+        'numpy': ['numpy'],
+    },
 )
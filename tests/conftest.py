@@ -3,3 +3,20 @@ import os
 
 # Add the root directory to sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from DigitalSignal.backend import get_backend, set_backend
+
+
+@pytest.fixture(params=['numpy', 'array'])
+def backend(request):
+    """
+    Run a test once with each storage engine.
+    """
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+
+    default = get_backend()
+    set_backend(request.param)
+    yield request.param
+    set_backend(default)
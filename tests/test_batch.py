@@ -0,0 +1,58 @@
+import pytest
+from DigitalSignal import DigitalSignal as DS, SignalBatch
+
+pytest.importorskip('numpy')
+
+
+def signals():
+    return [DS([1, [2], 3]), DS([[4], -1]), DS([2, 0, 1, [5], 1j])]
+
+
+def test_batch_round_trip(backend):
+    batch = SignalBatch.from_signals(signals())
+    assert len(batch) == 3
+    assert batch.shape() == (-3, 1)
+
+    for row, signal in zip(batch.to_signals(), signals()):
+        assert row.shape() == signal.shape()
+        assert row[:] == signal[:]
+
+    # a row keeps its own support, so shifting it back to index 0 leaves no padding
+    shifted = [DS([[1]])(-3), DS([[1], 2])(-2)]
+    rows = SignalBatch.from_signals(shifted)(3).to_signals()
+    assert [row.shape() for row in rows] == [signal(3).shape() for signal in shifted] == [(0, 0), (-1, 0)]
+
+
+def test_batch_operators(backend):
+    batch = SignalBatch.from_signals(signals())
+    kernel = DS([1, [-2], 1])
+
+    checks = [
+        (batch(2), lambda x: x(2)),
+        (~batch, lambda x: ~x),
+        (batch.complex_conjugate(), lambda x: x.complex_conjugate()),
+        (batch * 3, lambda x: x * 3),
+        (batch + kernel, lambda x: x + kernel),
+        (batch - kernel, lambda x: x - kernel),
+        (batch @ kernel, lambda x: x @ kernel),
+        (batch.convolve(kernel, 'fft').round(), lambda x: (x @ kernel).round()),
+        (batch % kernel, lambda x: x % kernel),
+        (batch.correlate(kernel, max_lag=1), lambda x: x.correlate(kernel, max_lag=1)),
+    ]
+    for result, expected in checks:
+        for row, signal in zip(result, signals()):
+            assert row.shape() == expected(signal).shape()
+            assert row[:] == pytest.approx(expected(signal)[:])
+
+
+def test_batch_of_kernels():
+    batch = SignalBatch.from_signals(signals()[:2])
+    kernels = SignalBatch.from_signals([DS([1, [1]]), DS([[2], 0, -1])])
+
+    for method in ('direct', 'fft'):
+        rows = batch.convolve(kernels, method).to_signals()
+        assert rows[0][:] == (signals()[0] @ DS([1, [1]]))[:]
+        assert rows[1][:] == (signals()[1] @ DS([[2], 0, -1]))[:]
+
+    with pytest.raises(ValueError):
+        SignalBatch.from_signals(signals()) @ kernels
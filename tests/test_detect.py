@@ -0,0 +1,84 @@
+import random
+import pytest
+from DigitalSignal import DigitalSignal as DS, MatchedFilterDetector, ShiftRegister, cfar_scale, detect
+
+BARKER = [1, 1, 1, 1, 1, -1, -1, 1, 1, -1, 1, -1, 1]
+
+
+def _noisy(positions, template, length=2000, sigma=0.2):
+    random.seed(7)
+    x = [random.gauss(0, sigma) for _ in range(length)]
+    for pos in positions:
+        for k, value in enumerate(template):
+            x[pos + k] += value
+    return x
+
+
+def _signal(samples):
+    return DS([[samples[0]]] + samples[1:])
+
+
+def _local_peaks(x, t, threshold):
+    # every lag whose magnitude reaches threshold and tops its neighbours
+    r = x % t
+    start, stop = r.shape()
+    mags = [abs(r[n]) for n in range(start - 1, stop + 2)]
+    return [(start + i - 1, r[start + i - 1]) for i in range(1, len(mags) - 1)
+            if mags[i] >= threshold and mags[i] > mags[i - 1] and mags[i] >= mags[i + 1]]
+
+
+def test_fixed_threshold(backend):
+    x = _signal(_noisy([50, 700, 1500], BARKER))
+    b = DS(BARKER)
+
+    found = detect(x, b, threshold=8, block=64)
+    assert [lag for lag, _, _ in found] == [50, 700, 1500]
+    assert [(lag, value) for lag, _, value in found] == _local_peaks(x, b, 8)
+    assert all(value == pytest.approx(13, abs=2) for _, _, value in found)
+
+    # the lag locates the template start through its origin
+    assert [lag + 3 for lag, _, _ in detect(x, b(-3), threshold=8)] == [50, 700, 1500]
+
+
+def test_cfar(backend):
+    x = _signal(_noisy([300, 1200], BARKER, sigma=0.1))
+    found = detect(x, DS(BARKER), guard=3, train=20, scale=30)
+    assert [lag for lag, _, _ in found] == [300, 1200]
+
+    assert cfar_scale(16, 1e-6) == pytest.approx(32 * (1e6 ** (1 / 32) - 1))
+    with pytest.raises(ValueError):
+        MatchedFilterDetector(DS(BARKER), train=0)
+
+
+def test_template_bank(backend):
+    codes = [ShiftRegister(5, taps)(31) for taps in ((5, 3), (5, 4, 3, 2))]
+    samples = [0.0] * 600
+    for code, pos in zip(codes, (100, 400)):
+        for k in range(31):
+            samples[pos + k] += code[k]
+
+    found = detect(_signal(samples), codes, threshold=25)
+    assert [(lag, template) for lag, template, _ in found] == [(100, 0), (400, 1)]
+
+
+def test_distance(backend):
+    x = DS([[0], 0, 5, 0, 4, 0, 0, 0, 3])
+    one = DS([1])
+
+    assert [lag for lag, _, _ in detect(x, one, threshold=1)] == [2, 4, 8]
+    assert [lag for lag, _, _ in detect(x, one, threshold=1, distance=2)] == [2, 8]
+
+
+def test_streaming_matches_detect(backend):
+    samples = _noisy([20, 333, 990, 1975], BARKER)
+    bank = [DS(BARKER), DS([1, [-1], 1, -1])]
+    expected = detect(_signal(samples), bank, guard=2, train=8, scale=12, block=100)
+
+    detector = MatchedFilterDetector(bank, guard=2, train=8, scale=12, block=37)
+    found = []
+    for i in range(0, len(samples), 123):
+        found += detector.push(samples[i:i + 123])
+    found += detector.flush()
+
+    assert found == expected
+    assert len(detector._taps) == 2 and detector._history is None
@@ -1,5 +1,7 @@
 import pytest
-from DigitalSignal import DigitalSignal as DS, E, PI, cconj
+from array import array
+from DigitalSignal import (DigitalSignal as DS, E, PI, cconj, clear_kernel_cache, convolve, correlate, kernel_cache_info,
+                           set_kernel_cache)
 
 def test_signal_empty_initialization():
     signal = DS()
@@ -113,4 +115,560 @@ def test_e_pi_no_rounding():
 def test_e_pi_rounding():
     callable_op = E(1j*PI, ndigits=6)
 
-    assert callable_op(2) == callable_op(8)  
\ No newline at end of file
+    assert callable_op(2) == callable_op(8)  
+
+
+def test_backend_zero_padding(backend):
+    signal = DS([1, 2, [3], 4, 5])
+
+    assert signal[-3] == 0
+    assert signal[3] == 0
+    assert signal[-10:10:3] == [0, 0, 0, 2, 5, 0, 0]
+    assert signal[10:-10:-3] == [0, 0, 0, 4, 1, 0, 0]
+    assert signal[::-1] == [5, 4, 3, 2, 1]
+    assert signal.shape() == (-2, 2)
+
+
+def test_backend_set_item_overwrites(backend):
+    signal = DS([1, 2, 3])
+
+    signal[0] = 5
+    signal[-2] = 7.5
+
+    assert signal[:] == [7.5, 0, 5, 2, 3]
+    assert repr(signal) == "DigitalSignal(7.5 0.0 [5.0] 2.0 3.0)"
+
+
+def test_backend_set_item_big_integers(backend):
+    signal = DS([1])
+
+    signal[0] = 2 ** 70
+    signal[2] = 3
+    assert signal.dtype == 'object'
+    assert signal[:] == [2 ** 70, 0, 3]
+
+    real = DS([1.5])
+    real[0] = 2 ** 70
+    assert real.dtype == 'float64' and real[0] == 2.0 ** 70
+
+
+def test_backend_operators(backend):
+    signal = DS([1, 2, [3], 4, 5])
+
+    assert (signal + signal(2))[:] == [1, 2, 4, 6, 8, 4, 5]
+    assert (signal * 1j).complex_conjugate()[:] == [-1j, -2j, -3j, -4j, -5j]
+    assert (~signal(-7)).shape() == (-9, 0)
+    assert DS([1.5 + 0.2j, [2.4]]).round()[:] == [2.0, 2.0]
+
+
+def test_convolution():
+    signal = DS([0, 1, 2, 3])
+    h = DS([1, 1])
+    d = DS([1])
+
+    assert (signal @ h)[:] == [0, 1, 3, 5, 3]
+    assert signal(2) == signal @ d(2)
+    assert (signal @ d(2)).shape() == (-2, 3)
+
+
+@pytest.mark.parametrize('method', ['direct', 'fft', 'overlap-add', 'auto'])
+def test_convolution_methods(backend, method):
+    signal = DS([3, -1, [2], 5, 0, 4, -2, 1] * 40)
+    h = DS([1, [-2], 3, 1, 1, -1, 2])
+
+    expected = convolve(signal, h, method='direct')
+    result = convolve(signal, h, method=method)
+
+    assert result.shape() == expected.shape()
+    assert result[:] == expected[:]
+    assert all(isinstance(value, int) for value in result[:])
+
+
+def test_correlation():
+    barker = DS([1, 1, 1, -1, 1])
+
+    assert (barker % barker)[:] == [1, 0, 1, 0, 5, 0, 1, 0, 1]
+    assert (barker % barker).shape() == (-4, 4)
+    assert correlate(barker, barker, max_lag=2)[:] == [1, 0, 5, 0, 1]
+    assert correlate(barker, barker, normalize='coeff')[0] == 1.0
+    assert correlate(barker, barker, max_lag=1, normalize='unbiased')[:] == [0.0, 1.0, 0.0]
+
+
+@pytest.mark.parametrize('method', ['direct', 'fft'])
+def test_correlation_lag_window(backend, method):
+    signal = DS([1j, 2, [3 - 1j], 0, 4, -2j, 1] * 20)
+    template = DS([1, -1j, [2], 1])
+
+    expected = signal @ ~cconj(template)
+    result = signal.correlate(template, max_lag=6, method=method)
+
+    assert result.shape() == (-6, 6)
+    for lag in range(-6, 7):
+        assert abs(result[lag] - expected[lag]) < 1e-9
+
+
+def test_kernel_cache(backend):
+    clear_kernel_cache()
+    signal = DS([3, -1, [2], 5, 0, 4, -2, 1] * 40)
+    h = DS([1, [-2], 3, 1, 1, -1, 2])
+
+    for x in (signal, signal(3), signal):
+        assert convolve(x, h, method='fft')[:] == convolve(x, h, method='direct')[:]
+    info = kernel_cache_info()
+    assert (info['hits'], info['misses'], info['entries']) == (2, 1, 1)
+
+    # the spectrum belongs to the kernel contents, a changed kernel misses
+    h[0] = 7
+    assert convolve(signal, h, method='fft')[:] == convolve(signal, h, method='direct')[:]
+    assert kernel_cache_info()['misses'] == 2
+
+    # correlations keep the conjugated spectrum
+    assert signal.correlate(h, 3, method='fft')[:] == signal.correlate(h, 3, method='direct')[:]
+    assert kernel_cache_info()['entries'] == 3
+
+    clear_kernel_cache(h)
+    assert kernel_cache_info()['entries'] == 1
+
+    set_kernel_cache(0)
+    try:
+        assert convolve(signal, DS([1, 2]), method='fft') == convolve(signal, DS([1, 2]), method='direct')
+        assert kernel_cache_info()['entries'] == 0
+    finally:
+        set_kernel_cache(32 << 20)
+        clear_kernel_cache()
+
+
+def test_time_shift_copy_on_write(backend):
+    signal = DS([1, [2], 3])
+    shifted = signal(-2)
+    folded = ~signal
+
+    shifted[2] = 10
+    folded[0] = 20
+    signal[1] = 30
+
+    assert signal[:] == [1, 2, 30]
+    assert shifted[:] == [0, 1, 10, 3]
+    assert folded[:] == [3, 20, 1]
+    assert (~signal(-2))[:] == [30, 2, 1, 0]
+    assert (2*signal - signal(-4))[:] == [2, 4, 60, 0, -1, -2, -30]
+
+
+def test_vectorized_exponential(backend):
+    from DigitalSignal.helpers import TOLERANCE
+
+    for e in (E(1j*PI), E(-0.3j), E(1j*PI/2, ndigits=3)):
+        values = e.evaluate(-1500, 5000)
+        assert len(values) == 5000
+        assert all(abs(v - e(n)) <= TOLERANCE for n, v in zip(range(-1500, 3500), values))
+
+    # far from the zero index as well
+    for e in (E(0.3j), E(2.7j), E(1j*PI)):
+        for first in (10**6, 5 * 10**6, 10**7 - 100):
+            values = e.evaluate(first, 200)
+            assert all(abs(v - e(n)) <= TOLERANCE for n, v in zip(range(first, first + 200), values))
+
+    x = DS([1, 2, [3], 4])
+    expected = [v * E(0.7j)(n) for n, v in zip(range(-2, 2), x[-2:2])]
+    assert (x * E(0.7j))[-2:2] == pytest.approx(expected, abs=TOLERANCE)
+
+    # only E is evaluated as a whole, a signal is not a scalar
+    for other in (x, x.lazy()):
+        with pytest.raises(TypeError):
+            x * other
+
+
+def test_file_round_trip(backend, tmp_path):
+    path = str(tmp_path / 'capture.iq')
+
+    for x, dtype in [(DS([3, -2, [1], 4]), None), (DS([[1.5], -2.25]), 'float32'),
+                     (DS([1+2j, [-3j], 0.5]), 'complex64'), (DS([[1.4+2.6j], -3]), 'cint16')]:
+        x.to_file(path, dtype)
+        y = DS.from_file(path)
+        assert y.shape() == x.shape()
+        assert y[:] == pytest.approx(x.round()[:] if dtype == 'cint16' else x[:])
+
+    # writing to a mapped signal leaves the file untouched
+    y[0] = 7
+    assert DS.from_file(path)[0] == 1+3j
+
+
+def test_file_narrow_integers(backend, tmp_path):
+    import warnings
+    path = str(tmp_path / 'chips.raw')
+    x = DS([[1], -2, 100], dtype='int8')
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        for dtype in ('int16', 'int32', 'int64'):
+            x.to_file(path, dtype)
+            assert DS.from_file(path, dtype)[:] == [1, -2, 100]
+
+    DS([[40000], -40000]).to_file(path, 'int16')
+    assert DS.from_file(path, 'int16')[:] == [32767, -32768]
+
+
+def test_from_buffer(backend):
+    import struct
+
+    x = DS.from_buffer(struct.pack('<4h', 1, -2, 300, 4), 'int16', origin=-1)
+    assert x[-1:3] == [1, -2, 300, 4]
+    assert (x @ DS([[1], 1]))[:] == [1, -1, 298, 304, 4]
+
+    z = DS.from_buffer(struct.pack('<4f', 1, 2, -0.5, 0), 'complex64')
+    assert z[:] == [1+2j, -0.5]
+
+    with pytest.raises(ValueError):
+        DS.from_buffer(b'', 'int8')
+
+
+def test_lazy_expressions(backend):
+    x = DS([1, -2, [3], 4, 5j])
+    y = DS([[2], 7, -1])
+
+    for lazy, eager in [
+        (2 * x.lazy() - x.lazy()(-4), 2 * x - x(-4)),
+        (~x.lazy()(-2), ~x(-2)),
+        (x.lazy() + y - ~y(3) * 0.5, x + y - ~y(3) * 0.5),
+        (cconj(x.lazy()(1)) - x.lazy() + x.lazy(), cconj(x(1)) - x + x),
+        ((x.lazy() - y) @ y, (x - y) @ y),
+    ]:
+        result = lazy.evaluate()
+        assert result.shape() == eager.shape() == lazy.shape()
+        assert result[:] == eager[:]
+        assert all(lazy[n] == eager[n] for n in range(-8, 8))
+
+    # the expression keeps the samples it was built from
+    z = x.lazy()(1)
+    x[0] = 100
+    assert z[-1] == 3
+    assert repr(z) == "DigitalSignal((1+0j) (-2+0j) (3+0j) [(4+0j)] 5j)"
+
+
+def test_lazy_mixed_order(backend):
+    from DigitalSignal import SparseDigitalSignal
+
+    x = DS([1, -2, [3], 4])
+    y = DS([[2], 7, -1])
+    s = SparseDigitalSignal([0, 3], [5, -1])
+
+    for lazy, eager in [
+        (y + x.lazy(), y + x), (y - x.lazy(), y - x), (y @ x.lazy(), y @ x), (y % x.lazy(), y % x),
+        (s + x.lazy(), s + x), (s - x.lazy(), s - x), (s @ x.lazy(), s @ x), (s % x.lazy(), s % x),
+        (y - 2 * x.lazy()(1) + y, y - 2 * x(1) + y),
+    ]:
+        assert lazy.evaluate() == eager
+
+    with pytest.raises(TypeError):
+        x + [1, 2]
+
+
+def test_equality_checks_whole_support(backend):
+    x = DS([1, 2, [3], 4, 5])
+
+    # differences far out on either side used to go unchecked
+    for index in (-2, 2, 40, -40):
+        y = DS([1, 2, [3], 4, 5])
+        y[index] = 9
+        assert x != y
+        assert x.first_difference(y) == index
+
+    assert x == DS([0, 0, 1.0, 2, [3], 4, 5, 0])
+    assert x.equals(x(0))
+    assert x.first_difference(x) is None
+    assert DS([]) == DS([0])
+    assert x != "signal"
+
+
+def test_allclose(backend):
+    x = DS([1.0, [2.0], 3.0])
+    y = DS([1.0, [2.0 + 1e-9], 3.0, 1e-10])
+
+    assert x != y
+    assert x.allclose(y)
+    assert not x.allclose(y, rtol=0, atol=1e-12)
+    assert x.first_difference(y, rtol=0, atol=1e-12) == 0
+    assert not DS([float('nan')]).allclose(DS([float('nan')]))
+
+
+def test_round_inplace(backend):
+    x = DS([1.26, [-0.5], 2.5 + 1e-14j])
+    y = x(0)
+
+    assert x.round(1, inplace=True) is x
+    assert x[:] == [1.3, -0.5, 2.5]
+    assert y[:] == [1.26, -0.5, 2.5 + 1e-14j]
+
+    assert x.round(inplace=True)[:] == [1, 0, 2]
+    assert all(isinstance(v, int) for v in x[:])
+
+
+def test_round_non_finite(backend):
+    for value in (float('nan'), float('inf'), -float('inf')):
+        x = DS([[1.5], value])
+        with pytest.raises(ValueError):
+            x.round()
+        with pytest.raises(ValueError):
+            x.round(inplace=True)
+        assert x.round(2)[0] == 1.5
+
+
+def test_quantize(backend):
+    x = DS([0.3, [-1.7], 5.0, 0.1 - 0.26j])
+
+    assert x.quantize(2)[:] == [0.25, -1.75, 5.0, 0.0 - 0.25j]
+    assert x.quantize(2, int_bits=1)[:] == [0.25, -1.75, 1.75, 0.0 - 0.25j]
+    assert DS([[300], -7]).quantize(0, int_bits=7)[:] == [127, -7]
+
+    z = x.quantize(1, inplace=True)
+    assert z is x and x[:] == [0.5, -1.5, 5.0, 0.0 - 0.5j]
+
+
+def test_snap(backend):
+    x = DS([1e-15, [1 + 1e-13j], -2e-13 + 3j])
+    snapped = x.snap()
+
+    assert snapped[:] == [0, 1, 3j]
+    assert all(isinstance(v, complex) for v in snapped[:])
+    assert x.snap(1e-16)[:] == x[:]
+
+
+def test_dtypes(backend):
+    x = DS([1, [2], 3], dtype='int8')
+    assert x.dtype == 'int8'
+    assert DS([1, 2.5]).dtype == 'float64'
+    assert DS([1j]).dtype == 'complex128'
+
+    # sums follow the NumPy promotion rules, Python scalars never widen a signal
+    f = DS([[0.5], 1.5], dtype='float32')
+    assert (x + x).dtype == 'int8'
+    assert (x + f).dtype == 'float32'
+    assert (x * 3).dtype == 'int8'
+    assert (x * 0.5).dtype == 'float64'
+    assert (f * 2.0).dtype == 'float32'
+    assert (x + DS([1], dtype='int32')).dtype == 'int32'
+    assert (f + DS([1], dtype='int32')).dtype == 'float64'
+
+    # products of integers are summed in 64 bits
+    chips = DS([100] * 50, dtype='int8')
+    assert (chips @ chips).dtype == 'int64'
+    assert (chips % chips)[0] == 500000
+    assert (f @ f).dtype == 'float32'
+
+    x[1] = 7
+    assert x.dtype == 'int8'
+    x[2] = 0.5
+    assert x.dtype == 'float64'
+
+
+def test_narrow_integers_widen(backend):
+    x = DS([[-101], 100], dtype='int8')
+
+    x += DS([[-100]], dtype='int8')
+    assert x.dtype == 'int64'
+    assert x[:] == [-201, 100]
+
+    y = DS([[1], 2], dtype='int8')
+    y[0] = 300
+    assert y.dtype == 'int64'
+    assert y[:] == [300, 2]
+
+    z = DS([[1], 2], dtype='int16')
+    z *= 3
+    assert z.dtype == 'int16'
+    z *= 20000
+    assert z.dtype == 'int64'
+    assert z[:] == [60000, 120000]
+
+
+def test_complex64(backend):
+    iq = DS([1 + 2j, [0.1 - 0.3j]], dtype='complex64')
+    f = DS([[0.5], 1.5], dtype='float32')
+
+    # complex64 only widens with int32, int64 or float64 operands
+    for result, expected in [(iq + f, [1 + 2j, 0.6 - 0.3j, 1.5]), (f * 1j, [0.5j, 1.5j]),
+                             (iq % iq, [-0.5 + 0.5j, 5.1, -0.5 - 0.5j])]:
+        assert result.dtype == 'complex64'
+        assert result[:] == pytest.approx(expected, rel=1e-6)
+
+    # samples are stored in single precision
+    assert iq[0] == complex(*array('f', [0.1, -0.3]))
+    assert (iq + DS([1], dtype='int32')).dtype == 'complex128'
+
+
+def test_int64_overflow_is_exact(backend):
+    big = 2 ** 62
+
+    for result, expected in [(DS([big]) + DS([big]), [2 ** 63]), (DS([big]) * 4, [2 ** 64]),
+                             (-DS([-2 ** 63]), [2 ** 63]), (DS([big]).accumulate(DS([big]), 3), [2 ** 64])]:
+        assert result.dtype == 'object'
+        assert result[:] == expected
+
+    # results that fit stay in 64 bits
+    assert (DS([big]) - DS([big])).dtype == 'int64'
+    assert (DS([0, 0], dtype='int8') * 2 ** 70).dtype == 'int8'
+
+    x = DS([big])
+    x += DS([big])
+    assert x.dtype == 'object' and x[0] == 2 ** 63
+
+
+def test_convolution_beyond_int64(backend):
+    big = 2 ** 62
+
+    for result, expected in [(DS([big]) @ DS([4]), [2 ** 64]), (DS([[big], 1]) % DS([-4]), [-2 ** 64, -4]),
+                             (DS([2 ** 70]) @ DS([1, 1]), [2 ** 70, 2 ** 70])]:
+        assert result.dtype == 'object'
+        assert result[:] == expected
+
+    # sums that fit, and empty operands, give the same type on both engines
+    assert (DS([2 ** 70]) @ DS([0])).dtype == 'int64'
+    assert (DS([big, big]) % DS([1, -1])).dtype == 'int64'
+    assert (DS([]) @ DS([1, 2])).dtype == 'int64'
+    assert (DS([]) % DS([1.5])).dtype == 'float64'
+
+
+def test_astype(backend):
+    x = DS([1.7, [-2.2], 3.0 + 1j])
+
+    assert x.astype('int16').dtype == 'int16'
+    assert x.astype('int16')[:] == [1, -2, 3]
+    assert x.astype('complex64').dtype == 'complex64'
+    assert x.astype('complex64')[-1] == pytest.approx(1.7)
+
+    with pytest.raises(ValueError):
+        x.astype('int4')
+
+
+def test_astype_out_of_range(backend):
+    for convert in (lambda: DS([300], dtype='int8'), lambda: DS([1.0, [-40000.5]]).astype('int16'),
+                    lambda: DS([2 ** 70]).astype('int64'), lambda: DS([2.0 ** 63]).astype('int64')):
+        with pytest.raises(OverflowError):
+            convert()
+
+    with pytest.raises(ValueError):
+        DS([float('nan')]).astype('int32')
+
+    # the fraction is dropped before the range is checked
+    assert DS([-128.9, [127.9]]).astype('int8')[:] == [-128, 127]
+
+
+def test_sample_types_kept(backend, tmp_path):
+    path = str(tmp_path / 'samples.raw')
+
+    for dtype in ('int16', 'float32'):
+        x = DS([1.25, [-2.5], 3.75]).astype(dtype)
+        assert x.round(1).dtype == dtype
+        assert x.quantize(1).dtype == dtype
+        assert x.quantize(1, int_bits=1).dtype == dtype
+
+        x.to_file(path, dtype)
+        assert DS.from_file(path, dtype).dtype == dtype
+
+    assert DS([1.25, [-2.5]], dtype='float32').round().dtype == 'int64'
+
+
+def test_constructor_keeps_data(backend):
+    data = [1, [2], 3]
+    x = DS(data)
+    assert data == [1, [2], 3]
+    assert x[0] == 2
+
+    with pytest.raises(TypeError):
+        DS([1, 'a'])
+    assert DS((4, [5]), validate=False)[:] == [4, 5]
+
+
+def test_from_array(backend):
+    values = array('q', range(5))
+
+    x = DS.from_array(values, origin=-2)
+    assert x.shape() == (-2, 2)
+    assert x[-2] == 0 and x[2] == 4
+
+    # writes copy the caller's samples first
+    x[0] = 10
+    assert values[2] == 2 and x[0] == 10
+
+    y = DS.from_array([1.5, 2.5], copy=True)
+    assert y[:] == [1.5, 2.5]
+    assert y.dtype == 'float64'
+
+
+def test_view(backend):
+    x = DS([1, 2, [3], 4, 5])
+
+    v = x.view(-1, 2)
+    assert v.shape() == (-1, 1)
+    assert v[-1] == 2 and v[1] == 4
+    assert x.view(1, 5)[1:5] == [4, 5, 0, 0]
+    assert x.view(3, -3, -2)[3:6] == [0, 4, 2]
+    assert x.view()[:] == x[:]
+    assert x.view(-4, 6, 3)[-4:0] == [0, 2, 5, 0]
+
+    # writing to a view leaves the signal unchanged
+    v[0] = 30
+    assert x[0] == 3
+
+    with pytest.raises(ValueError):
+        x.view(step=0)
+
+
+def test_frames(backend):
+    x = DS(list(range(1, 11)))
+
+    frames = list(x.frames(4, hop=3))
+    assert [frame[3 * k:3 * k + 4] for k, frame in enumerate(frames)] == \
+        [[1, 2, 3, 4], [4, 5, 6, 7], [7, 8, 9, 10], [10, 0, 0, 0]]
+    assert [frame[3 * k] for k, frame in enumerate(frames)] == [1, 4, 7, 10]
+
+
+def test_inplace_operators(backend):
+    x = DS([1, [2], 3])
+    alias = x
+    x += DS([[1], 1, 1])
+    assert x is alias
+    assert x[-1:3] == [1, 3, 4, 1]
+
+    x -= DS([5, [0]])
+    assert x[-1:3] == [-4, 3, 4, 1]
+    x *= 2
+    assert x[-1:3] == [-8, 6, 8, 2]
+    x *= 0.5
+    assert x.dtype == 'float64' and x[-1] == -4.0
+    x @= DS([[1], 1])
+    assert x[-1:4] == [-4.0, -1.0, 7.0, 5.0, 1.0]
+
+    with pytest.raises(TypeError):
+        x += 1
+
+
+def test_inplace_leaves_shared_samples(backend):
+    x = DS([1, [2], 3])
+    shifted = x(1)
+    folded = ~x
+    x += x
+    x *= 3
+    assert x[:] == [6, 12, 18]
+    assert shifted[-2:1] == [1, 2, 3]
+    assert folded[:] == [3, 2, 1]
+
+
+def test_accumulate(backend):
+    pulse = DS([[1], 2, 1])
+    echoes = [(0.5, 3), (-0.25, -2), (0.125, 40), (1, 0)]
+
+    out = DS([0])
+    for gain, delay in echoes:
+        out.accumulate(pulse, gain, -delay)
+
+    expected = DS([0])
+    for gain, delay in echoes:
+        expected = expected + pulse(-delay) * gain
+    assert out == expected
+    assert out.shape() == (-2, 42)
+
+    # adding a signal to itself reads its samples before they change
+    y = DS([[1], 2, 3])
+    y.accumulate(y, 1, -2)
+    assert y[:] == [1, 2, 4, 2, 3]
@@ -0,0 +1,77 @@
+import pytest
+from DigitalSignal import DigitalSignal as DS, StreamingFIR, lfilter, sosfilt
+
+@pytest.mark.parametrize('method', ['overlap-save', 'overlap-add'])
+def test_streaming_fir(backend, method):
+    x = DS([1, -2, 3, 0, 5, -1, 2, 2, -4, 1, 0, 3] * 30)
+    h = DS([1, [2], -1, 3])
+    fir = StreamingFIR(h, method)
+
+    output = []
+    for start in range(0, len(x), 37):
+        chunk = DS(x[start:min(start+37, len(x))])
+        result = fir.push(chunk)
+        assert len(result) == len(chunk)
+        output += result[:]
+    output += fir.flush()[:]
+
+    assert fir.start == -1
+    assert output == (x @ h)[:]
+
+
+def test_streaming_fir_float_chunks(backend):
+    h = DS([0.5, 0.25, 0.125])
+    fir = StreamingFIR(h)
+
+    first = fir.push([1.0, 0.0])
+    second = fir.push([0.0, 2.0])
+    tail = fir.flush()
+
+    assert first[:] + second[:] + tail[:] == [0.5, 0.25, 0.125, 1.0, 0.5, 0.25]
+
+
+def _difference_equation(b, a, x):
+    y = []
+    for n in range(len(x)):
+        value = sum(b[k] * x[n - k] for k in range(len(b)) if n - k >= 0)
+        value -= sum(a[k] * y[n - k] for k in range(1, len(a)) if n - k >= 0)
+        y.append(value / a[0])
+    return y
+
+
+def test_lfilter(backend):
+    x = DS([1.0, -2, 3, 0.5, 5, -1, 2, 2, -4, 1, 0, 3] * 200)
+    b, a = DS([0.2, 0.3, 0.1]), DS([1.0, -1.1, 0.5, -0.05])
+
+    y, zf = lfilter(b, a, x)
+    assert y.shape() == x.shape()
+    assert y[:] == pytest.approx(_difference_equation(b[:], a[:], x[:]))
+    assert len(zf) == 3
+
+    # the final state continues the filter on the next samples
+    first, state = lfilter(b, a, x[:1000])
+    second, _ = lfilter(b, a, x[1000:], zi=state)
+    assert first[:] + second[:] == pytest.approx(y[:])
+
+    # without feedback it is a convolution
+    assert lfilter(b, [2.0], x)[0][:] == pytest.approx((x @ b * 0.5)[:len(x)])
+
+
+def test_lfilter_complex(backend):
+    x = [1j, 2, -1, 0.5j] * 10
+    y, _ = lfilter([1, 0.5j], [1, -0.9j], x)
+    assert y[:] == pytest.approx(_difference_equation([1, 0.5j], [1, -0.9j], x))
+
+
+def test_sosfilt(backend):
+    x = DS([1.0, 0, 0, 0, 2, -1] * 50)
+    sos = [[0.1, 0.2, 0.1, 1.0, -1.2, 0.5], [1.0, -1.0, 0.0, 1.0, -0.3, 0.0]]
+
+    y, zf = sosfilt(sos, x)
+    cascade = lfilter(sos[1][:3], sos[1][3:], lfilter(sos[0][:3], sos[0][3:], x)[0])[0]
+    assert y[:] == pytest.approx(cascade[:])
+    assert [len(state) for state in zf] == [2, 2]
+
+    first, states = sosfilt(sos, x[:100])
+    second, _ = sosfilt(sos, x[100:], zi=states)
+    assert first[:] + second[:] == pytest.approx(y[:])
@@ -0,0 +1,51 @@
+import pytest
+from DigitalSignal import DigitalSignal as DS, correlate_many, parallel
+from DigitalSignal.parallel import PARALLEL_MIN, get_executor
+
+def long_signal(n, seed):
+    values, state = [], seed
+    for _ in range(n):
+        state = (1103515245 * state + 12345) % 2 ** 31
+        values.append(state % 201 - 100)
+    return DS(values)
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_parallel_convolution_is_identical(executor):
+    np = pytest.importorskip('numpy')
+    x = long_signal(PARALLEL_MIN + 12345, 1)
+    h = long_signal(700, 2)
+
+    serial = x @ h
+    with parallel(executor, workers=3):
+        assert get_executor() is not None
+        result = x @ h
+    assert get_executor() is None
+
+    assert result._data.dtype == serial._data.dtype
+    assert np.array_equal(result._data, serial._data)
+    assert result.shape() == serial.shape()
+
+
+def test_parallel_convolution_array_backend(backend):
+    x = long_signal(PARALLEL_MIN + 100, 3)
+    h = DS([1, [-2], 3])
+
+    serial = x @ h
+    with parallel('thread', workers=4):
+        result = h @ x
+    assert result.shape() == serial.shape()
+    assert result[:] == serial[:]
+
+
+@pytest.mark.parametrize('executor', [None, 'thread', 'process'])
+def test_correlate_many(backend, executor):
+    x = long_signal(3000, 4)
+    templates = [long_signal(31, seed) for seed in range(5, 9)]
+
+    with parallel(executor, workers=2):
+        results = correlate_many(x, templates, max_lag=40)
+
+    for result, template in zip(results, templates):
+        assert result.shape() == (-40, 40)
+        assert result[:] == x.correlate(template, max_lag=40)[:]
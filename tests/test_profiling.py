@@ -0,0 +1,43 @@
+import tracemalloc
+from DigitalSignal import DigitalSignal as DS, ShiftRegister, SparseDigitalSignal, profile
+
+def test_profile_records_operators(backend):
+    x, h = DS([1, 2, [3], 4]), DS([[1], -1])
+    matmul = DS.__matmul__
+    exported = []
+
+    with profile(hook=exported.append) as prof:
+        with profile() as inner:
+            y = x @ h
+        x % h
+        x[5] = 1
+        ShiftRegister(5)(31)
+
+    matmul_stats = prof.stats['DigitalSignal.__matmul__']
+    assert matmul_stats['calls'] == 1
+    assert matmul_stats['input_samples'] == 4 + 2
+    assert matmul_stats['output_samples'] == len(y) == 5
+    assert matmul_stats['output_bytes'] > 0
+    assert sum(matmul_stats['paths'].values()) == 1
+
+    assert prof.stats['DigitalSignal.__setitem__']['output_samples'] == 8
+    assert prof.stats['ShiftRegister.__call__']['output_samples'] == 31
+    assert list(inner.stats) == ['DigitalSignal.__matmul__']
+    assert exported == [prof.stats]
+    assert 'DigitalSignal.__mod__' in prof.report()
+
+    # the operators are only wrapped while a profile is active
+    assert DS.__matmul__ is matmul
+
+
+def test_profile_paths_and_memory(backend):
+    s = SparseDigitalSignal([0, 1000], [1, 2])
+    h = DS([1.0] * 64)
+
+    with profile(memory=True) as prof:
+        s @ h
+        DS([1.0] * 4096) @ h
+
+    assert prof.stats['SparseDigitalSignal.__matmul__']['paths'] == {'sparse': 1}
+    assert prof.stats['DigitalSignal.__matmul__']['allocated'] > 0
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,71 @@
+import pytest
+from DigitalSignal import DigitalSignal as DS, SignalBatch, StreamingResampler, downsample, resample, upsample
+
+def _naive(x, up, down, h):
+    return downsample(upsample(x, up) @ h, down)
+
+
+def test_upsample_downsample(backend):
+    x = DS([1, 2, [3], 4, 5])
+
+    y = upsample(x, 3)
+    assert y.shape() == (-6, 6)
+    assert y[-6:7] == [1, 0, 0, 2, 0, 0, 3, 0, 0, 4, 0, 0, 5]
+
+    z = downsample(x, 2)
+    assert z.shape() == (-1, 1)
+    assert z[:] == [1, 3, 5]
+    assert downsample(x(1), 2)[:] == [2, 4]
+    assert downsample(upsample(x, 4), 4) == x
+
+
+@pytest.mark.parametrize('up, down', [(1, 1), (3, 1), (1, 3), (3, 2), (2, 5), (4, 6)])
+def test_resample_matches_naive(backend, up, down):
+    x = DS([3, -1, 4, 1, [-5], 9, 2, -6, 5, 3, 5])
+    h = DS([1, 2, [3], -1, 2, 4, 1])
+
+    assert resample(x, up, down, h) == _naive(x, up, down, h)
+    assert resample(x(7), up, down, h) == _naive(x(7), up, down, h)
+
+
+def test_resample_default_filter(backend):
+    x = DS([1.0] * 400)
+
+    y = resample(x, 3, 2)
+    assert y[300] == pytest.approx(1.0, abs=1e-3)
+    assert y[-1] < 0.5 < y[0]
+    assert resample(x, 6, 4) == y
+
+    # resampling by a rate of one keeps the signal
+    assert resample(x, 5, 5).allclose(x)
+
+
+def test_resample_batch(backend):
+    if backend != 'numpy':
+        pytest.skip("SignalBatch requires NumPy")
+
+    signals = [DS([1, [2], 3]), DS([4, 5, 6, 7, [8]]), DS([[0.5], -1])]
+    h = DS([1, [2], 1])
+    batch = SignalBatch.from_signals(signals)
+
+    for up, down in [(2, 1), (1, 2), (3, 2)]:
+        rows = resample(batch, up, down, h).to_signals()
+        assert all(row == resample(signal, up, down, h) for row, signal in zip(rows, signals))
+    assert all(row == upsample(signal, 2) for row, signal in zip(upsample(batch, 2), signals))
+    assert all(row == downsample(signal, 2) for row, signal in zip(downsample(batch, 2), signals))
+
+
+@pytest.mark.parametrize('up, down', [(3, 2), (2, 3), (1, 4)])
+def test_streaming_resampler(backend, up, down):
+    x = DS([1, -2, 3, 0, 5, -1, 2, 2, -4, 1, 0, 3] * 20)
+    resampler = StreamingResampler(up, down)
+
+    output = []
+    for start in range(0, len(x), 23):
+        output += resampler.push(x[start:min(start + 23, len(x))])[:]
+    output += resampler.flush()[:]
+
+    expected = resample(x, up, down)
+    first, last = expected.shape()
+    assert resampler.start == first
+    assert output == pytest.approx(expected[first:last + 1])
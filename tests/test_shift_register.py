@@ -1,6 +1,5 @@
 
-import pytest
-from DigitalSignal import DigitalSignal as DS, ShiftRegister as SR
+from DigitalSignal import DigitalSignal as DS, ShiftRegister as SR, LFSR, gold_signals, kasami_signals
 
 def test_shift_register():
 
@@ -8,4 +7,73 @@ def test_shift_register():
     generated_signal = reg(15)
     known_signal = DS([-1, -1, -1, 1, 1, 1, 1, -1, 1, -1, 1, 1, -1, -1, 1])
 
-    assert generated_signal == known_signal
\ No newline at end of file
+    assert generated_signal == known_signal
+    assert len(generated_signal) == 15
+
+
+def test_shift_register_unipolar(backend):
+
+    reg = SR(4)
+
+    assert reg(15, bipolar=False)[:] == [0, 0, 0, 1, 1, 1, 1, 0, 1, 0, 1, 1, 0, 0, 1]
+
+
+def test_shift_register_chunks(backend):
+
+    reg = SR(7, taps=(7, 3))
+    chunks = [chunk[:] for chunk in reg.chunks(100, 1000)]
+
+    assert [len(chunk) for chunk in chunks] == [100] * 10
+    assert sum(chunks, []) == reg(1000)[:]
+
+
+def test_m_sequence_balance(backend):
+
+    # a primitive polynomial gives one more 1 than -1 per period
+    generated_signal = SR(10, taps=(10, 7))(1023)
+
+    assert sum(generated_signal[:]) == 1
+    assert generated_signal[:] == SR(10, taps=(10, 7))(2046)[1023:]
+
+
+def test_galois_form(backend):
+
+    fibonacci = LFSR((16, 14, 13, 11)).generate(1000)
+    galois = LFSR((16, 14, 13, 11), state=0xACE1, form='galois').generate(1000)
+
+    # both forms follow the same recurrence s[k] = s[k-16] ^ s[k-2] ^ s[k-3] ^ s[k-5]
+    for bits in (list(fibonacci), list(galois)):
+        assert all(bits[k] == bits[k-16] ^ bits[k-2] ^ bits[k-3] ^ bits[k-5] for k in range(16, 1000))
+
+
+def test_gold_codes(backend):
+
+    codes = gold_signals(degree=5)
+    assert len(codes) == 33
+
+    # cross-correlations of a Gold family only take the values -1, -t and t-2 with t = 9
+    a, b = codes[2][:], codes[7][:]
+    values = {sum(a[k] * b[(k+shift) % 31] for k in range(31)) for shift in range(31)}
+    assert values <= {-1, -9, 7}
+
+
+def test_kasami_codes(backend):
+
+    codes = kasami_signals((6, 1))
+
+    assert len(codes) == 8
+    assert all(len(code) == 63 for code in codes)
+
+
+def test_chip_arithmetic(backend):
+    chips = SR(4)(15)
+    assert chips.dtype == 'int64'
+    assert (chips * 200)[0] == -200
+    assert (chips * 100 + chips * 100)[:3] == [-200, -200, -200]
+
+    narrow = SR(4)(15, dtype='int8')
+    assert narrow.dtype == 'int8'
+    assert (narrow * 100).dtype == 'int8'
+    assert (narrow * 200)[:3] == [-200, -200, -200]
+    assert (narrow * 100 + narrow * 100)[:3] == [-200, -200, -200]
+    assert gold_signals(degree=5, dtype='int8')[0].dtype == 'int8'
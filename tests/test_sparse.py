@@ -0,0 +1,98 @@
+import pytest
+from DigitalSignal import DigitalSignal as DS, SparseDigitalSignal as SDS
+
+def test_sparse_round_trip(backend):
+    x = DS([0, 3, [0], 0, -2, 0, 0, 0, 1j])
+    s = SDS.from_dense(x)
+
+    assert s.nnz == 3
+    assert s.shape() == x.shape()
+    assert s[:] == x[:]
+    assert [s[n] for n in range(-3, 8)] == [x[n] for n in range(-3, 8)]
+    assert s.to_dense()[:] == x[:]
+
+
+def test_sparse_setitem_does_not_fill(backend):
+    s = SDS([0], [1])
+    s[100000] = 5
+    s[0] = 0
+
+    assert s.nnz == 1
+    assert s.shape() == (0, 100000)
+    assert s[100000] == 5 and s[0] == 0
+
+
+def test_sparse_operators(backend):
+    a = SDS([-3, 0, 40], [2, -1, 0.5], support=(-5, 50))
+    b = SDS([1, 20], [1j, 3])
+    x = DS([1, -2, [3], 4, 2, 0, -1])
+
+    da, db = a.to_dense(), b.to_dense()
+    checks = [
+        (a(3), da(3)), (~a, ~da), (a * 2, da * 2), (a.complex_conjugate(), da.complex_conjugate()),
+        (a + b, da + db), (a - b, da - db), (a + x, da + x), (x - a, x - da),
+        (a @ b, da @ db), (a @ x, da @ x), (x @ a, x @ da),
+        (a % b, da % db), (a % x, da % x), (x % a, x % da), (a.round(), da.round()),
+    ]
+    for result, expected in checks:
+        assert result.shape() == expected.shape()
+        assert result[:] == pytest.approx(expected[:])
+
+    assert isinstance(a @ b, SDS)
+    assert isinstance(a @ x, DS)
+
+
+def test_sparse_density_threshold(backend):
+    train = SDS([0, 100, 200], [1, 1, 1]) @ SDS([0, 1, 2], [1, 1, 1])
+    assert isinstance(train, SDS) and train.nnz == 9
+
+    dense = SDS([0, 1], [1, 1]) @ SDS([0, 1, 2], [1, 1, 1])
+    assert not isinstance(dense, SDS)
+    assert dense[:] == [1, 2, 2, 1]
+
+
+def test_sparse_subtraction_at_high_density(backend):
+    dense = SDS([0, 1], [1, 1])
+    x = DS([[1], 2, 3])
+
+    assert (x - dense)[:] == [0, 1, 3]
+    assert (dense - SDS([0, 1], [2, 5]))[:] == [-1, -4]
+    assert (SDS([0, 5], [1, 1]) - dense)[:] == [0, -1, 0, 0, 0, 1]
+
+
+def test_sparse_empty_operands(backend):
+    empty = SDS([], [])
+    x, s = DS([1, [2], 3]), SDS([0, 3], [1, 2])
+
+    # an empty support gives the same result as the equivalent empty DigitalSignal
+    for a, b in [(x, empty), (empty, x), (s, empty), (empty, empty(1)), (empty(5), s), (x(4), empty(-5))]:
+        da, db = (v.to_dense() if isinstance(v, SDS) else v for v in (a, b))
+        for sparse, dense in [(a + b, da + db), (a - b, da - db), (a @ b, da @ db), (a % b, da % db)]:
+            assert sparse.shape() == dense.shape()
+            assert sparse == dense
+
+
+def test_sparse_inplace(backend):
+    s = SDS([-4, 0, 900], [0.3, 1.26, -0.01])
+
+    assert s.round(1, inplace=True) is s
+    assert s.nnz == 2 and s[0] == 1.3
+
+    s.quantize(1, inplace=True)
+    assert isinstance(s, SDS) and s.nnz == 2 and s[-4] == 0.5 and s[0] == 1.5
+    assert s.shape() == (-4, 900)
+
+
+def test_inplace(backend):
+    s = SDS([0, 50], [1, 2])
+    alias = s
+    s += SDS([10], [3])
+    s *= 2
+    assert s is alias
+    assert isinstance(s, SDS) and s.nnz == 3
+    assert s[10] == 6 and s[50] == 4
+
+    dense = s.to_dense()
+    s.accumulate(SDS([50], [1]), -4)
+    assert s.nnz == 2
+    assert dense[50] == 4
@@ -0,0 +1,76 @@
+import cmath
+import math
+
+import pytest
+from DigitalSignal import DigitalSignal as DS, dtft, fft, ifft, spectrogram, welch
+
+def _direct(x, w):
+    first, last = x.shape()
+    return sum(x[n] * cmath.exp(-1j * w * n) for n in range(first, last + 1))
+
+
+def test_fft_phase_follows_origin(backend):
+    x = DS([1, 2j, [3], -1, 0.5])
+    X = fft(x)
+
+    assert X.shape() == (0, 4)
+    for k in range(5):
+        assert X[k] == pytest.approx(_direct(x, 2 * math.pi * k / 5))
+
+    # shorter and longer transforms, the lengths that are not powers of two included
+    for nfft in (3, 8, 12):
+        X = fft(x, nfft)
+        assert [X[k] for k in range(nfft)] == pytest.approx([_direct(x, 2 * math.pi * k / nfft) for k in range(nfft)])
+
+
+def test_ifft_round_trip(backend):
+    x = DS([4, -1, [2], 0, 3])
+    y = ifft(fft(x), origin=-2, real=True)
+    assert y[-2:3] == pytest.approx([4, -1, 2, 0, 3])
+
+    z = ifft(fft(x * 1j), origin=-2)
+    assert z[-2:3] == pytest.approx([4j, -1j, 2j, 0, 3j])
+
+
+def test_dtft(backend):
+    x = DS([1, [0.5], -2, 1j])
+    omega = [-2.0, 0.0, 0.3, math.pi]
+
+    values = dtft(x, omega)
+    assert list(values) == pytest.approx([_direct(x, w) for w in omega])
+    assert list(dtft(x, 6)) == pytest.approx([_direct(x, 2 * math.pi * k / 6) for k in range(6)])
+
+
+def test_welch_parseval(backend):
+    # the density integrates to the mean power of the signal
+    samples, state = [], 7
+    for _ in range(4096):
+        state = (1103515245 * state + 12345) % 2 ** 31
+        samples.append(state / 2 ** 30 - 1)
+    x = DS(samples)
+
+    frequencies, psd = welch(x, segment=128, window='boxcar', overlap=0, fs=2.0)
+    assert len(frequencies) == len(psd) == 65
+    assert frequencies[-1] == pytest.approx(1.0)
+    power = sum(v * v for v in samples) / len(samples)
+    assert sum(psd) * 2.0 / 128 == pytest.approx(power, rel=1e-9)
+
+
+def test_welch_tone(backend):
+    x = DS([cmath.exp(2j * math.pi * 0.25 * n) for n in range(512)])
+    frequencies, psd = welch(x, segment=64)
+    assert len(psd) == 64
+    assert frequencies[max(range(64), key=lambda k: psd[k])] == pytest.approx(0.25)
+
+
+def test_spectrogram(backend):
+    x = DS([math.cos(2 * math.pi * 0.125 * n) for n in range(256)])(100)
+    frequencies, times, power = spectrogram(x, segment=32, overlap=16)
+
+    assert len(frequencies) == len(power) == 17
+    assert len(times) == len(power[0]) == 15
+    assert times[0] == pytest.approx(-100 + 15.5)
+    assert max(range(17), key=lambda k: power[k][3]) == 4
+
+    with pytest.raises(ValueError):
+        spectrogram(x, segment=32, overlap=32)